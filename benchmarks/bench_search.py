@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of complete searches, replaying the recorded responses of the
+DOV services."""
+from .common import (
+    TYPES,
+    ReplayedServices,
+)
+
+
+class Search(object):
+    """Perform a search returning many features with their WFS fields
+    only."""
+
+    params = (sorted(TYPES), [1000, 5000])
+    param_names = ['type', 'features']
+
+    def setup(self, typename, features):
+        datatype, self.search_class, namespace, xml_file = TYPES[typename]
+
+        self.services = ReplayedServices(typename, features)
+        self.services.start()
+
+        wfs_fields = datatype.get_fields(source=('wfs',))
+        self.return_fields = [f for f in datatype.get_field_names()
+                              if f in wfs_fields]
+
+        # Request the metadata of the search class once, outside of the
+        # measurements.
+        self.search_class().get_fields()
+
+    def teardown(self, typename, features):
+        self.services.stop()
+
+    def time_search(self, typename, features):
+        self.search_class().search(location=(0, 0, 300000, 300000),
+                                   return_fields=self.return_fields)
+
+    def peakmem_search(self, typename, features):
+        self.search_class().search(location=(0, 0, 300000, 300000),
+                                   return_fields=self.return_fields)
+
+
+class SearchXml(Search):
+    """Perform a search returning many features with all their fields and
+    subtypes, resolving their (recorded) XML documents."""
+
+    params = (sorted(TYPES), [100, 1000])
+    param_names = ['type', 'features']
+
+    def setup(self, typename, features):
+        super(SearchXml, self).setup(typename, features)
+        self.return_fields = None
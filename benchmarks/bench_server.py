@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of requests over the network, to a local stand-in for the DOV
+services with simulated latency."""
+import pydov
+from pydov.util import owsutil
+
+from .common import TYPES
+from .server import StandInServer
+
+
+class ToDfServed(object):
+    """Build the output data of many instances including all fields and
+    subtypes, requesting their XML documents from the stand-in server with
+    a latency of 50 ms per document."""
+
+    params = (sorted(TYPES), [1, 8])
+    param_names = ['type', 'max_workers']
+
+    number = 1
+    repeat = 3
+    warmup_time = 0
+
+    def setup(self, typename, max_workers):
+        self.datatype, search, namespace, xml_file = TYPES[typename]
+
+        self.cache = pydov.cache
+        pydov.cache = None
+
+        self.server = StandInServer(latency={'xml': 0.05}).start()
+
+        request = owsutil.wfs_build_getfeature_request(
+            search()._layer, geometry_column='geom',
+            bbox=(150000, 210000, 155000, 215000))
+        self.response = owsutil.wfs_get_feature(
+            baseurl=self.server.wfs_url, get_feature_request=request)
+        self.namespace = namespace
+
+    def teardown(self, typename, max_workers):
+        self.server.stop()
+        pydov.cache = self.cache
+
+    def time_to_df(self, typename, max_workers):
+        self.datatype.to_df(
+            self.datatype.from_wfs(self.response, self.namespace),
+            max_workers=max_workers)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of building the DOV types from WFS responses and XML
+documents, and of building their output data."""
+from pydov.types.abstract import AbstractDovType
+
+from .common import (
+    TYPES,
+    read_file,
+    scale_wfs_response,
+    scale_xml,
+)
+
+
+class FromWfs(object):
+    """Build instances from a large WFS GetFeature response."""
+
+    params = (sorted(TYPES), [1000, 10000])
+    param_names = ['type', 'features']
+
+    def setup(self, typename, features):
+        self.datatype, search, self.namespace, xml_file = TYPES[typename]
+        self.response = scale_wfs_response(typename, features)
+
+    def time_from_wfs(self, typename, features):
+        for instance in self.datatype.from_wfs(self.response, self.namespace):
+            pass
+
+    def peakmem_from_wfs(self, typename, features):
+        list(self.datatype.from_wfs(self.response, self.namespace))
+
+
+class ToDfArray(object):
+    """Build the output data of many instances from their WFS fields
+    only."""
+
+    params = (sorted(TYPES), [1000, 10000])
+    param_names = ['type', 'features']
+
+    def setup(self, typename, features):
+        self.datatype, search, namespace, xml_file = TYPES[typename]
+        self.instances = list(self.datatype.from_wfs(
+            scale_wfs_response(typename, features), namespace))
+
+        wfs_fields = self.datatype.get_fields(source=('wfs',))
+        self.return_fields = [f for f in self.datatype.get_field_names()
+                              if f in wfs_fields]
+
+    def time_to_df_array(self, typename, features):
+        for row in self.datatype.to_df_array(
+                self.instances, self.return_fields, max_workers=1,
+                convert=False):
+            pass
+
+    def time_to_df(self, typename, features):
+        self.datatype.to_df(self.instances, self.return_fields,
+                            max_workers=1)
+
+    def peakmem_to_df(self, typename, features):
+        self.datatype.to_df(self.instances, self.return_fields,
+                            max_workers=1)
+
+
+class ToDfArrayXml(object):
+    """Build the output data of many instances including all fields and
+    subtypes, resolving their (recorded) XML documents.
+
+    The XML documents are resolved while building the output, so each
+    measurement starts from freshly built instances.
+
+    """
+
+    params = (sorted(TYPES), [100, 1000])
+    param_names = ['type', 'features']
+
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, typename, features):
+        self.datatype, search, namespace, xml_file = TYPES[typename]
+        self.instances = list(self.datatype.from_wfs(
+            scale_wfs_response(typename, features), namespace))
+
+        xml = read_file('types', typename, xml_file)
+        self._get_xml_data = AbstractDovType._get_xml_data
+        AbstractDovType._get_xml_data = lambda instance: xml
+
+    def teardown(self, typename, features):
+        AbstractDovType._get_xml_data = self._get_xml_data
+
+    def time_to_df_array(self, typename, features):
+        for row in self.datatype.to_df_array(
+                self.instances, max_workers=1, convert=False):
+            pass
+
+    def time_to_df(self, typename, features):
+        self.datatype.to_df(self.instances, max_workers=1)
+
+    def peakmem_to_df(self, typename, features):
+        self.datatype.to_df(self.instances, max_workers=1)
+
+
+class ParseXmlData(object):
+    """Parse the XML document of a DOV object with a long series of
+    subtype records, like the Peilmetingen of a GrondwaterFilter."""
+
+    params = (sorted(TYPES), [10, 1000, 10000])
+    param_names = ['type', 'records']
+
+    def setup(self, typename, records):
+        self.datatype = TYPES[typename][0]
+        self.xml = scale_xml(typename, records)
+        self.own_fields = self.datatype.get_field_names(
+            include_subtypes=False)
+
+    def time_parse_xml_data(self, typename, records):
+        instance = self.datatype('https://www.dov.vlaanderen.be/data/1')
+        instance._parse_xml_data(self.xml)
+
+    def time_parse_xml_data_without_subtypes(self, typename, records):
+        instance = self.datatype('https://www.dov.vlaanderen.be/data/1')
+        instance._parse_xml_data(self.xml, return_fields=self.own_fields)
+
+    def peakmem_parse_xml_data(self, typename, records):
+        instance = self.datatype('https://www.dov.vlaanderen.be/data/1')
+        instance._parse_xml_data(self.xml)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Module grouping helpers to replay the recorded responses of the DOV
+services in tests/data, scaled up to large numbers of features and subtype
+records, for use in the benchmarks."""
+import copy
+import os
+
+from owslib.etree import etree
+
+import pydov
+from pydov.search.boring import BoringSearch
+from pydov.search.grondwaterfilter import GrondwaterFilterSearch
+from pydov.types.abstract import AbstractDovType
+from pydov.types.boring import Boring
+from pydov.types.grondwaterfilter import GrondwaterFilter
+from pydov.util import owsutil
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                        'tests', 'data')
+
+#: The datatypes to benchmark, with their search class, the namespace of
+#: their WFS layer and the name of their XML document in tests/data.
+TYPES = {
+    'boring': (Boring, BoringSearch,
+               'http://dov.vlaanderen.be/ocdov/dov-pub', 'boring.xml'),
+    'grondwaterfilter': (GrondwaterFilter, GrondwaterFilterSearch,
+                         'http://dov.vlaanderen.be/grondwater/gw_meetnetten',
+                         'grondwaterfilter.xml'),
+}
+
+
+def read_file(*path):
+    """Read the file with the given path, relative to tests/data.
+
+    Parameters
+    ----------
+    path : list<str>
+        Components of the path of the file to read.
+
+    Returns
+    -------
+    bytes
+        The contents of the file.
+
+    """
+    with open(os.path.join(DATA_DIR, *path), 'rb') as f:
+        return f.read()
+
+
+def scale_wfs_response(typename, features):
+    """Build a WFS GetFeature response with the given number of features,
+    by repeating the features of the recorded response.
+
+    The permanent keys of the repeated features are made unique.
+
+    Parameters
+    ----------
+    typename : str
+        Name of the datatype, one of the keys of `TYPES`.
+    features : int
+        Number of features to include in the response.
+
+    Returns
+    -------
+    bytes
+        The WFS GetFeature response.
+
+    """
+    datatype, search, namespace, xml_file = TYPES[typename]
+    tree = etree.fromstring(
+        read_file('types', typename, 'wfsgetfeature.xml'))
+
+    members = tree.find('.//{http://www.opengis.net/gml}featureMembers')
+    recorded = list(members)
+    for feature in recorded:
+        members.remove(feature)
+
+    pkey_path = './{%s}%s' % (namespace, datatype._pkey_sourcefield)
+    for i in range(features):
+        feature = copy.deepcopy(recorded[i % len(recorded)])
+        pkey = feature.find(pkey_path)
+        pkey.text = '%s%i' % (pkey.text, i)
+        members.append(feature)
+
+    tree.set('numberOfFeatures', str(features))
+    return etree.tostring(tree)
+
+
+def scale_xml(typename, records):
+    """Build the XML document of a DOV object with the given number of
+    subtype records, by repeating the subtype records of the recorded
+    document.
+
+    Parameters
+    ----------
+    typename : str
+        Name of the datatype, one of the keys of `TYPES`.
+    records : int
+        Number of records of the (first) subtype to include.
+
+    Returns
+    -------
+    bytes
+        The XML document.
+
+    """
+    datatype, search, namespace, xml_file = TYPES[typename]
+    tree = etree.fromstring(read_file('types', typename, xml_file))
+
+    subtype = datatype._subtypes[0]
+    parent_path, tag = subtype.get_root_path().rsplit('/', 1)
+    parent = tree.find(parent_path)
+
+    recorded = parent.findall(tag)
+    for record in recorded:
+        parent.remove(record)
+
+    for i in range(records):
+        parent.append(copy.deepcopy(recorded[i % len(recorded)]))
+
+    return etree.tostring(tree)
+
+
+class ReplayedServices(object):
+    """Replace the requests to the DOV services by the recorded responses
+    of a datatype, with a scaled up WFS GetFeature response.
+
+    The metadata of the search classes is kept between benchmarks, like in
+    a long running process.
+
+    """
+
+    def __init__(self, typename, features, records=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        typename : str
+            Name of the datatype, one of the keys of `TYPES`.
+        features : int
+            Number of features in the WFS GetFeature responses.
+        records : int, optional
+            Number of subtype records in the XML documents of the DOV
+            objects. Defaults to None, using the recorded document as is.
+
+        """
+        datatype, search, namespace, xml_file = TYPES[typename]
+
+        self.capabilities = read_file('util', 'owsutil',
+                                      'wfscapabilities.xml')
+        self.md_metadata = read_file('types', typename, 'md_metadata.xml')
+        self.fc_featurecatalogue = read_file('types', typename,
+                                             'fc_featurecatalogue.xml')
+        self.describefeaturetype = read_file('types', typename,
+                                             'wfsdescribefeaturetype.xml')
+        self.getfeature = scale_wfs_response(typename, features)
+
+        if records is None:
+            self.xml = read_file('types', typename, xml_file)
+        else:
+            self.xml = scale_xml(typename, records)
+
+        self._originals = []
+
+    def _patch(self, target, name, value):
+        """Replace an attribute, saving the original to restore it later.
+
+        Parameters
+        ----------
+        target : object
+            Module or class to replace the attribute of.
+        name : str
+            Name of the attribute.
+        value : object
+            New value of the attribute.
+
+        """
+        self._originals.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def start(self):
+        """Start replaying the recorded responses."""
+        self._patch(owsutil, 'get_remote_capabilities',
+                    lambda *args, **kwargs: self.capabilities)
+        self._patch(owsutil, '__get_remote_md',
+                    lambda url: self.md_metadata)
+        self._patch(owsutil, '__get_remote_fc',
+                    lambda url: self.fc_featurecatalogue)
+        self._patch(owsutil, '__get_remote_describefeaturetype',
+                    lambda url: self.describefeaturetype)
+        self._patch(owsutil, 'wfs_get_feature',
+                    lambda *args, **kwargs: self.getfeature)
+        self._patch(AbstractDovType, '_get_xml_data',
+                    lambda instance: self.xml)
+        self._patch(pydov, 'cache', None)
+
+    def stop(self):
+        """Stop replaying and restore the original requests."""
+        while len(self._originals) > 0:
+            target, name, value = self._originals.pop()
+            setattr(target, name, value)
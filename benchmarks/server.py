@@ -0,0 +1,700 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for the DOV services, serving the recorded responses in
+tests/data over HTTP for load testing and benchmarks.
+
+The server answers the WFS GetCapabilities, DescribeFeatureType and
+GetFeature requests, the CSW GetRecordById requests and the requests of the
+XML documents of the DOV objects. GetFeature responses are synthesized on
+demand: every bounding box contains a feature on each point of a regular
+grid, built from the recorded feature of the layer. All URLs of the DOV
+services in the served documents point to the stand-in server instead.
+
+Latency, throttling and failures of the services can be simulated, like::
+
+    python -m benchmarks.server --port 8080 --latency 0.05 \\
+        --failure-rate 0.01 --max-concurrent 8
+
+"""
+import argparse
+import copy
+import math
+import random
+import re
+import threading
+import time
+
+from owslib.etree import etree
+
+from .common import (
+    TYPES,
+    read_file,
+    scale_xml,
+)
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+try:
+    from urllib.parse import urlparse, parse_qsl
+except ImportError:  # pragma: no cover
+    from urlparse import urlparse, parse_qsl
+
+#: Base URL of the DOV services in the recorded responses.
+DOV_URL = 'https://www.dov.vlaanderen.be'
+
+#: Bounding box of Flanders in Belgian Lambert 72, used for GetFeature
+#: requests without a bounding box.
+FLANDERS_BBOX = (22000, 153000, 259000, 245000)
+
+_NS_WFS = 'http://www.opengis.net/wfs'
+_NS_OGC = 'http://www.opengis.net/ogc'
+_NS_GML = 'http://www.opengis.net/gml'
+_NS_GMD = 'http://www.isotc211.org/2005/gmd'
+_NS_GCO = 'http://www.isotc211.org/2005/gco'
+_NS_GFC = 'http://www.isotc211.org/2005/gfc'
+
+
+class _Layer(object):
+    """The recorded responses of a single WFS layer and its datatype."""
+
+    def __init__(self, typename, base_url, records=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        typename : str
+            Name of the datatype, one of the keys of `TYPES`.
+        base_url : str
+            Base URL of the stand-in server.
+        records : int, optional
+            Number of subtype records in the XML documents of the DOV
+            objects. Defaults to None, using the recorded document as is.
+
+        """
+        datatype, search, namespace, xml_file = TYPES[typename]
+        self.name = search()._layer
+        self.namespace = namespace
+
+        tree = etree.fromstring(
+            read_file('types', typename, 'wfsgetfeature.xml'))
+        members = tree.find('.//{%s}featureMembers' % _NS_GML)
+        self.template = copy.deepcopy(members[0])
+        for feature in list(members):
+            members.remove(feature)
+        self.collection = tree
+
+        fields = datatype.get_fields(source=('wfs',))
+        self.pkey_field = datatype._pkey_sourcefield
+        self.x_field = fields['x']['sourcefield']
+        self.y_field = fields['y']['sourcefield']
+
+        recorded_pkey = self.template.find(
+            '{%s}%s' % (namespace, self.pkey_field)).text
+        self.pkey_url = recorded_pkey.rsplit('/', 1)[0].replace(
+            DOV_URL, base_url)
+
+        self.describefeaturetype = _rewrite(read_file(
+            'types', typename, 'wfsdescribefeaturetype.xml'), base_url)
+        self.md_metadata = _rewrite(read_file(
+            'types', typename, 'md_metadata.xml'), base_url)
+        self.fc_featurecatalogue = _rewrite(read_file(
+            'types', typename, 'fc_featurecatalogue.xml'), base_url)
+
+        self.md_uuid = etree.fromstring(self.md_metadata).findtext(
+            './/{%s}fileIdentifier/{%s}CharacterString' % (_NS_GMD, _NS_GCO))
+        self.fc_uuid = etree.fromstring(self.fc_featurecatalogue).find(
+            './/{%s}FC_FeatureCatalogue' % _NS_GFC).get('uuid')
+
+        if records is None:
+            self.xml = read_file('types', typename, xml_file)
+        else:
+            self.xml = scale_xml(typename, records)
+
+    def get_pkey(self, point):
+        """Return the permanent key of the feature on the given grid point.
+
+        Parameters
+        ----------
+        point : tuple<int>
+            Column and row of the point on the grid.
+
+        Returns
+        -------
+        str
+            Permanent key of the feature.
+
+        """
+        return '%s/%i-%i' % (self.pkey_url, point[0], point[1])
+
+    def get_point(self, pkey):
+        """Return the grid point of the feature with the given permanent key.
+
+        Parameters
+        ----------
+        pkey : str
+            Permanent key of the feature.
+
+        Returns
+        -------
+        tuple<int> or None
+            Column and row of the point on the grid, or None if the
+            permanent key does not belong to a synthesized feature.
+
+        """
+        match = re.match(r'^%s/(\d+)-(\d+)$' % re.escape(self.pkey_url),
+                         pkey or '')
+        if match is None:
+            return None
+        return int(match.group(1)), int(match.group(2))
+
+    def build_feature(self, point, spacing):
+        """Build the feature on the given grid point.
+
+        Parameters
+        ----------
+        point : tuple<int>
+            Column and row of the point on the grid.
+        spacing : float
+            Distance between the points of the grid.
+
+        Returns
+        -------
+        etree.Element
+            The feature.
+
+        """
+        feature = copy.deepcopy(self.template)
+        x, y = point[0] * spacing, point[1] * spacing
+
+        feature.set('{%s}id' % _NS_GML, '%s.%i-%i' % (
+            self.name.split(':')[-1], point[0], point[1]))
+        feature.find('{%s}%s' % (self.namespace, self.pkey_field)).text = \
+            self.get_pkey(point)
+        feature.find('{%s}%s' % (self.namespace, self.x_field)).text = \
+            '%0.2f' % x
+        feature.find('{%s}%s' % (self.namespace, self.y_field)).text = \
+            '%0.2f' % y
+
+        for pos in feature.iter('{%s}pos' % _NS_GML):
+            pos.text = '%0.2f %0.2f' % (x, y)
+        return feature
+
+
+def _rewrite(document, base_url):
+    """Make the URLs of the DOV services in a recorded document point to the
+    stand-in server.
+
+    Parameters
+    ----------
+    document : bytes
+        The recorded document.
+    base_url : str
+        Base URL of the stand-in server.
+
+    Returns
+    -------
+    bytes
+        The document with the URLs replaced.
+
+    """
+    for url in (DOV_URL + ':443', DOV_URL):
+        document = document.replace(url.encode('utf8'),
+                                    base_url.encode('utf8'))
+    return document
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request in a separate thread."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handler of the requests to the stand-in server."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.standin.handle(self, 'GET')
+
+    def do_POST(self):
+        self.server.standin.handle(self, 'POST')
+
+    def log_message(self, format, *args):
+        if self.server.standin.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class StandInServer(object):
+    """Local HTTP stand-in for the DOV services.
+
+    Use it as a context manager, or start and stop it explicitly::
+
+        with StandInServer(latency=0.05) as server:
+            wfs = WebFeatureService(server.wfs_url, version='1.1.0')
+
+    Each request handled by the server is recorded in `requests` as a tuple
+    of the kind of request ('wfs', 'csw' or 'xml'), the HTTP method, the
+    path and the HTTP status of the response.
+
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0, jitter=0,
+                 failure_rate=0, failure_status=503, max_concurrent=None,
+                 spacing=1000, max_features=10000, records=None, seed=None,
+                 verbose=False):
+        """Initialisation.
+
+        Parameters
+        ----------
+        host : str, optional
+            Host to listen on. Defaults to '127.0.0.1'.
+        port : int, optional
+            Port to listen on. Defaults to 0, using any free port.
+        latency : float or dict, optional
+            Time in seconds to wait before responding to a request, either
+            for all requests or per kind of request ('wfs', 'csw' or 'xml').
+            Defaults to 0.
+        jitter : float, optional
+            Maximum random time in seconds added to the latency. Defaults
+            to 0.
+        failure_rate : float or dict, optional
+            Fraction of the requests, either of all requests or per kind of
+            request, to fail with `failure_status`. Defaults to 0.
+        failure_status : int, optional
+            HTTP status of failing requests. Defaults to 503.
+        max_concurrent : int, optional
+            Maximum number of requests to handle concurrently. Additional
+            requests are throttled with HTTP status 429. Defaults to None,
+            handling all requests.
+        spacing : float, optional
+            Distance in meters between the synthesized features. Defaults
+            to 1000.
+        max_features : int, optional
+            Maximum number of features in a GetFeature response, like the
+            limit of the DOV services. Defaults to 10000.
+        records : int, optional
+            Number of subtype records in the XML documents of the DOV
+            objects. Defaults to None, using the recorded documents as is.
+        seed : int, optional
+            Seed of the random generator of the jitter and the failures, to
+            make them reproducible. Defaults to None.
+        verbose : bool, optional
+            Whether to log the requests to stderr. Defaults to False.
+
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.max_concurrent = max_concurrent
+        self.spacing = float(spacing)
+        self.max_features = max_features
+        self.verbose = verbose
+
+        self.requests = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._thread = None
+
+        self._server = _ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.standin = self
+        self.url = 'http://%s:%i' % self._server.server_address[:2]
+
+        self._layers = [_Layer(t, self.url, records) for t in sorted(TYPES)]
+        self._capabilities = _rewrite(
+            read_file('util', 'owsutil', 'wfscapabilities.xml'), self.url)
+        self._csw_notfound = read_file(
+            'util', 'owsutil', 'fc_featurecatalogue_notfound.xml')
+
+    @property
+    def wfs_url(self):
+        """Base URL of the WFS service of the stand-in server."""
+        return self.url + '/geoserver/wfs'
+
+    def start(self):
+        """Start serving requests in a background thread.
+
+        Returns
+        -------
+        StandInServer
+            The server itself.
+
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests and close the server."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self):
+        """Serve requests in the current thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _get_setting(self, setting, kind):
+        """Return the value of a setting for the given kind of request.
+
+        Parameters
+        ----------
+        setting : float or dict
+            Value of the setting, either for all requests or per kind.
+        kind : str
+            Kind of request.
+
+        Returns
+        -------
+        float
+            Value of the setting for this kind of request.
+
+        """
+        if isinstance(setting, dict):
+            return setting.get(kind, 0)
+        return setting or 0
+
+    def handle(self, handler, method):
+        """Handle a request, simulating the latency, throttling and failures
+        of the DOV services.
+
+        Parameters
+        ----------
+        handler : BaseHTTPRequestHandler
+            Handler of the request.
+        method : str
+            HTTP method of the request, 'GET' or 'POST'.
+
+        """
+        url = urlparse(handler.path)
+        path = url.path
+        params = dict((k.lower(), v) for k, v in parse_qsl(url.query))
+
+        body = None
+        length = int(handler.headers.get('Content-Length') or 0)
+        if length > 0:
+            body = handler.rfile.read(length)
+
+        if path.startswith('/data/') and path.endswith('.xml'):
+            kind = 'xml'
+        elif 'csw' in path.lower():
+            kind = 'csw'
+        else:
+            kind = 'wfs'
+
+        with self._lock:
+            throttled = self.max_concurrent is not None and \
+                self._active >= self.max_concurrent
+            if not throttled:
+                self._active += 1
+            failed = self._random.random() < self._get_setting(
+                self.failure_rate, kind)
+            delay = self._get_setting(self.latency, kind) + \
+                self._random.uniform(0, self.jitter or 0)
+
+        if throttled:
+            self._respond(handler, kind, method, 429, b'Too many requests',
+                          'text/plain', {'Retry-After': '1'})
+            return
+
+        try:
+            if delay > 0:
+                time.sleep(delay)
+
+            if failed:
+                self._respond(handler, kind, method, self.failure_status,
+                              b'Simulated failure', 'text/plain')
+                return
+
+            try:
+                if kind == 'xml':
+                    status, content = self._get_xml(path)
+                elif kind == 'csw':
+                    status, content = self._get_record(params)
+                elif method == 'POST':
+                    status, content = self._get_feature(body)
+                else:
+                    status, content = self._get_wfs(params)
+            except Exception as e:
+                status, content = 400, str(e).encode('utf8')
+
+            self._respond(handler, kind, method, status, content,
+                          'text/xml' if status == 200 else 'text/plain')
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _respond(self, handler, kind, method, status, content, content_type,
+                 headers=None):
+        """Send the response to a request and record it.
+
+        Parameters
+        ----------
+        handler : BaseHTTPRequestHandler
+            Handler of the request.
+        kind : str
+            Kind of request.
+        method : str
+            HTTP method of the request.
+        status : int
+            HTTP status of the response.
+        content : bytes
+            Content of the response.
+        content_type : str
+            Content type of the response.
+        headers : dict, optional
+            Additional headers of the response.
+
+        """
+        with self._lock:
+            self.requests.append(
+                (kind, method, urlparse(handler.path).path, status))
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(content)))
+        for header, value in (headers or {}).items():
+            handler.send_header(header, value)
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _get_layer(self, name):
+        """Return the layer with the given name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the layer, with or without its namespace prefix.
+
+        Returns
+        -------
+        _Layer or None
+            The layer, or None if there is no such layer.
+
+        """
+        for layer in self._layers:
+            if name in (layer.name, layer.name.split(':')[-1]):
+                return layer
+        return None
+
+    def _get_capabilities(self):
+        """Return the GetCapabilities response, advertising the current
+        `max_features` limit as DefaultMaxFeatures constraint of the
+        GetFeature operation.
+
+        Returns
+        -------
+        bytes
+            The GetCapabilities response.
+
+        """
+        start = self._capabilities.index(b'<ows:Operation name="GetFeature">')
+        end = self._capabilities.index(b'</ows:Operation>', start)
+        constraint = ('<ows:Constraint name="DefaultMaxFeatures"><ows:Value>'
+                      '%i</ows:Value></ows:Constraint>' % self.max_features)
+        return self._capabilities[:end] + constraint.encode('utf8') + \
+            self._capabilities[end:]
+
+    def _get_wfs(self, params):
+        """Answer a WFS GET request.
+
+        Parameters
+        ----------
+        params : dict
+            Query parameters of the request, with lowercase names.
+
+        Returns
+        -------
+        tuple<int, bytes>
+            HTTP status and content of the response.
+
+        """
+        request = params.get('request', '').lower()
+        if request == 'getcapabilities':
+            return 200, self._get_capabilities()
+        elif request == 'describefeaturetype':
+            layer = self._get_layer(params.get('typename', ''))
+            if layer is not None:
+                return 200, layer.describefeaturetype
+            return 404, b'Unknown typeName'
+        return 400, b'Unsupported request'
+
+    def _get_record(self, params):
+        """Answer a CSW GetRecordById request.
+
+        Parameters
+        ----------
+        params : dict
+            Query parameters of the request, with lowercase names.
+
+        Returns
+        -------
+        tuple<int, bytes>
+            HTTP status and content of the response.
+
+        """
+        uuid = params.get('id')
+        for layer in self._layers:
+            if uuid == layer.md_uuid:
+                return 200, layer.md_metadata
+            elif uuid == layer.fc_uuid:
+                return 200, layer.fc_featurecatalogue
+        return 200, self._csw_notfound
+
+    def _get_xml(self, path):
+        """Answer a request of the XML document of a DOV object.
+
+        Parameters
+        ----------
+        path : str
+            Path of the request.
+
+        Returns
+        -------
+        tuple<int, bytes>
+            HTTP status and content of the response.
+
+        """
+        for layer in self._layers:
+            if layer.get_point(self.url + path[:-4]) is not None:
+                return 200, layer.xml
+        return 404, b'Unknown DOV object'
+
+    def _get_feature(self, body):
+        """Answer a WFS GetFeature request, synthesizing the features
+        matching its bounding box or permanent keys.
+
+        Other filters of the request are ignored.
+
+        Parameters
+        ----------
+        body : bytes
+            The XML body of the GetFeature request.
+
+        Returns
+        -------
+        tuple<int, bytes>
+            HTTP status and content of the response.
+
+        """
+        request = etree.fromstring(body)
+        query = request.find('{%s}Query' % _NS_WFS)
+        layer = self._get_layer(query.get('typeName'))
+        if layer is None:
+            return 404, b'Unknown typeName'
+
+        points = None
+        for equal in query.iter('{%s}PropertyIsEqualTo' % _NS_OGC):
+            name = equal.findtext('{%s}PropertyName' % _NS_OGC)
+            if name.split(':')[-1] == layer.pkey_field:
+                point = layer.get_point(
+                    equal.findtext('{%s}Literal' % _NS_OGC))
+                points = points or set()
+                if point is not None:
+                    points.add(point)
+
+        envelope = query.find('.//{%s}Envelope' % _NS_GML)
+        if envelope is not None:
+            bbox = [float(c) for c in (
+                envelope.findtext('{%s}lowerCorner' % _NS_GML).split() +
+                envelope.findtext('{%s}upperCorner' % _NS_GML).split())]
+        else:
+            bbox = FLANDERS_BBOX
+
+        grid = [int(math.ceil(bbox[0] / self.spacing)),
+                int(math.ceil(bbox[1] / self.spacing)),
+                int(math.floor(bbox[2] / self.spacing)),
+                int(math.floor(bbox[3] / self.spacing))]
+
+        if points is None:
+            points = [(x, y) for x in range(grid[0], grid[2] + 1)
+                      for y in range(grid[1], grid[3] + 1)]
+        else:
+            points = [(x, y) for x, y in points
+                      if grid[0] <= x <= grid[2] and grid[1] <= y <= grid[3]]
+
+        points.sort(key=layer.get_pkey)
+
+        collection = copy.deepcopy(layer.collection)
+        collection.set('timeStamp', time.strftime('%Y-%m-%dT%H:%M:%SZ',
+                                                  time.gmtime()))
+
+        if request.get('resultType') == 'hits':
+            collection.remove(collection.find('{%s}featureMembers' % _NS_GML))
+            collection.set('numberOfFeatures', str(len(points)))
+            return 200, etree.tostring(collection)
+
+        start_index = int(request.get('startIndex', 0))
+        max_features = self.max_features
+        if request.get('maxFeatures') is not None:
+            max_features = min(max_features, int(request.get('maxFeatures')))
+        points = points[start_index:start_index + max_features]
+
+        members = collection.find('{%s}featureMembers' % _NS_GML)
+        for point in points:
+            members.append(layer.build_feature(point, self.spacing))
+
+        collection.set('numberOfFeatures', str(len(points)))
+        return 200, etree.tostring(collection)
+
+
+def main():
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the DOV services.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='time in seconds to wait before responding')
+    parser.add_argument('--jitter', type=float, default=0,
+                        help='maximum random time in seconds added to the '
+                             'latency')
+    parser.add_argument('--failure-rate', type=float, default=0,
+                        help='fraction of the requests to fail')
+    parser.add_argument('--failure-status', type=int, default=503,
+                        help='HTTP status of failing requests')
+    parser.add_argument('--max-concurrent', type=int, default=None,
+                        help='maximum number of concurrent requests, '
+                             'throttling others with HTTP status 429')
+    parser.add_argument('--spacing', type=float, default=1000,
+                        help='distance in meters between the synthesized '
+                             'features')
+    parser.add_argument('--records', type=int, default=None,
+                        help='number of subtype records in the XML documents')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        host=args.host, port=args.port, latency=args.latency,
+        jitter=args.jitter, failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        max_concurrent=args.max_concurrent, spacing=args.spacing,
+        records=args.records, seed=args.seed, verbose=True)
+
+    print('Serving the DOV stand-in on %s' % server.wfs_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -2,3 +2,29 @@
 
 __author__ = """DOV-Vlaanderen"""
 __version__ = '0.1.0'
+
+# Default number of worker threads used to perform requests to the DOV
+# services concurrently, like resolving the XML details of DOV objects. A
+# value of 1 performs them one at a time.
+max_workers = 1
+
+# Cache for the XML documents of DOV objects, an instance of a subclass of
+# pydov.util.caching.AbstractCache. None to always download them.
+cache = None
+
+# Cache for snapshots of the metadata of the DOV services, an instance of
+# pydov.util.caching.MetadataCache. None to always request it remotely.
+metadata_cache = None
+
+# Instruments receiving the timed events of each phase of all searches,
+# instances of a subclass of pydov.util.instrumentation.AbstractInstrument.
+instruments = []
+
+# Base URLs of the DOV services, each as a list of mirrors in order of
+# priority, like a local caching proxy followed by the DOV services
+# themselves: the WFS service, the CSW catalogue and the XML documents of
+# the DOV objects. Requests go to the mirror with the best recent latency
+# and fail over to the next one on timeouts and connection errors.
+wfs_urls = ['https://www.dov.vlaanderen.be/geoserver/wfs']
+csw_urls = ['https://www.dov.vlaanderen.be/geonetwork']
+xml_urls = ['https://www.dov.vlaanderen.be/data']
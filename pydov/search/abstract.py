@@ -1,28 +1,131 @@
 # -*- coding: utf-8 -*-
 """Module containing the abstract search classes to retrieve DOV data."""
 
+import math
+import numbers
+
 import owslib
 from owslib.etree import etree
+from owslib.feature.common import WFSCapabilitiesReader
+from owslib.feature.schema import _get_describefeaturetype_url
 from owslib.fes import (
     FilterRequest,
+    Or,
+    PropertyIsEqualTo,
 )
+from owslib.iso import MD_Metadata
 from owslib.wfs import WebFeatureService
+
+import pydov
 from pydov.util import owsutil
+from pydov.util.caching import LRUCache
+from pydov.util.concurrency import imap_ordered
 from pydov.util.errors import (
     LayerNotFoundError,
     InvalidSearchParameterError,
     FeatureOverflowError,
     InvalidFieldError,
 )
+from pydov.util.instrumentation import (
+    Timer,
+    activated,
+)
+from pydov.util.net import (
+    DOV_URLS,
+    get_latency,
+    get_mirror_urls,
+)
 from pydov.util.owsutil import get_remote_schema
 
 
+def _get_query_key(value):
+    """Return a hashable key identifying the given query, or value of one
+    of its attributes, by its type and its attributes.
+
+    Parameters
+    ----------
+    value : owslib.fes.OgcExpression or list or object
+        The query, or the value of one of its attributes.
+
+    Returns
+    -------
+    tuple
+        The key of the value.
+
+    Raises
+    ------
+    TypeError
+        When the value contains other objects than OGC expressions, lists,
+        tuples, strings and numbers.
+
+    """
+    if isinstance(value, owslib.fes.OgcExpression):
+        return (type(value),) + tuple(
+            (name, _get_query_key(item))
+            for name, item in sorted(vars(value).items()))
+    elif isinstance(value, (list, tuple)):
+        return (type(value),) + tuple(_get_query_key(i) for i in value)
+    elif value is None or isinstance(
+            value, (bool, numbers.Number, str, bytes, type(u''))):
+        # The type is included to tell apart values like 1, 1.0 and True.
+        return type(value), value
+    raise TypeError('Unsupported value in query: %r' % (value,))
+
+
+class _MetadataRequired(Exception):
+    """Raised by a search class in asynchronous mode when it needs remote
+    metadata that has not been requested yet.
+
+    Attributes
+    ----------
+    key : tuple<str>
+        Key identifying the metadata.
+    url : str
+        URL to request the metadata from.
+    parse : callable
+        Function parsing the response (bytes) of the request into the
+        metadata, as a JSON serialisable value.
+
+    """
+
+    def __init__(self, key, url, parse):
+        super(_MetadataRequired, self).__init__(url)
+        self.key = key
+        self.url = url
+        self.parse = parse
+
+
 class AbstractSearch(object):
     """Abstract search class grouping methods common to all DOV search
     classes. Not to be instantiated or used directly."""
 
     __wfs = None
 
+    _split_max_depth = 6
+
+    # Limit of the number of features returned by a GetFeature request, used
+    # when the WFS server does not advertise it in its capabilities.
+    _max_features = 10000
+
+    _page_size = 5000
+
+    _pkeys_chunksize = 200
+
+    # Validated filters and WFS properties by search parameters, and
+    # serialised GetFeature requests by request parameters, shared by all
+    # searches.
+    _compiled_searches = LRUCache(maxsize=256)
+    _compiled_requests = LRUCache(maxsize=256)
+
+    # Instrumentation phase of the requests of each kind of metadata.
+    _snapshot_phases = {
+        'capabilities': 'capabilities',
+        'schema': 'describefeaturetype',
+        'namespace': 'describefeaturetype',
+        'metadata': 'metadata',
+        'featurecatalogue': 'metadata',
+    }
+
     def __init__(self, layer, objecttype):
         """Initialisation.
 
@@ -44,19 +147,188 @@ class AbstractSearch(object):
         self._map_wfs_source_df = {}
         self._map_df_wfs_source = {}
 
-    def _init_wfs(self):
+        self._instruments = []
+
+    def add_instrument(self, instrument):
+        """Add an instrument receiving the timed events of each phase of the
+        searches performed with this instance, in addition to the
+        instruments in `pydov.instruments`.
+
+        Asynchronous searches only emit their events to the instruments in
+        `pydov.instruments`.
+
+        Parameters
+        ----------
+        instrument : pydov.util.instrumentation.AbstractInstrument
+            The instrument to add, like a
+            `pydov.util.instrumentation.StatsCollector`.
+
+        """
+        if instrument not in self._instruments:
+            self._instruments.append(instrument)
+
+    def remove_instrument(self, instrument):
+        """Remove an instrument added with `add_instrument`.
+
+        Parameters
+        ----------
+        instrument : pydov.util.instrumentation.AbstractInstrument
+            The instrument to remove.
+
+        """
+        if instrument in self._instruments:
+            self._instruments.remove(instrument)
+
+    def _instrumented(self):
+        """Return a context manager activating the instruments of this
+        search and emitting the time spent within as 'search' event.
+
+        Returns
+        -------
+        pydov.util.instrumentation.Timer
+            The timer of the search.
+
+        """
+        return Timer('search', instruments=self._instruments)
+
+    def _iter_instrumented(self, iterable):
+        """Iterate over the given iterable with the instruments of this
+        search activated while each item is produced.
+
+        Parameters
+        ----------
+        iterable : iterable
+            The iterable to iterate over.
+
+        Yields
+        ------
+            The items of the iterable.
+
+        """
+        iterator = iter(iterable)
+        while True:
+            with activated(self._instruments):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def _get_snapshot(self, key, fetch, url, parse, prefetched=None):
+        """Get the metadata identified by the given key from the metadata
+        cache configured in `pydov.metadata_cache`, or by calling `fetch`
+        if there is none.
+
+        In asynchronous mode, i.e. when `prefetched` is given, the metadata
+        is neither requested nor read from the metadata cache here. Instead
+        a _MetadataRequired exception is raised for the caller to get it
+        and add the result to `prefetched`.
+
+        Parameters
+        ----------
+        key : tuple<str>
+            Key identifying the metadata.
+        fetch : callable
+            Function without arguments requesting the metadata from the
+            remote service and returning it as a JSON serialisable value.
+        url : str
+            URL of the remote request of the metadata.
+        parse : callable
+            Function parsing the response of the request to `url` into the
+            value returned by `fetch`.
+        prefetched : dict, optional
+            Metadata requested asynchronously by the caller, by key. Each
+            value is removed once it is used.
+
+        Returns
+        -------
+        object
+            The metadata, as returned by `fetch`.
+
+        Raises
+        ------
+        _MetadataRequired
+            In asynchronous mode, when the metadata is not prefetched.
+
+        """
+        if prefetched is not None:
+            if key in prefetched:
+                return prefetched.pop(key)
+            raise _MetadataRequired(key, url, parse)
+
+        fetch_remote = fetch
+
+        def fetch():
+            with Timer(self._snapshot_phases[key[0]]):
+                return fetch_remote()
+
+        if pydov.metadata_cache is None:
+            return fetch()
+        return pydov.metadata_cache.get(key, fetch)
+
+    @staticmethod
+    def _get_service_key(url):
+        """Get the identification of the service at the given URL in the
+        keys of the metadata snapshots, so the snapshots of different
+        services or mirrors sharing a metadata cache are kept apart.
+
+        Parameters
+        ----------
+        url : str
+            Base URL of the service.
+
+        Returns
+        -------
+        str
+            The base URLs of the mirrors the service is requested from, or
+            the URL itself for services without mirrors.
+
+        """
+        return ' '.join(sorted(mirror or mirror_url for mirror, mirror_url
+                               in get_mirror_urls(url)))
+
+    def _init_wfs(self, prefetched=None):
         """Initialise the WFS service. If the WFS service is not
         instanciated yet, do so and save it in a static variable available
         to all subclasses and instances.
+
+        The GetCapabilities response is requested from the mirrors of the
+        WFS service configured in `pydov.wfs_urls`. When a metadata cache is
+        configured, the WFS service is built from its snapshot of the
+        GetCapabilities response.
+
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         """
         if AbstractSearch.__wfs is None:
+            url = DOV_URLS['wfs']
+            version = "1.1.0"
+            key = ('capabilities', self._get_service_key(url), version)
+
+            def get_capabilities():
+                return owsutil.get_remote_capabilities(
+                    url, version).decode('utf-8')
+
+            capabilities = self._get_snapshot(
+                key, get_capabilities,
+                WFSCapabilitiesReader(version).capabilities_url(url),
+                lambda content: content.decode('utf-8'), prefetched)
             AbstractSearch.__wfs = WebFeatureService(
-                url="https://www.dov.vlaanderen.be/geoserver/wfs",
-                version="1.1.0")
+                url=url, version=version, xml=capabilities.encode('utf-8'))
 
-    def _init_namespace(self):
+    def _init_namespace(self, prefetched=None):
         """Initialise the WFS namespace associated with the layer.
 
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         Raises
         ------
         NotImplementedError
@@ -66,10 +338,16 @@ class AbstractSearch(object):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
-    def _init_fields(self):
+    def _init_fields(self, prefetched=None):
         """Initialise the fields and their metadata available in this search
         class.
 
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         Raises
         ------
         NotImplementedError
@@ -102,10 +380,16 @@ class AbstractSearch(object):
         else:
             return self.__wfs.contents[self._layer]
 
-    def _get_schema(self):
+    def _get_schema(self, prefetched=None):
         """Get the WFS schema (i.e. the output of the DescribeFeatureType
         request) of the layer.
 
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         Returns
         -------
         schema : dict
@@ -113,14 +397,25 @@ class AbstractSearch(object):
 
         """
         self._init_wfs()
+        url = self.__wfs.url
         layername = self._layer.split(':')[1] if ':' in self._layer else \
             self._layer
-        return get_remote_schema(
-            'https://www.dov.vlaanderen.be/geoserver/wfs', layername)
-
-    def _get_namespace(self):
+        return self._get_snapshot(
+            ('schema', self._get_service_key(url), self._layer),
+            lambda: get_remote_schema(url, layername),
+            _get_describefeaturetype_url(url, '1.0.0', layername),
+            lambda content: owsutil.parse_schema(content, layername),
+            prefetched)
+
+    def _get_namespace(self, prefetched=None):
         """Get the WFS namespace of the layer.
 
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         Returns
         -------
         namespace : str
@@ -130,11 +425,22 @@ class AbstractSearch(object):
 
         """
         self._init_wfs()
-        return owsutil.get_namespace(self.__wfs, self._layer)
-
-    def _get_remote_metadata(self):
+        return self._get_snapshot(
+            ('namespace', self._get_service_key(self.__wfs.url), self._layer),
+            lambda: owsutil.get_namespace(self.__wfs, self._layer),
+            _get_describefeaturetype_url(self.__wfs.url, '1.1.0',
+                                         self._layer),
+            owsutil.parse_namespace, prefetched)
+
+    def _get_remote_metadata(self, prefetched=None):
         """Request and parse the remote metadata associated with the layer.
 
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
         Returns
         -------
         owslib.iso.MD_Metadata
@@ -143,7 +449,59 @@ class AbstractSearch(object):
 
         """
         wfs_layer = self._get_layer()
-        return owsutil.get_remote_metadata(wfs_layer)
+        key = ('metadata',
+               self._get_service_key(owsutil.get_csw_base_url(wfs_layer)),
+               self._layer)
+
+        if pydov.metadata_cache is None and prefetched is None:
+            with Timer('metadata'):
+                return owsutil.get_remote_metadata(wfs_layer)
+
+        def get_metadata():
+            md_metadata = owsutil.get_remote_metadata(wfs_layer)
+            return md_metadata.xml.decode('utf-8')
+
+        def parse_metadata(content):
+            md_metadata = MD_Metadata(etree.fromstring(content))
+            return md_metadata.xml.decode('utf-8')
+
+        xml = self._get_snapshot(key, get_metadata,
+                                 owsutil.get_metadata_url(wfs_layer),
+                                 parse_metadata, prefetched)
+        return MD_Metadata(etree.fromstring(xml.encode('utf-8')))
+
+    def _get_remote_featurecatalogue(self, md_metadata, prefetched=None):
+        """Request and parse the remote feature catalogue associated with
+        the layer.
+
+        Parameters
+        ----------
+        md_metadata : owslib.iso.MD_Metadata
+            Parsed remote metadata describing the WFS layer.
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
+        Returns
+        -------
+        dict
+            Dictionary with fields described in the feature catalogue,
+            as returned by pydov.util.owsutil.get_remote_featurecatalogue.
+
+        """
+        csw_url = self._get_csw_base_url()
+        fc_uuid = owsutil.get_featurecatalogue_uuid(md_metadata)
+
+        feature_catalogue = self._get_snapshot(
+            ('featurecatalogue', self._get_service_key(csw_url), self._layer),
+            lambda: owsutil.get_remote_featurecatalogue(csw_url, fc_uuid),
+            owsutil.get_featurecatalogue_url(csw_url, fc_uuid),
+            owsutil.parse_featurecatalogue, prefetched)
+
+        # Snapshots are saved as JSON, which turns tuples into lists.
+        for attribute in feature_catalogue['attributes'].values():
+            attribute['multiplicity'] = tuple(attribute['multiplicity'])
+        return feature_catalogue
 
     def _get_csw_base_url(self):
         """Get the CSW base url for the remote metadata associated with the
@@ -319,46 +677,8 @@ class AbstractSearch(object):
                     raise InvalidFieldError(
                         "Unknown return field: '%s'" % rf)
 
-    @staticmethod
-    def _get_remote_wfs_feature(wfs, typename, bbox, filter, propertyname,
-                                geometry_column):
-        """Perform the WFS GetFeature call to get features from the remote
-        service.
-
-        Parameters
-        ----------
-        typename : str
-            Layername to query.
-        bbox : tuple<minx,miny,maxx,maxy>
-            The bounding box limiting the features to retrieve.
-        filter : owslib.fes.FilterRequest
-            Filter request to search on attribute values.
-        propertyname : list<str>
-            List of properties to return.
-        geometry_column : str
-            Name of the geometry column to use in the spatial filter.
-
-        Returns
-        -------
-        bytes
-            Response of the WFS service.
-
-        """
-        wfs_getfeature_xml = owsutil.wfs_build_getfeature_request(
-            version=wfs.version,
-            geometry_column=geometry_column,
-            typename=typename,
-            bbox=bbox,
-            filter=filter,
-            propertyname=propertyname
-        )
-
-        return owsutil.wfs_get_feature(
-            baseurl=wfs.url,
-            get_feature_request=wfs_getfeature_xml
-        )
-
-    def _search(self, location=None, query=None, return_fields=None):
+    def _search(self, location=None, query=None, return_fields=None,
+                split_location=False, paged=False):
         """Perform the WFS search by issuing a GetFeature request.
 
         Parameters
@@ -374,12 +694,25 @@ class AbstractSearch(object):
             A list of fields to be returned in the output data. This should
             be a subset of the fields provided in `get_fields()`. Note that
             not all fields are currently supported as return fields.
+        split_location : bool, optional
+            Whether to split up the `location` in smaller parts when the
+            number of features reaches the maxFeatures limit of the WFS
+            server (True) or raise a FeatureOverflowError (False). Defaults
+            to False.
+        paged : bool, optional
+            Whether to retrieve the features in pages of at most
+            `_page_size` features (True), which is not limited by the
+            maxFeatures limit of the WFS server, or in a single request
+            (False). When True, `split_location` is ignored. Defaults to
+            False.
 
         Returns
         -------
-        etree.Element
-            XML tree of the WFS response containing the features matching
-            the location or the query.
+        generator<etree.Element>
+            Generator yielding the XML elements of the features matching
+            the location or the query, parsed incrementally from the WFS
+            response. Each element is only valid until the next one is
+            requested.
 
         Raises
         ------
@@ -397,9 +730,217 @@ class AbstractSearch(object):
 
         pydov.util.errors.FeatureOverflowError
             When the number of features to be returned is equal to the
-            maxFeatures limit of the WFS server.
+            maxFeatures limit of the WFS server, and the location could not
+            be split up.
+
+        """
+        filter_request, wfs_property_names = self._build_search(
+            location, query, return_fields)
+
+        if paged:
+            return self._start(self._search_paged(
+                location, filter_request, wfs_property_names))
+
+        if split_location and location is not None:
+            return self._start(self._search_split(
+                location, filter_request, wfs_property_names))
+
+        return self._get_features(location, filter_request,
+                                  wfs_property_names)
+
+    @staticmethod
+    def _start(features):
+        """Start the given generator of features, so its first GetFeature
+        request is performed and its errors are raised now instead of when
+        the first feature is requested.
+
+        Parameters
+        ----------
+        features : generator<etree.Element>
+            Generator yielding the XML elements of the features.
+
+        Returns
+        -------
+        generator<etree.Element>
+            Generator yielding the same XML elements.
+
+        """
+        try:
+            first = [next(features)]
+        except StopIteration:
+            first = []
+
+        def resume():
+            try:
+                for feature in first:
+                    yield feature
+                for feature in features:
+                    yield feature
+            finally:
+                features.close()
+
+        return resume()
+
+    def _dry_run(self, location=None, query=None, return_fields=None,
+                 split_location=False, paged=False):
+        """Estimate the cost of a search without performing it.
+
+        Only the number of features matching the search is requested from
+        the WFS server, using a GetFeature request with resultType=hits.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching.
+        return_fields : list<str>
+            A list of fields to be returned in the output data.
+        split_location : bool, optional
+            Whether the search would split up the `location` in smaller
+            parts when the number of features reaches the maxFeatures limit
+            of the WFS server. Defaults to False.
+        paged : bool, optional
+            Whether the search would retrieve the features in pages. When
+            True, `split_location` is ignored. Defaults to False.
+
+        Returns
+        -------
+        dict
+            Dictionary with the estimated cost of the search, including:
+
+            features (int)
+                The number of features matching the search.
+
+            overflow (bool)
+                Whether the search would reach the maxFeatures limit of the
+                WFS server, and should be paged or split up.
+
+            wfs_requests (int)
+                The number of GetFeature requests needed to retrieve the
+                features. When splitting up the location, the features are
+                assumed to be spread evenly over it.
+
+            xml_documents (int)
+                The number of XML documents of DOV objects needed to return
+                the `return_fields`, regardless of whether they are
+                available in the cache configured in `pydov.cache`.
+
+            estimated_time (float or None)
+                The estimated time in seconds to perform the search, based
+                on the latency of recent requests in
+                `pydov.util.net.get_latency` and `pydov.max_workers`, or None
+                if no latency has been recorded yet for one of the kinds of
+                requests needed.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` is provided.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
+
+        """
+        filter_request, wfs_property_names = self._build_search(
+            location, query, return_fields)
+
+        hits = self._get_hits(location, filter_request, wfs_property_names)
+
+        if paged:
+            # A last page that is full requires an extra, empty, page. When
+            # the first page is full, the number of features is requested.
+            page_size = self._get_page_size()
+            wfs_requests = hits // page_size + 1
+            if hits >= page_size:
+                wfs_requests += 1
+        elif split_location and location is not None:
+            # Each level of quadrants that reaches the maxFeatures limit is
+            # split up in four quadrants with a quarter of the features.
+            max_features = self._get_max_features()
+            wfs_requests = tiles = 1
+            for depth in range(self._split_max_depth):
+                if hits / float(tiles) < max_features:
+                    break
+                tiles *= 4
+                wfs_requests += tiles
+        else:
+            wfs_requests = 1
+
+        if self._type._requires_xml(return_fields):
+            xml_documents = hits
+        else:
+            xml_documents = 0
+
+        wfs_latency = get_latency('wfs')
+        xml_latency = get_latency('xml') if xml_documents > 0 else 0
+
+        if wfs_latency is None or xml_latency is None:
+            estimated_time = None
+        else:
+            estimated_time = wfs_requests * wfs_latency + math.ceil(
+                xml_documents / float(max(1, pydov.max_workers or 1))
+            ) * xml_latency
+
+        return {
+            'features': hits,
+            'overflow': not paged and hits >= self._get_max_features(),
+            'wfs_requests': wfs_requests,
+            'xml_documents': xml_documents,
+            'estimated_time': estimated_time
+        }
+
+    def _build_search(self, location=None, query=None, return_fields=None,
+                      cache=True):
+        """Validate the search parameters and build the filter and the list
+        of WFS properties of the GetFeature request.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching.
+        return_fields : list<str>
+            A list of fields to be returned in the output data.
+        cache : bool, optional
+            Whether to keep the validated search for later searches with the
+            same parameters. Defaults to True.
+
+        Returns
+        -------
+        filter_request : str or None
+            Serialised filter request to search on attribute values, None
+            if there is no `query`.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` is provided.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
 
         """
+        key = None
+        if cache:
+            key = self._get_search_key(location, query, return_fields)
+        compiled = None if key is None else self._compiled_searches.get(key)
+        if compiled is not None:
+            self._init_fields()
+            self._init_namespace()
+            self._init_wfs()
+            filter_request, wfs_property_names = compiled
+            return filter_request, list(wfs_property_names)
+
         self._pre_search_validation(location, query, return_fields)
         self._init_namespace()
         self._init_wfs()
@@ -437,49 +978,776 @@ class AbstractSearch(object):
                                        if i in return_fields])
             wfs_property_names = list(set(wfs_property_names))
 
-        fts = self._get_remote_wfs_feature(
-            wfs=self.__wfs,
-            typename=self._layer,
-            bbox=location,
-            filter=filter_request,
-            propertyname=wfs_property_names,
-            geometry_column=self._geometry_column)
+        if key is not None:
+            self._compiled_searches.set(
+                key, (filter_request, tuple(wfs_property_names)))
 
-        tree = etree.fromstring(fts)
+        return filter_request, wfs_property_names
 
-        if int(tree.get('numberOfFeatures')) == 10000:
-            raise FeatureOverflowError(
-                'Reached the limit of %i returned features. Please split up '
-                'the query to ensure getting all results.' % 10000)
+    def _get_search_key(self, location=None, query=None, return_fields=None):
+        """Return the normalised key of the given search parameters in the
+        cache of validated searches.
 
-        return tree
+        The key only includes whether a `location` is given, as the
+        location itself is not part of the filter or the WFS properties.
 
-    def get_description(self):
-        """Get the description of this search layer.
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data.
 
         Returns
         -------
-        str
-            The description of this layer.
+        tuple or None
+            The key of the search, or None if the parameters are invalid
+            and should not be cached.
 
         """
-        wfs_layer = self._get_layer()
-        return wfs_layer.abstract
+        if location is None and query is None:
+            return None
 
-    def get_fields(self):
-        """Get the metadata of the fields that are available.
+        if query is not None:
+            if not isinstance(query, owslib.fes.OgcExpression):
+                return None
+            try:
+                query = _get_query_key(query)
+            except TypeError:
+                # Identify queries with other values by their serialisation.
+                query = etree.tostring(query.toXML())
 
-        Returns
-        -------
-        fields : dict<str,dict>
-            Dictionary containing the metadata of the available fields,
-            where the metadata dictionary includes:
+        if return_fields is not None:
+            if type(return_fields) not in (list, tuple, set):
+                return None
+            return_fields = frozenset(return_fields)
 
-            name (str)
-                The name of the field.
+        return (type(self), self._layer, query, location is not None,
+                return_fields)
 
-            definition (str)
-                The definition of the field.
+    def _get_features(self, location, filter_request, wfs_property_names,
+                      cache=True):
+        """Perform a single GetFeature request and parse the response
+        incrementally.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+        cache : bool, optional
+            Whether to keep the serialised request for later searches with
+            the same parameters. Defaults to True.
+
+        Returns
+        -------
+        generator<etree.Element>
+            Generator yielding the XML elements of the features matching the
+            location and the filter request. Each element is only valid
+            until the next one is requested.
+
+        Raises
+        ------
+        pydov.util.errors.FeatureOverflowError
+            When the number of features to be returned is equal to the
+            maxFeatures limit of the WFS server.
+
+        """
+        return self._parse_features(self._get_response(
+            location, filter_request, wfs_property_names, cache))
+
+    def _get_response(self, location, filter_request, wfs_property_names,
+                      cache=True):
+        """Perform a single GetFeature request without parsing the response.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+        cache : bool, optional
+            Whether to keep the serialised request for later searches with
+            the same parameters. Defaults to True.
+
+        Returns
+        -------
+        bytes or file-like object
+            Response of the WFS service, to be read incrementally.
+
+        """
+        self._init_wfs()
+        return self._get_remote_wfs_feature(
+            wfs=self.__wfs,
+            typename=self._layer,
+            bbox=location,
+            filter=filter_request,
+            propertyname=wfs_property_names,
+            geometry_column=self._geometry_column,
+            stream=True,
+            cache=cache)
+
+    @staticmethod
+    def _get_remote_wfs_feature(wfs, typename, bbox, filter, propertyname,
+                                geometry_column, stream=False, cache=True):
+        """Perform the WFS GetFeature call to get features from the remote
+        service.
+
+        Parameters
+        ----------
+        wfs : owslib.wfs.WebFeatureService
+            WFS service to request the features from.
+        typename : str
+            Layername to query.
+        bbox : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter : str
+            Serialised filter request to search on attribute values.
+        propertyname : list<str>
+            List of properties to return.
+        geometry_column : str
+            Name of the geometry column to use in the spatial filter.
+        stream : bool, optional
+            Whether to return the response as a file-like object that is
+            read incrementally (True) or as bytes (False). Defaults to False.
+        cache : bool, optional
+            Whether to keep the serialised request for later calls with the
+            same parameters. Defaults to True.
+
+        Returns
+        -------
+        bytes or file-like object
+            Response of the WFS service.
+
+        """
+        request = AbstractSearch._build_getfeature_request(
+            wfs, typename, geometry_column, bbox, filter, propertyname,
+            cache=cache)
+
+        return owsutil.wfs_get_feature(
+            baseurl=wfs.url,
+            get_feature_request=request,
+            stream=stream
+        )
+
+    def _get_getfeature_request(self, location, filter_request,
+                                wfs_property_names, start_index=None,
+                                result_type=None):
+        """Build the WFS GetFeature request.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+        start_index : int, optional
+            Index of the first feature of the page to request, sorted on
+            the permanent key. Defaults to None, requesting all features.
+        result_type : str, optional
+            Set to 'hits' to request only the number of matching features.
+            Defaults to None, requesting the features.
+
+        Returns
+        -------
+        url : str
+            Base URL of the WFS service to post the request to.
+        request : bytes
+            The serialised WFS GetFeature request.
+
+        """
+        self._init_wfs()
+        return self.__wfs.url, self._build_getfeature_request(
+            self.__wfs, self._layer, self._geometry_column, location,
+            filter_request, wfs_property_names,
+            sort_by=None if start_index is None else
+            self._type._pkey_sourcefield,
+            start_index=start_index,
+            max_features=None if start_index is None else
+            self._get_page_size(),
+            result_type=result_type)
+
+    @staticmethod
+    def _build_getfeature_request(wfs, typename, geometry_column, bbox,
+                                  filter, propertyname, sort_by=None,
+                                  start_index=None, max_features=None,
+                                  result_type=None, cache=True):
+        """Build and serialise the WFS GetFeature request.
+
+        The serialised requests for all features or the number of features
+        are kept in an LRU cache and reused for the same parameters, the
+        pages of a paged search are built each time.
+
+        Parameters
+        ----------
+        wfs : owslib.wfs.WebFeatureService
+            WFS service to request the features from.
+        typename : str
+            Layername to query.
+        geometry_column : str
+            Name of the geometry column to use in the spatial filter.
+        bbox : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter : str
+            Serialised filter request to search on attribute values.
+        propertyname : list<str>
+            List of properties to return.
+        sort_by : str, optional
+            Property to sort the features on, for paging. Defaults to None.
+        start_index : int, optional
+            Index of the first feature of the page to request. Defaults to
+            None, requesting all features.
+        max_features : int, optional
+            Maximum number of features of the page to request. Defaults to
+            None.
+        result_type : str, optional
+            Set to 'hits' to request only the number of matching features.
+            Defaults to None, requesting the features.
+        cache : bool, optional
+            Whether to keep the serialised request for later calls with the
+            same parameters. Defaults to True.
+
+        Returns
+        -------
+        bytes
+            The serialised WFS GetFeature request.
+
+        """
+        key = None
+        if start_index is None:
+            key = (wfs.url, wfs.version, typename, geometry_column,
+                   None if bbox is None else tuple(bbox), filter,
+                   tuple(propertyname), result_type)
+            request = AbstractSearch._compiled_requests.get(key)
+            if request is not None:
+                return request
+
+        request = etree.tostring(owsutil.wfs_build_getfeature_request(
+            version=wfs.version,
+            geometry_column=geometry_column,
+            typename=typename,
+            bbox=bbox,
+            filter=filter,
+            propertyname=propertyname,
+            sort_by=sort_by,
+            start_index=start_index,
+            max_features=max_features,
+            result_type=result_type
+        ))
+
+        if key is not None and cache:
+            AbstractSearch._compiled_requests.set(key, request)
+        return request
+
+    def _get_max_features(self):
+        """Get the maximum number of features returned by a GetFeature
+        request to the WFS server.
+
+        Returns
+        -------
+        int
+            The limit advertised in the capabilities of the WFS server, or
+            `_max_features` if there is none.
+
+        """
+        self._init_wfs()
+        return owsutil.get_max_features(self.__wfs) or self._max_features
+
+    def _get_page_size(self):
+        """Get the number of features of each page of a paged search.
+
+        Returns
+        -------
+        int
+            The smaller of `_page_size` and the maxFeatures limit of the WFS
+            server, so a page that is not full is the last one.
+
+        """
+        return min(self._page_size, self._get_max_features())
+
+    def _parse_features(self, response):
+        """Parse the response of a GetFeature request incrementally.
+
+        Parameters
+        ----------
+        response : bytes or file-like object
+            Response of the WFS service.
+
+        Returns
+        -------
+        generator<etree.Element>
+            Generator yielding the XML elements of the features in the
+            response. Each element is only valid until the next one is
+            requested.
+
+        Raises
+        ------
+        pydov.util.errors.FeatureOverflowError
+            When the number of features in the response is equal to the
+            maxFeatures limit of the WFS server.
+
+        """
+        tree, features = owsutil.wfs_parse_getfeature(response)
+
+        max_features = self._get_max_features()
+        if int(tree.get('numberOfFeatures')) == max_features:
+            features.close()
+            raise FeatureOverflowError(
+                'Reached the limit of %i returned features. Please split up '
+                'the query to ensure getting all results.' % max_features)
+
+        return features
+
+    @staticmethod
+    def _split_location(tile, location, margin=0.001):
+        """Split a bounding box in four quadrants.
+
+        The edges of the quadrants inside the original `location` are
+        expanded by `margin`, so features on the edge between two quadrants
+        are returned by both and none are lost.
+
+        Parameters
+        ----------
+        tile : tuple<minx,miny,maxx,maxy>
+            The bounding box to split.
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box of the original search, of which `tile` is a
+            part.
+        margin : float, optional
+            Distance to expand the inner edges of the quadrants with.
+            Defaults to 0.001, being the precision of the coordinates in
+            the GetFeature request.
+
+        Returns
+        -------
+        list<tuple<minx,miny,maxx,maxy>>
+            The four quadrants of the bounding box.
+
+        """
+        minx, miny, maxx, maxy = tile
+        midx = (minx + maxx) / 2.0
+        midy = (miny + maxy) / 2.0
+
+        quadrants = []
+        for x0, x1 in ((minx, midx), (midx, maxx)):
+            for y0, y1 in ((miny, midy), (midy, maxy)):
+                quadrants.append((
+                    x0 - margin if x0 > location[0] else x0,
+                    y0 - margin if y0 > location[1] else y0,
+                    x1 + margin if x1 < location[2] else x1,
+                    y1 + margin if y1 < location[3] else y1))
+        return quadrants
+
+    def _search_split(self, location, filter_request, wfs_property_names):
+        """Perform the WFS search, recursively splitting the location in
+        quadrants whenever the number of features reaches the maxFeatures
+        limit of the WFS server.
+
+        The GetFeature requests of each level of quadrants are performed
+        concurrently, using `pydov.max_workers` threads. Features returned
+        by more than one quadrant are only included once.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+
+        Yields
+        ------
+        etree.Element
+            The XML elements of the features matching the location and the
+            filter request. Each element is only valid until the next one is
+            requested.
+
+        Raises
+        ------
+        pydov.util.errors.FeatureOverflowError
+            When the maxFeatures limit of the WFS server is still reached
+            after splitting the location `_split_max_depth` times.
+
+        """
+        def get_response(tile):
+            return self._get_response(tile, filter_request,
+                                      wfs_property_names)
+
+        pkeys = set()
+        tiles = [location]
+
+        for depth in range(self._split_max_depth + 1):
+            overflowed = []
+            results = imap_ordered(get_response, tiles, pydov.max_workers,
+                                   discard=self._close_response)
+
+            for i, response in enumerate(results):
+                # The responses are parsed in this thread only, lxml parsers
+                # should not be shared between threads.
+                try:
+                    features = self._parse_features(response)
+                except FeatureOverflowError:
+                    overflowed.append(tiles[i])
+                    continue
+
+                for feature in features:
+                    pkey = self._get_feature_pkey(feature)
+                    if pkey is None or pkey not in pkeys:
+                        pkeys.add(pkey)
+                        yield feature
+
+            if len(overflowed) == 0:
+                return
+
+            tiles = []
+            for tile in overflowed:
+                tiles.extend(self._split_location(tile, location))
+
+        raise FeatureOverflowError(
+            'Reached the limit of %i returned features after splitting the '
+            'location %i times. Please split up the query to ensure getting '
+            'all results.' % (self._get_max_features(),
+                              self._split_max_depth))
+
+    def _search_paged(self, location, filter_request, wfs_property_names):
+        """Perform the WFS search in pages of at most `_page_size` features,
+        or the maxFeatures limit of the WFS server if that is lower, sorted
+        on the permanent key, until a page is not full.
+
+        When the first page is full, the number of matching features is
+        requested and the remaining pages are requested ahead in the
+        background (using `pydov.max_workers` threads, but at least two)
+        while the current one is being parsed. Features returned by more
+        than one page, which can happen when the data is modified during the
+        search, are only included once.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+
+        Yields
+        ------
+        etree.Element
+            The XML elements of the features matching the location and the
+            filter request. Each element is only valid until the next one is
+            requested.
+
+        """
+        def get_page(start_index):
+            url, request = self._get_getfeature_request(
+                location, filter_request, wfs_property_names, start_index)
+            return owsutil.wfs_get_feature(baseurl=url,
+                                           get_feature_request=request)
+
+        def parse_page(response):
+            tree, features = owsutil.wfs_parse_getfeature(response)
+            count = 0
+            for feature in features:
+                count += 1
+                pkey = self._get_feature_pkey(feature)
+                if pkey is None or pkey not in pkeys:
+                    pkeys.add(pkey)
+                    yield feature
+            full_pages.append(count >= page_size)
+
+        page_size = self._get_page_size()
+        pkeys = set()
+        full_pages = []
+
+        for feature in parse_page(get_page(0)):
+            yield feature
+
+        if not full_pages[-1]:
+            return
+
+        hits = self._get_hits(location, filter_request, wfs_property_names)
+        start_indices = range(page_size, hits, page_size)
+        # At least two workers, so the next page is requested while the
+        # current one is being parsed.
+        pages = imap_ordered(get_page, start_indices,
+                             max(2, pydov.max_workers or 1),
+                             discard=self._close_response)
+        try:
+            for response in pages:
+                for feature in parse_page(response):
+                    yield feature
+
+                if not full_pages[-1]:
+                    return
+        finally:
+            pages.close()
+
+        # Features added since the number of features was requested are
+        # retrieved in pages after the last one.
+        start_index = (len(start_indices) + 1) * page_size
+        while full_pages[-1]:
+            for feature in parse_page(get_page(start_index)):
+                yield feature
+            start_index += page_size
+
+    def _get_hits(self, location, filter_request, wfs_property_names):
+        """Get the number of features matching the search, using a
+        GetFeature request with resultType=hits.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        filter_request : str
+            Serialised filter request to search on attribute values.
+        wfs_property_names : list<str>
+            List of WFS properties to return.
+
+        Returns
+        -------
+        int
+            The number of features matching the location and the filter
+            request.
+
+        """
+        url, request = self._get_getfeature_request(
+            location, filter_request, wfs_property_names, result_type='hits')
+        tree, features = owsutil.wfs_parse_getfeature(
+            owsutil.wfs_get_feature(baseurl=url, get_feature_request=request))
+        features.close()
+        return int(tree.get('numberOfFeatures'))
+
+    @staticmethod
+    def _close_response(response):
+        """Close a response of the WFS service that will not be parsed, to
+        release its connection.
+
+        Parameters
+        ----------
+        response : bytes or file-like object
+            Response of the WFS service.
+
+        """
+        if hasattr(response, 'close'):
+            response.close()
+
+    def _search_by_pkeys(self, pkeys, return_fields=None):
+        """Perform the WFS search for the features with the given permanent
+        keys.
+
+        The permanent keys are searched in chunks of at most
+        `_pkeys_chunksize` keys, each using a single GetFeature request with
+        an Or-filter on the permanent key. The requests are performed
+        concurrently, using `pydov.max_workers` threads.
+
+        Parameters
+        ----------
+        pkeys : list<str> or tuple<str> or set<str>
+            Permanent keys of the DOV objects to search for.
+        return_fields : list<str>
+            A list of fields to be returned in the output data.
+
+        Returns
+        -------
+        list<AbstractDovType>
+            Instances of the datatype of this search class, in the order of
+            their permanent key in `pkeys`. Permanent keys that occur more
+            than once only result in a single instance, permanent keys
+            without matching feature in none.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When `pkeys` is not a list, tuple or set.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+        """
+        if type(pkeys) not in (list, tuple, set):
+            raise InvalidSearchParameterError(
+                'Pkeys should be a list, tuple or set.')
+
+        unique_pkeys = []
+        seen = set()
+        for pkey in pkeys:
+            if pkey not in seen:
+                seen.add(pkey)
+                unique_pkeys.append(pkey)
+
+        chunks = [unique_pkeys[i:i + self._pkeys_chunksize] for i in range(
+            0, len(unique_pkeys), self._pkeys_chunksize)]
+
+        requests = []
+        for chunk in chunks:
+            filters = [PropertyIsEqualTo(
+                propertyname=self._type._pkey_sourcefield, literal=pkey)
+                for pkey in chunk]
+            query = filters[0] if len(filters) == 1 else Or(filters)
+            # One-off queries, not kept for later searches.
+            requests.append(self._build_search(
+                query=query, return_fields=return_fields, cache=False))
+
+        namespace = self._init_namespace()
+
+        def get_instances(request):
+            filter_request, wfs_property_names = request
+            features = self._get_features(None, filter_request,
+                                          wfs_property_names, cache=False)
+            return dict((i.pkey, i) for i in self._type.from_wfs(
+                features, namespace))
+
+        instances = []
+        results = imap_ordered(get_instances, requests, pydov.max_workers)
+        for chunk, chunk_instances in zip(chunks, results):
+            instances.extend([chunk_instances[pkey] for pkey in chunk
+                              if pkey in chunk_instances])
+        return instances
+
+    def _get_feature_pkey(self, feature):
+        """Get the permanent key of the DOV object of a WFS feature.
+
+        Parameters
+        ----------
+        feature : etree.Element
+            XML element representing a single record of the WFS layer.
+
+        Returns
+        -------
+        str or None
+            The permanent key, None if the feature does not contain it.
+
+        """
+        pkey_tag = '}' + self._type._pkey_sourcefield
+        for child in feature:
+            if child.tag.endswith(pkey_tag):
+                return child.text
+        return None
+
+    def _from_wfs(self, features, namespace, return_fields=None):
+        """Build instances of the datatype of this search class from the
+        features of the WFS response.
+
+        When at least one of the `return_fields` has to be resolved from
+        the XML documents of the instances, the WFS response is parsed
+        completely first: resolving the XML documents takes much longer
+        than parsing the response, and the server could close the
+        connection of a response that is left unread for so long. Otherwise
+        the instances are built as the response is being parsed.
+
+        Parameters
+        ----------
+        features : iterable<etree.Element>
+            The XML elements of the features, as returned by `_search`.
+        namespace : str
+            Namespace associated with the WFS layer of this search class.
+        return_fields : list<str> or tuple<str> or set<str>
+            List of fields to include in the output. Defaults to None, which
+            includes all fields.
+
+        Returns
+        -------
+        list<AbstractDovType> or generator<AbstractDovType>
+            The instances of the datatype of this search class.
+
+        """
+        instances = self._type.from_wfs(features, namespace)
+        if self._type._requires_xml(return_fields):
+            instances = list(instances)
+        return instances
+
+    def _to_df_chunks(self, instances, return_fields, chunksize):
+        """Group the data of the given instances in dataframes of at most
+        `chunksize` rows.
+
+        Parameters
+        ----------
+        instances : iterable<AbstractDovType>
+            Iterable of instances of the datatype of this search class.
+        return_fields : list<str> or tuple<str> or set<str>
+            List of fields to include in the dataframes. Defaults to None,
+            which includes all fields.
+        chunksize : int
+            Maximum number of rows in each dataframe.
+
+        Yields
+        ------
+        pandas.core.frame.DataFrame
+            DataFrame containing the next (at most) `chunksize` rows of the
+            output data.
+
+        """
+        def chunks():
+            rows = []
+            for row in self._type.to_df_array(instances, return_fields,
+                                              convert=False):
+                rows.append(row)
+                if len(rows) >= chunksize:
+                    yield self._type._build_df(rows, return_fields)
+                    rows = []
+
+            if len(rows) > 0:
+                yield self._type._build_df(rows, return_fields)
+
+        return self._iter_instrumented(chunks())
+
+    @staticmethod
+    def _check_chunksize(chunksize):
+        """Check whether the given chunksize is valid.
+
+        Parameters
+        ----------
+        chunksize : int
+            Maximum number of rows in each dataframe.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When `chunksize` is not a positive integer.
+
+        """
+        if isinstance(chunksize, bool) or \
+                not isinstance(chunksize, numbers.Integral) or chunksize < 1:
+            raise InvalidSearchParameterError(
+                'Chunksize should be a positive integer.')
+
+    def get_description(self):
+        """Get the description of this search layer.
+
+        Returns
+        -------
+        str
+            The description of this layer.
+
+        """
+        with activated(self._instruments):
+            wfs_layer = self._get_layer()
+        return wfs_layer.abstract
+
+    def get_fields(self):
+        """Get the metadata of the fields that are available.
+
+        Returns
+        -------
+        fields : dict<str,dict>
+            Dictionary containing the metadata of the available fields,
+            where the metadata dictionary includes:
+
+            name (str)
+                The name of the field.
+
+            definition (str)
+                The definition of the field.
 
             type (str)
                 The datatype of the field.
@@ -499,3 +1767,309 @@ class AbstractSearch(object):
         """
         self._init_fields()
         return self._fields
+
+    def search(self, location=None, query=None, return_fields=None,
+               split_location=False, paged=False, dry_run=False,
+               normalized=False):
+        """Search for DOV objects of the datatype of this search class.
+        Provide `location` and/or `query`. When `return_fields` is None, all
+        fields are returned.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching. This can contain any
+            combination of filter elements defined in owslib.fes. The query
+            should use the fields provided in `get_fields()`. Note that not
+            all fields are currently supported as a search parameter.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data. This should
+            be a subset of the fields provided in `get_fields()`. Note that
+            not all fields are currently supported as return fields.
+        split_location : bool, optional
+            Whether to split up the `location` in smaller parts when the
+            number of features reaches the maxFeatures limit of the WFS
+            server (True) or raise a FeatureOverflowError (False). Defaults
+            to False.
+        paged : bool, optional
+            Whether to retrieve the features from the WFS server in pages,
+            sorted on the permanent key (True), which is not limited by the
+            maxFeatures limit of the WFS server, or in a single request
+            (False). When True, `split_location` is ignored. Defaults to
+            False.
+        dry_run : bool, optional
+            Whether to only estimate the cost of the search (True) instead
+            of performing it (False). Defaults to False.
+        normalized : bool, optional
+            Whether to return the output in two dataframes (True), one
+            with the fields of the DOV objects and one with the fields of
+            their subtypes, or in a single dataframe repeating the former
+            for each row of the latter (False). Defaults to False.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame or dict or tuple
+            DataFrame containing the output of the search query, or when
+            `dry_run` is True a dictionary with the number of matching
+            `features`, whether the search would `overflow` the
+            maxFeatures limit of the WFS server, the number of
+            `wfs_requests` and `xml_documents` needed and the
+            `estimated_time` in seconds, or when `normalized` is True a
+            tuple of two dataframes as returned by `to_df_normalized` of
+            the datatype, which can be joined using its `denormalize` with
+            the same `return_fields`.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` is provided.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
+
+            When a field that can only be used as a query parameter is used as
+            a return field.
+
+        pydov.util.errors.FeatureOverflowError
+            When the number of features to be returned is equal to the
+            maxFeatures limit of the WFS server, and the location could not
+            be split up.
+
+        AttributeError
+            When the argument supplied as return_fields is not a list,
+            tuple or set.
+
+        """
+        with self._instrumented() as timer:
+            if dry_run:
+                return self._dry_run(location=location, query=query,
+                                     return_fields=return_fields,
+                                     split_location=split_location,
+                                     paged=paged)
+
+            fts = self._search(location=location, query=query,
+                               return_fields=return_fields,
+                               split_location=split_location,
+                               paged=paged)
+
+            instances = self._from_wfs(fts, self._init_namespace(),
+                                       return_fields)
+
+            if normalized:
+                result = self._type.to_df_normalized(
+                    instances, return_fields)
+                timer.features = len(result[0])
+                return result
+
+            df = self._type.to_df(instances, return_fields)
+            timer.features = len(df)
+            return df
+
+    def search_by_pkeys(self, pkeys, return_fields=None):
+        """Search for DOV objects of the datatype of this search class with
+        the given permanent keys. When `return_fields` is None, all fields
+        are returned.
+
+        The permanent keys are searched in chunks, using
+        `pydov.max_workers` threads.
+
+        Parameters
+        ----------
+        pkeys : list<str> or tuple<str> or set<str>
+            Permanent keys of the objects to search for.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data. This should
+            be a subset of the fields provided in `get_fields()`. Note that
+            not all fields are currently supported as return fields.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame containing the output of the search, in the order of
+            the permanent keys in `pkeys`. Permanent keys that are not found
+            are not included.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When `pkeys` is not a list, tuple or set.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that can only be used as a query parameter is used as
+            a return field.
+
+        AttributeError
+            When the argument supplied as return_fields is not a list,
+            tuple or set.
+
+        """
+        with self._instrumented() as timer:
+            instances = self._search_by_pkeys(pkeys, return_fields)
+            df = self._type.to_df(instances, return_fields)
+            timer.features = len(df)
+            return df
+
+    def async_search(self, location=None, query=None, return_fields=None,
+                     split_location=False, paged=False, client=None):
+        """Search for DOV objects of the datatype of this search class
+        asynchronously, for use in an asyncio event loop. Provide `location`
+        and/or `query`. When `return_fields` is None, all fields are
+        returned.
+
+        All remote requests are performed asynchronously using the
+        optional `aiohttp` dependency, the XML documents of the DOV objects
+        concurrently. This method requires Python 3.5 or later.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching. This can contain any
+            combination of filter elements defined in owslib.fes. The query
+            should use the fields provided in `get_fields()`. Note that not
+            all fields are currently supported as a search parameter.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data. This should
+            be a subset of the fields provided in `get_fields()`. Note that
+            not all fields are currently supported as return fields.
+        split_location : bool, optional
+            Whether to split up the `location` in smaller parts when the
+            number of features reaches the maxFeatures limit of the WFS
+            server (True) or raise a FeatureOverflowError (False). Defaults
+            to False.
+        paged : bool, optional
+            Whether to retrieve the features from the WFS server in pages,
+            sorted on the permanent key (True), which is not limited by the
+            maxFeatures limit of the WFS server, or in a single request
+            (False). When True, `split_location` is ignored. Defaults to
+            False.
+        client : pydov.util.aio.AsyncClient, optional
+            Client to perform the requests with, to share its connections
+            with other searches. Defaults to None, which will use a new
+            client for this search only.
+
+        Returns
+        -------
+        coroutine
+            Coroutine returning a pandas.core.frame.DataFrame containing the
+            output of the search query.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` is provided.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
+
+            When a field that can only be used as a query parameter is used as
+            a return field.
+
+        pydov.util.errors.FeatureOverflowError
+            When the number of features to be returned is equal to the
+            maxFeatures limit of the WFS server, and the location could not
+            be split up.
+
+        AttributeError
+            When the argument supplied as return_fields is not a list,
+            tuple or set.
+
+        """
+        from pydov.search.aio import async_search
+        return async_search(self, location=location, query=query,
+                            return_fields=return_fields,
+                            split_location=split_location, paged=paged,
+                            client=client)
+
+    def search_iter(self, location=None, query=None, return_fields=None,
+                    split_location=False, paged=False,
+                    chunksize=1000):
+        """Search for DOV objects of the datatype of this search class,
+        yielding the output in dataframes of at most `chunksize` rows as the
+        records are resolved. Provide `location` and/or `query`. When
+        `return_fields` is None, all fields are returned.
+
+        Parameters
+        ----------
+        location : tuple<minx,miny,maxx,maxy>
+            The bounding box limiting the features to retrieve.
+        query : owslib.fes.OgcExpression
+            OGC filter expression to use for searching. This can contain any
+            combination of filter elements defined in owslib.fes. The query
+            should use the fields provided in `get_fields()`. Note that not
+            all fields are currently supported as a search parameter.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data. This should
+            be a subset of the fields provided in `get_fields()`. Note that
+            not all fields are currently supported as return fields.
+        split_location : bool, optional
+            Whether to split up the `location` in smaller parts when the
+            number of features reaches the maxFeatures limit of the WFS
+            server (True) or raise a FeatureOverflowError (False). Defaults
+            to False.
+        paged : bool, optional
+            Whether to retrieve the features from the WFS server in pages,
+            sorted on the permanent key (True), which is not limited by the
+            maxFeatures limit of the WFS server, or in a single request
+            (False). When True, `split_location` is ignored. Defaults to
+            False.
+        chunksize : int, optional
+            Maximum number of rows in each of the resulting dataframes.
+            Defaults to 1000.
+
+        Returns
+        -------
+        generator<pandas.core.frame.DataFrame>
+            Generator yielding DataFrames containing the output of the search
+            query, in chunks of at most `chunksize` rows. Nothing is yielded
+            when there are no results.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` is provided.
+
+            When `chunksize` is not a positive integer.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
+
+            When a field that can only be used as a query parameter is used as
+            a return field.
+
+        pydov.util.errors.FeatureOverflowError
+            When the number of features to be returned is equal to the
+            maxFeatures limit of the WFS server, and the location could not
+            be split up.
+
+        AttributeError
+            When the argument supplied as return_fields is not a list,
+            tuple or set.
+
+        """
+        with activated(self._instruments):
+            self._check_chunksize(chunksize)
+
+            fts = self._search(location=location, query=query,
+                               return_fields=return_fields,
+                               split_location=split_location,
+                               paged=paged)
+
+            instances = self._from_wfs(fts, self._init_namespace(),
+                                       return_fields)
+
+        return self._to_df_chunks(instances, return_fields, chunksize)
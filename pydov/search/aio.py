@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""Module containing the asynchronous implementation of the searches, used
+by the `async_search` methods of the search classes.
+
+This module requires Python 3.5 or later and the optional `aiohttp`
+dependency.
+"""
+import asyncio
+
+import pydov
+from pydov.search.abstract import (
+    AbstractSearch,
+    _MetadataRequired,
+)
+from pydov.util import owsutil
+from pydov.util.aio import (
+    AsyncClient,
+    get_dov_xml,
+    get_running_loop,
+)
+from pydov.util.errors import FeatureOverflowError
+from pydov.util.instrumentation import Timer
+
+
+async def _request_metadata(client, required):
+    """Request the remote metadata required by a search class.
+
+    When a metadata cache is configured, the metadata is read from its
+    snapshot if it has not expired, and saved as snapshot otherwise. When
+    the request fails, the expired snapshot of the metadata is used
+    instead, if there is one. The cache is read and written in the default
+    executor of the event loop, to not block the other tasks.
+
+    Parameters
+    ----------
+    client : pydov.util.aio.AsyncClient
+        Client to perform the request with.
+    required : pydov.search.abstract._MetadataRequired
+        The metadata required by the search class.
+
+    Returns
+    -------
+    object
+        The metadata, as JSON serialisable value.
+
+    """
+    async def request():
+        with Timer(AbstractSearch._snapshot_phases[required.key[0]]) as timer:
+            content = await client.get(required.url)
+            timer.bytes = len(content)
+        return required.parse(content)
+
+    cache = pydov.metadata_cache
+    if cache is None:
+        return await request()
+
+    loop = get_running_loop()
+    value = await loop.run_in_executor(None, cache.load, required.key)
+    if value is not None:
+        return value
+
+    try:
+        value = await request()
+    except Exception as error:
+        def fetch(error=error):
+            raise error
+        return await loop.run_in_executor(None, cache.get, required.key,
+                                          fetch)
+    return await loop.run_in_executor(None, cache.get, required.key,
+                                      lambda: value)
+
+
+async def _init_metadata(search, client):
+    """Initialise the WFS service, namespace and fields of the search class,
+    requesting the remote metadata asynchronously.
+
+    The search class is initialised as usual, but in asynchronous mode:
+    each time it requires metadata that has not been requested before, it
+    is read from `pydov.metadata_cache` or requested here and the
+    initialisation is resumed.
+
+    Parameters
+    ----------
+    search : pydov.search.abstract.AbstractSearch
+        Instance of the search class to initialise.
+    client : pydov.util.aio.AsyncClient
+        Client to perform the requests with.
+
+    Returns
+    -------
+    namespace : str
+        The namespace associated with the WFS layer of the search class.
+
+    """
+    prefetched = {}
+    while True:
+        try:
+            search._init_wfs(prefetched)
+            namespace = search._init_namespace(prefetched)
+            search._init_fields(prefetched)
+            return namespace
+        except _MetadataRequired as required:
+            prefetched[required.key] = await _request_metadata(
+                client, required)
+
+
+async def _get_features(search, client, location, filter_request,
+                        wfs_property_names):
+    """Perform a single GetFeature request asynchronously.
+
+    Parameters
+    ----------
+    search : pydov.search.abstract.AbstractSearch
+        Instance of the search class.
+    client : pydov.util.aio.AsyncClient
+        Client to perform the request with.
+    location : tuple<minx,miny,maxx,maxy>
+        The bounding box limiting the features to retrieve.
+    filter_request : str
+        Serialised filter request to search on attribute values.
+    wfs_property_names : list<str>
+        List of WFS properties to return.
+
+    Returns
+    -------
+    generator<etree.Element>
+        Generator yielding the XML elements of the features matching the
+        location and the filter request.
+
+    Raises
+    ------
+    pydov.util.errors.FeatureOverflowError
+        When the number of features to be returned is equal to the
+        maxFeatures limit of the WFS server.
+
+    """
+    url, request = search._get_getfeature_request(
+        location, filter_request, wfs_property_names)
+    with Timer('getfeature') as timer:
+        response = await client.post(url, request)
+        timer.bytes = len(response)
+    return search._parse_features(response)
+
+
+async def _search_split(search, client, namespace, location, filter_request,
+                        wfs_property_names):
+    """Perform the WFS search asynchronously, recursively splitting the
+    location in quadrants whenever the number of features reaches the
+    maxFeatures limit of the WFS server.
+
+    The GetFeature requests of each level of quadrants are performed
+    concurrently. Features returned by more than one quadrant are only
+    included once.
+
+    Parameters
+    ----------
+    search : pydov.search.abstract.AbstractSearch
+        Instance of the search class.
+    client : pydov.util.aio.AsyncClient
+        Client to perform the requests with.
+    namespace : str
+        The namespace associated with the WFS layer of the search class.
+    location : tuple<minx,miny,maxx,maxy>
+        The bounding box limiting the features to retrieve.
+    filter_request : str
+        Serialised filter request to search on attribute values.
+    wfs_property_names : list<str>
+        List of WFS properties to return.
+
+    Returns
+    -------
+    list<AbstractDovType>
+        Instances of the datatype of the search class for the features
+        matching the location and the filter request.
+
+    Raises
+    ------
+    pydov.util.errors.FeatureOverflowError
+        When the maxFeatures limit of the WFS server is still reached
+        after splitting the location `_split_max_depth` times.
+
+    """
+    async def get_features(tile):
+        try:
+            return await _get_features(search, client, tile, filter_request,
+                                       wfs_property_names)
+        except FeatureOverflowError:
+            return None
+
+    def unique(features):
+        for feature in features:
+            pkey = search._get_feature_pkey(feature)
+            if pkey is None or pkey not in pkeys:
+                pkeys.add(pkey)
+                yield feature
+
+    pkeys = set()
+    instances = []
+    tiles = [location]
+
+    for depth in range(search._split_max_depth + 1):
+        results = await asyncio.gather(*[get_features(t) for t in tiles])
+
+        overflowed = []
+        for tile, features in zip(tiles, results):
+            if features is None:
+                overflowed.append(tile)
+            else:
+                instances.extend(search._type.from_wfs(unique(features),
+                                                       namespace))
+
+        if len(overflowed) == 0:
+            return instances
+
+        tiles = []
+        for tile in overflowed:
+            tiles.extend(search._split_location(tile, location))
+
+    raise FeatureOverflowError(
+        'Reached the limit of %i returned features after splitting the '
+        'location %i times. Please split up the query to ensure getting '
+        'all results.' % (search._get_max_features(),
+                          search._split_max_depth))
+
+
+async def _search_paged(search, client, namespace, location, filter_request,
+                        wfs_property_names):
+    """Perform the WFS search asynchronously in pages of at most
+    `_page_size` features, or the maxFeatures limit of the WFS server if
+    that is lower, sorted on the permanent key, until a page is not full.
+
+    When the first page is full, the number of matching features is
+    requested and the remaining pages are requested concurrently in batches
+    of as many pages as the client has connections per host.
+    Features returned by more than one page are only included once.
+
+    Parameters
+    ----------
+    search : pydov.search.abstract.AbstractSearch
+        Instance of the search class.
+    client : pydov.util.aio.AsyncClient
+        Client to perform the requests with.
+    namespace : str
+        The namespace associated with the WFS layer of the search class.
+    location : tuple<minx,miny,maxx,maxy>
+        The bounding box limiting the features to retrieve.
+    filter_request : str
+        Serialised filter request to search on attribute values.
+    wfs_property_names : list<str>
+        List of WFS properties to return.
+
+    Returns
+    -------
+    list<AbstractDovType>
+        Instances of the datatype of the search class for the features
+        matching the location and the filter request.
+
+    """
+    async def get_page(start_index):
+        url, request = search._get_getfeature_request(
+            location, filter_request, wfs_property_names, start_index)
+        with Timer('getfeature') as timer:
+            response = await client.post(url, request)
+            timer.bytes = len(response)
+        return response
+
+    def parse_page(response):
+        tree, features = owsutil.wfs_parse_getfeature(response)
+        count = 0
+        for feature in features:
+            count += 1
+            pkey = search._get_feature_pkey(feature)
+            if pkey is None or pkey not in pkeys:
+                pkeys.add(pkey)
+                yield feature
+        full_pages.append(count >= page_size)
+
+    page_size = search._get_page_size()
+    pkeys = set()
+    full_pages = []
+    instances = []
+
+    instances.extend(search._type.from_wfs(parse_page(await get_page(0)),
+                                           namespace))
+    if not full_pages[-1]:
+        return instances
+
+    url, request = search._get_getfeature_request(
+        location, filter_request, wfs_property_names, result_type='hits')
+    tree, features = owsutil.wfs_parse_getfeature(
+        await client.post(url, request))
+    features.close()
+    hits = int(tree.get('numberOfFeatures'))
+
+    start_indices = range(page_size, hits, page_size)
+    for i in range(0, len(start_indices), client.limit):
+        batch = start_indices[i:i + client.limit]
+        responses = await asyncio.gather(*[get_page(j) for j in batch])
+        for response in responses:
+            instances.extend(search._type.from_wfs(parse_page(response),
+                                                   namespace))
+            if not full_pages[-1]:
+                return instances
+
+    # Features added since the number of features was requested are
+    # retrieved in pages after the last one.
+    start_index = (len(start_indices) + 1) * page_size
+    while full_pages[-1]:
+        instances.extend(search._type.from_wfs(
+            parse_page(await get_page(start_index)), namespace))
+        start_index += page_size
+    return instances
+
+
+async def _resolve_xml(client, instance, return_fields):
+    """Request and parse the XML data of the given instance asynchronously,
+    unless the requested fields have been resolved already. Concurrent
+    resolutions of the same DOV object with the same client share a single
+    request and parse.
+
+    Parameters
+    ----------
+    client : pydov.util.aio.AsyncClient
+        Client to perform the request with.
+    instance : pydov.types.abstract.AbstractDovType
+        Instance of a DOV type to resolve.
+    return_fields : list<str> or tuple<str> or set<str>
+        List of fields to resolve, None to resolve all fields.
+
+    """
+    if instance._is_xml_resolved(return_fields):
+        return
+
+    async def resolve():
+        xml = instance._xml
+        if xml is None:
+            xml = await get_dov_xml(client, instance.pkey + '.xml')
+        with Timer('xml_parse', bytes=len(xml)):
+            instance._parse_xml_data(xml, return_fields)
+        instance._keep_xml(xml)
+        return instance
+
+    resolved = await client._coalesce(
+        instance._get_resolution_key(return_fields), resolve)
+    if resolved is not instance:
+        instance._copy_xml_data(resolved)
+
+
+async def async_search(search, location=None, query=None,
+                       return_fields=None, split_location=False,
+                       paged=False, client=None):
+    """Perform a search asynchronously.
+
+    All remote requests (the metadata of the search class, the GetFeature
+    request and the XML documents of the DOV objects) are performed
+    asynchronously, the XML documents concurrently.
+
+    Parameters
+    ----------
+    search : pydov.search.abstract.AbstractSearch
+        Instance of the search class.
+    location : tuple<minx,miny,maxx,maxy>
+        The bounding box limiting the features to retrieve.
+    query : owslib.fes.OgcExpression
+        OGC filter expression to use for searching.
+    return_fields : list<str> or tuple<str> or set<str>
+        A list of fields to be returned in the output data.
+    split_location : bool, optional
+        Whether to split up the `location` in smaller parts when the number
+        of features reaches the maxFeatures limit of the WFS server.
+    paged : bool, optional
+        Whether to retrieve the features in pages, sorted on the permanent
+        key. When True, `split_location` is ignored.
+    client : pydov.util.aio.AsyncClient, optional
+        Client to perform the requests with. Defaults to None, which will
+        use a new client for this search only.
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame
+        DataFrame containing the output of the search query.
+
+    """
+    if client is None:
+        async with AsyncClient() as client:
+            return await async_search(search, location, query, return_fields,
+                                      split_location, paged, client)
+
+    namespace = await _init_metadata(search, client)
+
+    filter_request, wfs_property_names = search._build_search(
+        location, query, return_fields)
+
+    if paged:
+        instances = await _search_paged(search, client, namespace, location,
+                                        filter_request, wfs_property_names)
+    elif split_location and location is not None:
+        instances = await _search_split(search, client, namespace, location,
+                                        filter_request, wfs_property_names)
+    else:
+        features = await _get_features(search, client, location,
+                                       filter_request, wfs_property_names)
+        instances = list(search._type.from_wfs(features, namespace))
+
+    if search._type._requires_xml(return_fields):
+        await asyncio.gather(*[_resolve_xml(client, i, return_fields)
+                               for i in instances])
+
+    return search._type.to_df(instances, return_fields, max_workers=1)
@@ -1,10 +1,7 @@
 # -*- coding: utf-8 -*-
 """Module containing the search classes to retrieve DOV borehole data."""
-import pandas as pd
-
 from pydov.search.abstract import AbstractSearch
 from pydov.types.grondwaterfilter import GrondwaterFilter
-from pydov.util import owsutil
 
 
 class GrondwaterFilterSearch(AbstractSearch):
@@ -22,29 +19,50 @@ class GrondwaterFilterSearch(AbstractSearch):
         super(GrondwaterFilterSearch,
               self).__init__('gw_meetnetten:meetnetten', GrondwaterFilter)
 
-    def _init_namespace(self):
-        """Initialise the WFS namespace associated with the layer."""
+    def _init_namespace(self, prefetched=None):
+        """Initialise the WFS namespace associated with the layer.
+
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
+        Returns
+        -------
+        namespace : str
+            The namespace associated with the WFS layer.
+
+        """
         if GrondwaterFilterSearch.__wfs_namespace is None:
-            GrondwaterFilterSearch.__wfs_namespace = self._get_namespace()
+            GrondwaterFilterSearch.__wfs_namespace = \
+                self._get_namespace(prefetched)
+        return GrondwaterFilterSearch.__wfs_namespace
 
-    def _init_fields(self):
+    def _init_fields(self, prefetched=None):
         """Initialise the fields and their metadata available in this search
-        class."""
+        class.
+
+        Parameters
+        ----------
+        prefetched : dict, optional
+            Metadata requested asynchronously, by key, to initialise the
+            search in asynchronous mode. See `_get_snapshot`.
+
+        """
         if self._fields is None:
             if GrondwaterFilterSearch.__wfs_schema is None:
-                GrondwaterFilterSearch.__wfs_schema = self._get_schema()
+                GrondwaterFilterSearch.__wfs_schema = \
+                    self._get_schema(prefetched)
 
             if GrondwaterFilterSearch.__md_metadata is None:
                 GrondwaterFilterSearch.__md_metadata = \
-                    self._get_remote_metadata()
+                    self._get_remote_metadata(prefetched)
 
             if GrondwaterFilterSearch.__fc_featurecatalogue is None:
-                csw_url = self._get_csw_base_url()
-                fc_uuid = owsutil.get_featurecatalogue_uuid(
-                    GrondwaterFilterSearch.__md_metadata)
-
                 GrondwaterFilterSearch.__fc_featurecatalogue = \
-                    owsutil.get_remote_featurecatalogue(csw_url, fc_uuid)
+                    self._get_remote_featurecatalogue(
+                        GrondwaterFilterSearch.__md_metadata, prefetched)
 
             fields = self._build_fields(
                 GrondwaterFilterSearch.__wfs_schema,
@@ -60,65 +78,8 @@ class GrondwaterFilterSearch(AbstractSearch):
                         'type': field['type'],
                         'wfs_injected': True
                     })
+                    self._type._clear_schema()
 
             self._fields = self._build_fields(
                 GrondwaterFilterSearch.__wfs_schema,
                 GrondwaterFilterSearch.__fc_featurecatalogue)
-
-    def search(self, location=None, query=None, return_fields=None):
-        """Search for groundwater screens (GrondwaterFilter). Provide
-        `location` and/or `query`. When `return_fields` is None,
-        all fields are returned.
-
-        Parameters
-        ----------
-        location : tuple<minx,miny,maxx,maxy>
-            The bounding box limiting the features to retrieve.
-        query : owslib.fes.OgcExpression
-            OGC filter expression to use for searching. This can contain any
-            combination of filter elements defined in owslib.fes. The query
-            should use the fields provided in `get_fields()`. Note that not
-            all fields are currently supported as a search parameter.
-        return_fields : list<str> or tuple<str> or set<str>
-            A list of fields to be returned in the output data. This should
-            be a subset of the fields provided in `get_fields()`. Note that
-            not all fields are currently supported as return fields.
-
-        Returns
-        -------
-        pandas.core.frame.DataFrame
-            DataFrame containing the output of the search query.
-
-        Raises
-        ------
-        pydov.util.errors.InvalidSearchParameterError
-            When not one of `location` or `query` is provided.
-
-        pydov.util.errors.InvalidFieldError
-            When at least one of the fields in `return_fields` is unknown.
-
-            When a field that is only accessible as return field is used as
-            a query parameter.
-
-            When a field that can only be used as a query parameter is used as
-            a return field.
-
-        pydov.util.errors.FeatureOverflowError
-            When the number of features to be returned is equal to the
-            maxFeatures limit of the WFS server.
-
-        AttributeError
-            When the argument supplied as return_fields is not a list,
-            tuple or set.
-
-        """
-        fts = self._search(location=location, query=query,
-                           return_fields=return_fields)
-
-        gw_filters = GrondwaterFilter.from_wfs(fts, self.__wfs_namespace)
-
-        df = pd.DataFrame(data=GrondwaterFilter.to_df_array(gw_filters,
-                                                            return_fields),
-                          columns=GrondwaterFilter.get_field_names(
-                              return_fields))
-        return df
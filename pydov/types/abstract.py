@@ -3,25 +3,365 @@
 
 import datetime
 import types
-from collections import OrderedDict
+import warnings
+from collections import (
+    OrderedDict,
+    namedtuple,
+)
 from distutils.util import strtobool
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    # Python 2.7
+    from collections import MutableMapping
+
 import numpy as np
+import pandas as pd
 
 from owslib.etree import etree
-from owslib.util import openURL
 
+import pydov
+from pydov.util.caching import LRUCache
+from pydov.util.concurrency import (
+    coalesce,
+    imap_ordered,
+)
+from pydov.util.dovutil import get_dov_xml
 from pydov.util.errors import InvalidFieldError
+from pydov.util.instrumentation import Timer
+
+
+def _convert_string(text):
+    return text.strip()
+
+
+def _convert_date(text):
+    # Patch for Zulu-time issue of geoserver for WFS 1.1.0
+    if text.endswith('Z'):
+        return datetime.datetime.strptime(text, '%Y-%m-%dZ').date() \
+               + datetime.timedelta(days=1)
+    else:
+        return datetime.datetime.strptime(text, '%Y-%m-%d').date()
+
+
+def _convert_boolean(text):
+    return strtobool(text) == 1
+
+
+def _convert_none(text):
+    return text
+
+
+# Functions converting the text of an XML element to the output datatype of
+# a field, by field type. Types not listed here are returned as is.
+_typeconverters = {
+    'string': _convert_string,
+    'integer': int,
+    'float': float,
+    'date': _convert_date,
+    'boolean': _convert_boolean
+}
+
+# Types of the text values of the fields, as parsed from the XML documents.
+_text_types = (str, type(u''))
+
+
+def _convert_value(value, fieldtype):
+    """Convert the text value of a field to the datatype of the field.
+
+    Parameters
+    ----------
+    value : str or object
+        The value of the field. Values other than text, like np.nan for
+        missing values, and unresolved values are returned as is.
+    fieldtype : str
+        The datatype of the field.
+
+    Returns
+    -------
+    object
+        The converted value.
+
+    """
+    if not isinstance(value, _text_types) or \
+            value == AbstractDovType._UNRESOLVED:
+        return value
+    return _typeconverters.get(fieldtype, _convert_none)(value)
+
+
+# Text values recognised as boolean, like distutils.util.strtobool.
+_truthvalues = {
+    'y': True, 'yes': True, 't': True, 'true': True, 'on': True, '1': True,
+    'n': False, 'no': False, 'f': False, 'false': False, 'off': False,
+    '0': False
+}
+
+
+def _convert_string_column(column):
+    try:
+        return pd.Series(np.fromiter(map(str.strip, column.values),
+                                     dtype=object, count=len(column)),
+                         index=column.index, dtype=object)
+    except (TypeError, ValueError):
+        # Columns with missing values, or numpy without object iterators
+        return column.str.strip()
+
+
+def _convert_integer_column(column):
+    if column.isnull().any():
+        # Columns with missing values are returned as float, like pandas does
+        return _convert_float_column(column)
+    return pd.Series(column.values.astype(np.int64), index=column.index)
+
+
+def _convert_float_column(column):
+    return pd.Series(column.values.astype(float), index=column.index)
+
+
+def _convert_date_column(column):
+    dates = pd.to_datetime(column, format='%Y-%m-%d', errors='coerce')
+
+    # Patch for Zulu-time issue of geoserver for WFS 1.1.0
+    zulu = pd.to_datetime(column, format='%Y-%m-%dZ', errors='coerce')
+    dates = dates.fillna(zulu + pd.Timedelta(days=1))
+
+    missing = dates.isnull()
+    result = pd.Series(dates.dt.date.values, index=column.index,
+                       dtype=object)
+    result[missing] = np.nan
+
+    # Dates outside the range of pandas timestamps are parsed one by one
+    invalid = missing & column.notnull()
+    if invalid.any():
+        result[invalid] = [_convert_value(t, 'date')
+                           for t in column[invalid]]
+    return result
+
+
+def _convert_boolean_column(column):
+    result = column.str.lower().map(_truthvalues)
+
+    if (column.notnull() & result.isnull()).any():
+        raise ValueError('invalid truth value')
+
+    if result.notnull().all():
+        return result.astype(bool)
+    return result
+
+
+def _convert_none_column(column):
+    return column
+
+
+# Functions converting a column of text values (pandas.Series of dtype
+# object, np.nan for missing values) to the output datatype of a field at
+# once, by field type. They raise ValueError for other values, which are
+# converted one by one instead. Types not listed here are returned as is.
+_columnconverters = {
+    'string': _convert_string_column,
+    'integer': _convert_integer_column,
+    'float': _convert_float_column,
+    'date': _convert_date_column,
+    'boolean': _convert_boolean_column
+}
+
+
+def _convert_column(column, fieldtype):
+    """Convert a column of values to the datatype of their field.
+
+    Columns of only text values and missing values are converted with a
+    single vectorized call. Other columns, containing values of the
+    datatype of the field or unresolved values, are converted value by
+    value.
+
+    Parameters
+    ----------
+    column : pandas.Series
+        The values of the field, as a series of dtype object. Values other
+        than text, like values of the datatype of the field, and unresolved
+        values are kept as is, missing values are converted like the text
+        values.
+    fieldtype : str
+        The datatype of the field.
+
+    Returns
+    -------
+    pandas.Series
+        The converted values.
+
+    """
+    if pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+        try:
+            return _columnconverters.get(
+                fieldtype, _convert_none_column)(column)
+        except (ValueError, TypeError):
+            pass
+
+    return pd.Series([_convert_value(v, fieldtype) for v in column],
+                     index=column.index, dtype=object).infer_objects()
+
+
+class _FieldValues(MutableMapping):
+    """Dictionary-like view on the values of the fields of a subtype
+    instance, which are stored in a list in the order of the fields of the
+    subtype.
+
+    Text values are converted to the datatype of their field when read.
+    Only the fields of the subtype can be set, and no fields can be
+    removed.
+
+    """
+
+    __slots__ = ('_index', '_values', '_types')
+
+    def __init__(self, index, values, types=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        index : collections.OrderedDict<str,int>
+            Mapping of the field names to the index of their value.
+        values : list
+            The values of the fields.
+        types : dict<str,str>, optional
+            Mapping of the field names to their datatype. Defaults to None,
+            which will return the values as is.
+
+        """
+        self._index = index
+        self._values = values
+        self._types = types
+
+    def __getitem__(self, key):
+        value = self._values[self._index[key]]
+        if self._types is None:
+            return value
+        return _convert_value(value, self._types.get(key))
+
+    def __setitem__(self, key, value):
+        self._values[self._index[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError('Fields of a subtype cannot be removed.')
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+_FieldLayout = namedtuple('_FieldLayout', [
+    'fields', 'own_fields', 'xml_fields', 'subfields', 'subtypes',
+    'converters', 'requires_xml'])
+_FieldLayout.__doc__ = """Layout of the data arrays of a type for a given
+set of return fields.
+
+fields : tuple<str>
+    Names of the fields (columns) in the data arrays, in order.
+own_fields : tuple<str>
+    Names of the fields of the type itself, the first columns.
+xml_fields : tuple<str>
+    Names of the fields of the type itself originating from the XML
+    document.
+subfields : tuple<str>
+    Names of the fields of the subtypes, the remaining columns.
+subtypes : tuple<tuple<AbstractDovSubType,tuple<int>>>
+    The subtypes with at least one of the return fields, each with the
+    index of each of the subfields in the values of their instances (None
+    for fields not available in the subtype).
+converters : tuple<function>
+    Function converting the text value of each of the fields to its
+    datatype.
+requires_xml : bool
+    Whether at least one of the fields originates from the XML document.
+"""
+
+
+class _FieldSchema(object):
+    """Precomputed metadata of the fields of a type or subtype.
+
+    The schema is built once for each class from its `_fields` and
+    `_subtypes`, and should be treated as immutable: when the fields of
+    the class change it is discarded and rebuilt instead (see
+    `AbstractCommon._clear_schema`).
+
+    """
+
+    __slots__ = ('fields', 'subtypes', 'own_names', 'default_names',
+                 'own_xml_names', 'subtype_names', 'index', 'types',
+                 'xml_names', 'pkey_field', 'extractors', 'layouts')
+
+    #: Maximum number of layouts kept, one for each set of return fields.
+    #: The least recently used layout is discarded when more are needed.
+    max_layouts = 64
+
+    def __init__(self, cls):
+        """Initialisation.
+
+        Parameters
+        ----------
+        cls : type
+            The type or subtype to build the schema of.
+
+        """
+        self.fields = tuple(cls._fields)
+        self.subtypes = tuple(getattr(cls, '_subtypes', ()))
+
+        self.own_names = tuple(f['name'] for f in self.fields)
+        self.default_names = tuple(f['name'] for f in self.fields
+                                   if not f.get('wfs_injected', False))
+        self.own_xml_names = tuple(f['name'] for f in self.fields
+                                   if f['source'] == 'xml')
+        self.subtype_names = tuple(
+            n for st in self.subtypes for n in st.get_field_names())
+        self.index = OrderedDict(
+            (n, i) for i, n in enumerate(self.own_names))
+
+        self.types = dict((f['name'], f.get('type', None))
+                          for f in self.fields)
+        self.xml_names = set(self.own_xml_names)
+        for st in self.subtypes:
+            st_schema = st._get_schema()
+            self.types.update(st_schema.types)
+            self.xml_names.update(st_schema.own_names)
+        self.xml_names = frozenset(self.xml_names)
+
+        self.pkey_field = None
+        pkey_sourcefield = getattr(cls, '_pkey_sourcefield', None)
+        for f in self.fields:
+            if f['source'] == 'wfs' and \
+                    f['sourcefield'] == pkey_sourcefield:
+                self.pkey_field = f['name']
+                break
+
+        self.extractors = {}
+        self.layouts = LRUCache(self.max_layouts)
 
 
 class AbstractCommon(object):
     """Class grouping methods common to AbstractDovType and
     AbstractDovSubType."""
 
-    def _parse_xml_data(self):
+    __slots__ = ()
+
+    def _parse_xml_data(self, xml=None, return_fields=None):
         """Get remote XML data for this DOV object, parse the raw XML and
         save the results in the data object.
 
+        Parameters
+        ----------
+        xml : bytes, optional
+            The raw XML data of this DOV object, if it has been requested
+            already. Defaults to None, which will request it.
+        return_fields : list<str> or tuple<str> or set<str>, optional
+            List of fields to parse, the other fields are left unresolved.
+            Defaults to None, which will parse all fields.
+
         Raises
         ------
         NotImplementedError
@@ -31,67 +371,177 @@ class AbstractCommon(object):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
-    @classmethod
-    def _parse(cls, func, xpath, namespace, returntype):
-        """Parse the result of an XML path function, stripping the namespace
-        and adding type conversion.
+    @staticmethod
+    def _get_xpath(xpath, namespace):
+        """Return the full XML path of a field, relative to the element
+        containing it.
 
         Parameters
         ----------
-        func : reference to function
-           Function to call.
         xpath : str
-            XML path of the element, used as the argument of `func`.
+            XML path of the element.
         namespace : str or None
             Namespace to be added to each item in the `xpath`. None to use
             the xpath as is.
-        returntype : str
-            Parse the text found with `func` to this output datatype. One of
-            `string`, `float`, `integer`, `date`, `boolean`.
 
         Returns
         -------
-        str or float or int or datetime.date
-            Returns the parsed value of the output from calling `func` on
-            `xpath`, converted to the type described by `returntype`.
-
-        """
-        if returntype == 'string':
-            def typeconvert(x):
-                return x.strip()
-        elif returntype == 'integer':
-            def typeconvert(x):
-                return int(x)
-        elif returntype == 'float':
-            def typeconvert(x):
-                return float(x)
-        elif returntype == 'date':
-            def typeconvert(x):
-                # Patch for Zulu-time issue of geoserver for WFS 1.1.0
-                if x.endswith('Z'):
-                    return datetime.datetime.strptime(x, '%Y-%m-%dZ').date() \
-                           + datetime.timedelta(days=1)
-                else:
-                    return datetime.datetime.strptime(x, '%Y-%m-%d').date()
-        elif returntype == 'boolean':
-            def typeconvert(x):
-                return strtobool(x) == 1
-        else:
-            def typeconvert(x):
-                return x
+        str
+            The relative XML path, including the namespace of each item.
 
+        """
         if namespace is not None:
             ns = '{%s}' % namespace
-            text = func('./' + ns + ('/' + ns).join(xpath.split('/')))
+            return './' + ns + ('/' + ns).join(xpath.split('/'))
+        else:
+            return './' + xpath.lstrip('/')
+
+    @staticmethod
+    def _compile_findtext(xpath):
+        """Compile the given XML path into a function returning the text of
+        the first matching element, like `etree.Element.findtext`.
+
+        When lxml is available the path is compiled into an XPath object
+        once, instead of being parsed again for every element.
+
+        Parameters
+        ----------
+        xpath : str
+            Relative XML path of the element, in ElementTree notation.
+
+        Returns
+        -------
+        function
+            Function accepting an etree.Element and returning the text of
+            the first element matching `xpath`, an empty string if this
+            element has no text or None if there is no matching element.
+
+        """
+        if hasattr(etree, 'ETXPath'):
+            find = etree.ETXPath(xpath)
+
+            def findtext(element):
+                result = find(element)
+                if len(result) == 0:
+                    return None
+                return result[0].text or ''
         else:
-            text = func('./' + xpath.lstrip('/'))
+            def findtext(element):
+                return element.findtext(xpath)
+
+        return findtext
+
+    @classmethod
+    def _get_extractors(cls, source=('wfs', 'xml'), namespace=None):
+        """Return the field extractors of this type for the given source and
+        namespace.
+
+        The extractors are compiled once for each class and reused for every
+        element afterwards.
+
+        Parameters
+        ----------
+        source : tuple<str>
+            The sources of the fields to include. Can either be `wfs` or
+            `xml` or `wfs, xml`.
+        namespace : str or None
+            Namespace of the elements, None if the elements are not
+            namespaced.
+
+        Returns
+        -------
+        list<tuple<str,function>>
+            List of tuples with the name of the field and a function
+            returning the text of the field from an element.
+
+        """
+        key = (tuple(source), namespace)
+
+        extractors = cls._get_schema().extractors
+        if key not in extractors:
+            extractors[key] = [(
+                f['name'],
+                cls._compile_findtext(
+                    cls._get_xpath(f['sourcefield'], namespace))
+            ) for f in cls._fields if f['source'] in source]
 
-        if text is None:
-            return np.nan
-        return typeconvert(text)
+        return extractors[key]
+
+    @classmethod
+    def _get_schema(cls):
+        """Return the precomputed metadata of the fields of this type.
+
+        The schema is built once for each class and reused afterwards,
+        until it is cleared with `_clear_schema`.
+
+        Returns
+        -------
+        _FieldSchema
+            The schema of the fields of this type.
+
+        """
+        schema = cls.__dict__.get('_schema')
+        if schema is None:
+            schema = _FieldSchema(cls)
+            cls._schema = schema
+        return schema
+
+    @classmethod
+    def _clear_schema(cls):
+        """Remove the precomputed metadata and compiled field extractors of
+        this type, to be called when the fields of this type have been
+        changed."""
+        cls._schema = None
+
+    @classmethod
+    def _parse_element(cls, element, data, source=('wfs', 'xml'),
+                       namespace=None, fields=None):
+        """Parse the text of the fields of this type from the given XML
+        element into the data dictionary.
+
+        The values are saved as text, np.nan for missing values, and are
+        only converted to the datatype of the field when the output data is
+        built.
+
+        Parameters
+        ----------
+        element : etree.Element
+            XML element containing the fields.
+        data : dict
+            Dictionary to save the parsed values in, by field name.
+        source : tuple<str>
+            The sources of the fields to parse. Can either be `wfs` or `xml`
+            or `wfs, xml`.
+        namespace : str or None
+            Namespace of the elements, None if the elements are not
+            namespaced.
+        fields : list<str> or tuple<str> or set<str>, optional
+            Names of the fields to parse, the XML paths of other fields are
+            not evaluated. Defaults to None, which will parse all fields.
+
+        """
+        for name, findtext in cls._get_extractors(source, namespace):
+            if fields is not None and name not in fields:
+                continue
+            text = findtext(element)
+            if text is None:
+                data[name] = np.nan
+            else:
+                data[name] = text
 
 
 class AbstractDovSubType(AbstractCommon):
+    """Abstract DOV subtype grouping fields and methods common to all DOV
+    object subtypes. Not to be instantiated or used directly.
+
+    Subtypes can have many instances for a single DOV object, so their
+    instances are kept compact: they have no instance dictionary and the
+    values of their fields are stored in a list, accessible by field name
+    through `data`. Subclasses should define an empty `__slots__` as well.
+
+    """
+
+    __slots__ = ('_values',)
 
     _name = None
     _rootpath = None
@@ -99,21 +549,70 @@ class AbstractDovSubType(AbstractCommon):
     _UNRESOLVED = "{UNRESOLVED}"
     _fields = []
 
-    def __init__(self, name):
+    def __init__(self, name=None):
         """Initialisation.
 
         Parameters
         ----------
-        name : str
-            The name associated with this subtype.
+        name : str, optional
+            Deprecated and ignored, the name associated with this subtype is
+            the `_name` of its class.
 
         """
-        self._name = name
+        if name is not None:
+            warnings.warn(
+                'The name argument of %s is deprecated and ignored.' %
+                type(self).__name__, DeprecationWarning, stacklevel=2)
+        self._values = [AbstractDovSubType._UNRESOLVED] * len(self._fields)
 
-        self.data = dict(
-            zip(self.get_field_names(),
-                [AbstractDovSubType._UNRESOLVED] * len(self.get_field_names()))
-        )
+    @property
+    def data(self):
+        """Return the values of the fields of this instance.
+
+        Returns
+        -------
+        MutableMapping<str,object>
+            Dictionary-like view mapping the field names to their value,
+            converted to the datatype of the field.
+
+        """
+        schema = self._get_schema()
+        return _FieldValues(schema.index, self._values, schema.types)
+
+    @data.setter
+    def data(self, values):
+        """Replace the values of the fields of this instance.
+
+        Parameters
+        ----------
+        values : dict<str,object>
+            Dictionary mapping the field names to their value. Fields that
+            are not included are unresolved.
+
+        Raises
+        ------
+        KeyError
+            When one of the field names is not a field of this subtype.
+
+        """
+        index = self._get_field_index()
+        new_values = [AbstractDovSubType._UNRESOLVED] * len(index)
+        for name, value in values.items():
+            new_values[index[name]] = value
+        self._values = new_values
+
+    @classmethod
+    def _get_field_index(cls):
+        """Return the index of each of the fields of this subtype in the
+        list of values of its instances.
+
+        Returns
+        -------
+        collections.OrderedDict<str,int>
+            Mapping of the field names to their index.
+
+        """
+        return cls._get_schema().index
 
     @classmethod
     def from_xml(cls, xml_data):
@@ -121,9 +620,9 @@ class AbstractDovSubType(AbstractCommon):
 
         Parameters
         ----------
-        xml_data : bytes
+        xml_data : bytes or etree.Element
             Raw XML data of the DOV object that contains information about
-            this subtype.
+            this subtype, or its already parsed XML tree.
 
         Yields
         ------
@@ -131,7 +630,11 @@ class AbstractDovSubType(AbstractCommon):
             the XML document.
 
         """
-        tree = etree.fromstring(xml_data)
+        if isinstance(xml_data, bytes):
+            tree = etree.fromstring(xml_data)
+        else:
+            tree = xml_data
+
         for element in tree.findall(cls._rootpath):
             yield cls.from_xml_element(element)
 
@@ -164,7 +667,7 @@ class AbstractDovSubType(AbstractCommon):
             the names of the columns in the output dataframe for this type.
 
         """
-        return [f['name'] for f in cls._fields]
+        return list(cls._get_schema().own_names)
 
     @classmethod
     def get_fields(cls):
@@ -199,9 +702,7 @@ class AbstractDovSubType(AbstractCommon):
                 Whether the field is mandatory (True) or can be null (False).
 
         """
-        return OrderedDict(
-            zip([f['name'] for f in cls._fields],
-                [f for f in cls._fields]))
+        return OrderedDict((f['name'], f) for f in cls._get_schema().fields)
 
     @classmethod
     def get_name(cls):
@@ -232,11 +733,20 @@ class AbstractDovType(AbstractCommon):
     """Abstract DOV type grouping fields and methods common to all DOV
     object types. Not to be instantiated or used directly."""
 
+    __slots__ = ('typename', 'pkey', '_data', '_converted', 'subdata',
+                 '_state', '_xml')
+
+    _pkey_sourcefield = None
     _subtypes = []
 
     _UNRESOLVED = "{UNRESOLVED}"
     _fields = []
 
+    # Flags of the resolution state of an instance.
+    _WFS_LOADED = 1
+    _XML_RESOLVED = 2
+    _SUBTYPES_RESOLVED = 4
+
     def __init__(self, typename, pkey):
         """Initialisation.
 
@@ -252,17 +762,100 @@ class AbstractDovType(AbstractCommon):
         self.typename = typename
         self.pkey = pkey
 
-        self.data = dict(
-            zip(self.get_field_names(include_subtypes=False),
-                [AbstractDovType._UNRESOLVED] * len(self.get_field_names()))
-        )
+        # Only resolved fields are stored, see `data` for all of them.
+        self._data = {}
+        self._converted = None
 
         self.subdata = dict(
             zip([st.get_name() for st in self._subtypes],
                 [] * len(self._subtypes))
         )
 
-        self.data['pkey_%s' % self.typename] = self.pkey
+        self._data['pkey_%s' % self.typename] = self.pkey
+
+        self._state = 0
+        self._xml = None
+
+    @property
+    def data(self):
+        """Return the values of the fields of this instance.
+
+        The values are converted to the datatype of their field on first
+        access, and updated when more fields are resolved afterwards.
+        Values set in the dictionary are used in the output of this
+        instance as well.
+
+        Returns
+        -------
+        dict<str,object>
+            Dictionary mapping the field names to their value, or
+            `_UNRESOLVED` for fields that have not been resolved yet.
+
+        """
+        if self._converted is None:
+            schema = self._get_schema()
+            self._converted = dict(
+                (name, _convert_value(self._get_value(name),
+                                      schema.types.get(name)))
+                for name in schema.default_names)
+            self._converted.update(
+                (name, _convert_value(value, schema.types.get(name)))
+                for name, value in self._data.items()
+                if name not in self._converted)
+        return self._converted
+
+    @data.setter
+    def data(self, values):
+        """Replace the values of the fields of this instance.
+
+        Parameters
+        ----------
+        values : dict<str,object>
+            Dictionary mapping the field names to their value. Fields that
+            are not included are unresolved.
+
+        """
+        self._data = dict(values)
+        self._converted = None
+
+    def _get_value(self, field):
+        """Return the value of the given field of this instance.
+
+        Once `data` has been accessed, the values are read from it, so
+        values set there are not lost.
+
+        Parameters
+        ----------
+        field : str
+            Name of the field.
+
+        Returns
+        -------
+        object
+            The text value of the field, or its converted value once `data`
+            has been accessed, np.nan for missing values or `_UNRESOLVED` if
+            the field has not been resolved yet.
+
+        """
+        if self._converted is not None:
+            return self._converted.get(field, AbstractDovType._UNRESOLVED)
+        return self._data.get(field, AbstractDovType._UNRESOLVED)
+
+    def _update_data(self, values):
+        """Update the text values of the fields of this instance.
+
+        Parameters
+        ----------
+        values : dict<str,object>
+            The text values by field name, np.nan for missing values.
+
+        """
+        self._data.update(values)
+        if self._converted is not None:
+            types = self._get_schema().types
+            self._converted.update(
+                (name, _convert_value(value, types.get(name)))
+                for name, value in values.items())
 
     @classmethod
     def from_wfs_element(cls, feature, namespace):
@@ -362,25 +955,22 @@ class AbstractDovType(AbstractCommon):
             If at least one of the fields listed in `return_fields` is unknown.
 
         """
+        schema = cls._get_schema()
         if return_fields is None:
             if include_wfs_injected:
-                fields = [f['name'] for f in cls._fields]
+                fields = list(schema.own_names)
             else:
-                fields = [f['name'] for f in cls._fields if not f.get(
-                    'wfs_injected', False)]
+                fields = list(schema.default_names)
             if include_subtypes:
-                for st in cls._subtypes:
-                    fields.extend(st.get_field_names())
+                fields.extend(schema.subtype_names)
         elif type(return_fields) not in (list, tuple, set):
             raise AttributeError(
                 'return_fields should be a list, tuple or set')
         else:
-            fields = [f['name'] for f in cls._fields if f['name'] in
-                      return_fields]
+            fields = [f for f in schema.own_names if f in return_fields]
             if include_subtypes:
-                for st in cls._subtypes:
-                    fields.extend([f for f in st.get_field_names() if f in
-                                   return_fields])
+                fields.extend([f for f in schema.subtype_names
+                               if f in return_fields])
             for rf in return_fields:
                 if rf not in fields:
                     raise InvalidFieldError("Unknown return field: '%s'" % rf)
@@ -431,9 +1021,8 @@ class AbstractDovType(AbstractCommon):
                 Whether the field is mandatory (True) or can be null (False).
 
         """
-        fields = OrderedDict(
-            zip([f['name'] for f in cls._fields if f['source'] in source],
-                [f for f in cls._fields if f['source'] in source]))
+        fields = OrderedDict((f['name'], f) for f in cls._get_schema().fields
+                             if f['source'] in source)
 
         if include_subtypes and 'xml' in source:
             for st in cls._subtypes:
@@ -442,10 +1031,16 @@ class AbstractDovType(AbstractCommon):
         return fields
 
     @classmethod
-    def to_df_array(cls, iterable, return_fields=None):
+    def to_df_array(cls, iterable, return_fields=None, max_workers=None,
+                    convert=True):
         """Yield one or more dataframe arrays for each instance in the given
         iterable.
 
+        When at least one of the requested fields has to be resolved from
+        the XML document of the instances, the instances are resolved
+        concurrently using a bounded pool of `max_workers` threads. The
+        order of the output is the same as the order of the input.
+
         Parameters
         ----------
         iterable : list<DovType> or tuple<DovType> or iterable<DovType>
@@ -454,6 +1049,13 @@ class AbstractDovType(AbstractCommon):
             List of fields to include in the data array. The order is
             ignored, the default order of the fields of the datatype is used
             instead. Defaults to None, which will include all fields.
+        max_workers : int, optional
+            Maximum number of threads used to resolve the XML data of the
+            instances. Defaults to None, which will use the value of
+            `pydov.max_workers`.
+        convert : bool, optional
+            Whether to convert the values to the datatype of their field
+            (True) or return them as text (False). Defaults to True.
 
         Yields
         ------
@@ -463,8 +1065,16 @@ class AbstractDovType(AbstractCommon):
             search operation.
 
         """
-        for item in iterable:
-            result = item.get_df_array(return_fields)
+        if max_workers is None:
+            max_workers = pydov.max_workers
+
+        if not cls._requires_xml(return_fields):
+            max_workers = 1
+
+        def get_df_array(item):
+            return item.get_df_array(return_fields, convert)
+
+        for result in imap_ordered(get_df_array, iterable, max_workers):
             if len(result) > 0:
                 if isinstance(result[0], list):
                     for r in result:
@@ -472,35 +1082,601 @@ class AbstractDovType(AbstractCommon):
                 else:
                     yield result
 
+    @classmethod
+    def to_df(cls, iterable, return_fields=None, max_workers=None):
+        """Build a dataframe with the data of the instances in the given
+        iterable.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the dataframe. The order is
+            ignored, the default order of the fields of the datatype is used
+            instead. Defaults to None, which will include all fields.
+        max_workers : int, optional
+            Maximum number of threads used to resolve the XML data of the
+            instances. Defaults to None, which will use the value of
+            `pydov.max_workers`.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame containing the data of the instances, with a column
+            for each of the fields.
+
+        """
+        return cls._build_df(
+            cls.to_df_array(iterable, return_fields, max_workers,
+                            convert=False),
+            return_fields)
+
+    @classmethod
+    def to_df_normalized(cls, iterable, return_fields=None,
+                         max_workers=None):
+        """Build a normalized pair of dataframes with the data of the
+        instances in the given iterable: one with a row per instance and
+        one with a row per subtype record, so the fields of the instances
+        are not repeated for each of their subtype records.
+
+        Use `denormalize` with the same `return_fields` to join both
+        dataframes into the dataframe returned by `to_df`.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the dataframes. The order is
+            ignored, the default order of the fields of the datatype is used
+            instead. Defaults to None, which will include all fields.
+        max_workers : int, optional
+            Maximum number of threads used to resolve the XML data of the
+            instances. Defaults to None, which will use the value of
+            `pydov.max_workers`.
+
+        Returns
+        -------
+        df : pandas.core.frame.DataFrame
+            DataFrame containing a row for each of the instances, with a
+            column for each of the fields of this type. The permanent key
+            is always included.
+        df_sub : pandas.core.frame.DataFrame
+            DataFrame containing a row for each of the subtype records of
+            the instances, with a column for the permanent key of the
+            instance and a column for each of the fields of the subtypes.
+
+        """
+        if max_workers is None:
+            max_workers = pydov.max_workers
+
+        if not cls._requires_xml(return_fields):
+            max_workers = 1
+
+        pkey_field = cls._get_pkey_field()
+        layout = cls._get_layout(return_fields)
+
+        parent_fields = list(layout.own_fields)
+        if pkey_field not in parent_fields:
+            parent_fields.insert(0, pkey_field)
+        child_fields = [pkey_field] + list(layout.subfields)
+
+        def get_df_arrays(item):
+            return item._get_df_arrays_normalized(
+                parent_fields, child_fields, return_fields)
+
+        parents = []
+        children = []
+        for parent, subrecords in imap_ordered(get_df_arrays, iterable,
+                                               max_workers):
+            parents.append(parent)
+            children.extend(subrecords)
+
+        return (cls._build_df(parents, fields=parent_fields),
+                cls._build_df(children, fields=child_fields))
+
+    @classmethod
+    def denormalize(cls, df, df_sub, return_fields=None):
+        """Join the normalized dataframes returned by `to_df_normalized`
+        into a single dataframe with a row per subtype record.
+
+        Like in the output of `to_df`, instances without subtype records
+        are not included when at least one field of a subtype is.
+
+        Parameters
+        ----------
+        df : pandas.core.frame.DataFrame
+            DataFrame containing a row for each of the instances.
+        df_sub : pandas.core.frame.DataFrame
+            DataFrame containing a row for each of the subtype records.
+        return_fields : list<str> or tuple<str> or set<str>, optional
+            The return fields the dataframes were built with. When given
+            without the permanent key, the permanent key is dropped after
+            joining, like in the output of `to_df`. Defaults to None, which
+            will keep the permanent key.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame containing the columns of `df` followed by the
+            subtype columns of `df_sub`.
+
+        """
+        pkey_field = cls._get_pkey_field()
+        if len(df_sub.columns) >= 2:
+            df = df.merge(df_sub, how='inner', on=pkey_field, sort=False)
+
+        if return_fields is not None and pkey_field not in return_fields:
+            df = df.drop(columns=pkey_field)
+        return df
+
+    @classmethod
+    def _get_pkey_field(cls):
+        """Return the name of the field containing the permanent key.
+
+        Returns
+        -------
+        str
+            Name of the field with the permanent key of the instances.
+
+        """
+        return cls._get_schema().pkey_field
+
+    @classmethod
+    def _build_df(cls, df_array, return_fields=None, fields=None):
+        """Build a dataframe from the given unconverted dataframe arrays.
+
+        The values are gathered per column and each column is converted to
+        the datatype of its field at once.
+
+        Parameters
+        ----------
+        df_array : iterable<list>
+            Iterable of the text values of each row of the output data, as
+            returned by `to_df_array` with `convert` set to False.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields included in the data arrays. Defaults to None,
+            which includes all fields.
+        fields : list<str>, optional
+            Names of the fields in the data arrays, in order. Defaults to
+            None, which will use the fields included in `return_fields`.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame containing the data, with a column for each of the
+            fields.
+
+        """
+        if fields is None:
+            fields = cls.get_field_names(return_fields)
+        rows = list(df_array)
+
+        with Timer('dataframe', features=len(rows)):
+            if len(rows) == 0:
+                return pd.DataFrame(data=rows, columns=fields)
+
+            types = cls._get_field_types()
+            columns = OrderedDict()
+            for field, values in zip(fields, zip(*rows)):
+                columns[field] = _convert_column(
+                    pd.Series(values, dtype=object), types.get(field))
+
+            return pd.DataFrame(data=columns, columns=fields)
+
+    @classmethod
+    def _get_field_types(cls):
+        """Return the datatype of each of the fields of this type.
+
+        Returns
+        -------
+        dict<str,str>
+            Dictionary mapping the field name to its datatype, including the
+            fields of the subtypes. It is shared by all callers and should
+            not be modified.
+
+        """
+        return cls._get_schema().types
+
+    @classmethod
+    def _get_layout(cls, return_fields=None):
+        """Return the layout of the data arrays of this type for the given
+        return fields.
+
+        The layout is computed once for each set of return fields and
+        reused afterwards, so the metadata of the fields is not rebuilt for
+        every instance.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str>
+            List of fields to include in the data array. Defaults to None,
+            which will include all fields.
+
+        Returns
+        -------
+        _FieldLayout
+            The layout of the data arrays.
+
+        Raises
+        ------
+        AttributeError
+            If the type of `return_fields` is not one of None, list, tuple or
+            set.
+        pydov.util.errors.InvalidFieldError
+            If at least one of the fields listed in `return_fields` is unknown.
+
+        """
+        schema = cls._get_schema()
+        if return_fields is None:
+            key = None
+        elif type(return_fields) in (list, tuple, set):
+            key = frozenset(return_fields)
+        else:
+            raise AttributeError(
+                'return_fields should be a list, tuple or set')
+
+        layout = schema.layouts.get(key)
+        if layout is not None:
+            return layout
+
+        fields = tuple(cls.get_field_names(return_fields))
+        own_fields = tuple(f for f in fields if f in schema.index)
+        subfields = fields[len(own_fields):]
+
+        subtypes = []
+        for st in schema.subtypes:
+            index = st._get_field_index()
+            if return_fields is None or any(f in index for f in subfields):
+                subtypes.append((st, tuple(index.get(f) for f in subfields)))
+
+        layout = _FieldLayout(
+            fields=fields,
+            own_fields=own_fields,
+            xml_fields=tuple(f for f in own_fields
+                             if f in schema.own_xml_names),
+            subfields=subfields,
+            subtypes=tuple(subtypes),
+            converters=tuple(
+                _typeconverters.get(schema.types.get(f), _convert_none)
+                for f in fields),
+            requires_xml=any(f in schema.xml_names for f in fields))
+
+        schema.layouts.set(key, layout)
+        return layout
+
+    @classmethod
+    def _requires_xml(cls, return_fields=None):
+        """Check whether the given return fields require the XML document of
+        the instances to be resolved.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array. Defaults to None,
+            which will include all fields.
+
+        Returns
+        -------
+        bool
+            True if at least one of the fields originates from the XML
+            document of the DOV object, False otherwise.
+
+        """
+        return cls._get_layout(return_fields).requires_xml
+
     def _get_xml_data(self):
         """Return the raw XML data for this DOV object.
 
+        The data is requested from the cache configured in `pydov.cache`
+        if any, or from the remote DOV service otherwise. Concurrent
+        requests of the same data from multiple threads share a single
+        request.
+
         Returns
         -------
         xml : bytes
             The raw XML data of this DOV object as bytes.
 
         """
-        return openURL(self.pkey + '.xml').read()
+        url = self.pkey + '.xml'
+
+        def get_xml():
+            if pydov.cache is not None:
+                return pydov.cache.get(url)
+            return get_dov_xml(url)
+
+        return coalesce(url, get_xml)
+
+    def _parse_xml_data(self, xml=None, return_fields=None):
+        """Get remote XML data for this DOV object, parse the raw XML and
+        save the results in the data object.
 
-    def _parse_subtypes(self, xml):
-        """Parse the subtypes with the given XML data.
+        The XML document is parsed once, its tree is used for both the
+        fields of this type and those of its subtypes. Only the fields in
+        `return_fields` are evaluated, and subtypes without any field in
+        `return_fields` are skipped. Fields and subtypes parsed before are
+        not parsed again, and the XML document is neither requested nor
+        parsed when nothing is left to parse.
 
         Parameters
         ----------
-        xml : bytes
-            The raw XML data of the DOV object as bytes.
+        xml : bytes, optional
+            The raw XML data of this DOV object, if it has been requested
+            already. Defaults to None, which will request it.
+        return_fields : list<str> or tuple<str> or set<str>, optional
+            List of fields to parse, the other fields are left unresolved.
+            Defaults to None, which will parse all fields.
+
+        """
+        layout = self._get_layout(return_fields)
+
+        fields = []
+        if not self._state & AbstractDovType._XML_RESOLVED:
+            fields = [f for f in layout.xml_fields if f not in self._data]
+
+        subtypes = []
+        if not self._state & AbstractDovType._SUBTYPES_RESOLVED:
+            subtypes = [st for st, _ in layout.subtypes
+                        if st.get_name() not in self.subdata]
+
+        if len(fields) > 0 or len(subtypes) > 0:
+            if xml is None:
+                xml = self._get_xml_data()
+            tree = etree.fromstring(xml)
+
+            if len(fields) > 0:
+                values = {}
+                self._parse_element(tree, values, source=('xml',),
+                                    fields=fields)
+                self._update_data(values)
+
+            for subtype in subtypes:
+                self.subdata[subtype.get_name()] = list(
+                    subtype.from_xml(tree))
+
+        if return_fields is None or all(
+                f in self._data for f in self._get_schema().own_xml_names):
+            self._state |= AbstractDovType._XML_RESOLVED
+
+        if all(st.get_name() in self.subdata for st in self._subtypes):
+            self._state |= AbstractDovType._SUBTYPES_RESOLVED
+
+    def _resolve_xml_data(self, return_fields=None):
+        """Request and parse the XML data of this DOV object, emitting the
+        time spent as 'xml_fetch' and 'xml_parse' events.
+
+        Concurrent resolutions of the same DOV object and return fields
+        from multiple threads, by this or another instance, share a single
+        request and parse: the other instances copy the parsed data.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str>, optional
+            List of fields to parse, the other fields are left unresolved.
+            Defaults to None, which will parse all fields.
+
+        """
+        def resolve():
+            xml = self._xml
+            if xml is None:
+                with Timer('xml_fetch') as timer:
+                    xml = self._get_xml_data()
+                    timer.bytes = len(xml)
+
+            with Timer('xml_parse', bytes=len(xml)):
+                self._parse_xml_data(xml, return_fields)
+            self._keep_xml(xml)
+            return self
+
+        resolved = coalesce(self._get_resolution_key(return_fields), resolve)
+        if resolved is not self:
+            self._copy_xml_data(resolved)
+
+    def _keep_xml(self, xml):
+        """Keep the raw XML data of this DOV object as long as some of its
+        fields or subtypes are not resolved, so resolving them later does
+        not request it again.
+
+        Parameters
+        ----------
+        xml : bytes or None
+            The raw XML data of this DOV object.
 
         """
-        for subtype in self._subtypes:
-            st_name = subtype.get_name()
-            if st_name not in self.subdata:
-                self.subdata[st_name] = []
+        resolved = AbstractDovType._XML_RESOLVED | \
+            AbstractDovType._SUBTYPES_RESOLVED
+        if self._state & resolved == resolved:
+            self._xml = None
+        else:
+            self._xml = xml
+
+    def _get_resolution_key(self, return_fields=None):
+        """Return the key identifying the resolution of the given fields of
+        this DOV object from its XML data, shared by all instances with the
+        same type and permanent key.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str>, optional
+            List of fields to resolve. Defaults to None, which will resolve
+            all fields.
+
+        Returns
+        -------
+        tuple
+            The key of the resolution.
+
+        """
+        if return_fields is not None:
+            return_fields = frozenset(return_fields)
+        return (type(self), self.pkey, return_fields)
+
+    def _copy_xml_data(self, other):
+        """Copy the data resolved from the XML document of another instance
+        of the same DOV object.
 
-            for subitem in subtype.from_xml(xml):
-                self.subdata[st_name].append(subitem)
+        Only fields and subtypes that have not been resolved before are
+        copied, the subtype records are shared with the other instance.
+
+        Parameters
+        ----------
+        other : AbstractDovType
+            Instance with the same type and permanent key.
+
+        """
+        self._update_data(dict(
+            (field, other._data[field])
+            for field in self._get_schema().own_xml_names
+            if field in other._data and field not in self._data))
+
+        for st_name, records in list(other.subdata.items()):
+            self.subdata.setdefault(st_name, records)
+
+        self._state |= other._state & (AbstractDovType._XML_RESOLVED |
+                                       AbstractDovType._SUBTYPES_RESOLVED)
+        self._keep_xml(self._xml or other._xml)
+
+    def _get_subtypes(self, return_fields=None):
+        """Return the subtypes of which at least one field is included in the
+        given return fields.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array. Defaults to None,
+            which will include all fields.
 
-    def get_df_array(self, return_fields=None):
+        Returns
+        -------
+        list<AbstractDovSubType>
+            The subtypes with at least one requested field.
+
+        """
+        return [st for st, _ in self._get_layout(return_fields).subtypes]
+
+    def _parse_wfs_data(self, feature, namespace):
+        """Parse the fields of this type from the given WFS feature element.
+
+        The fields are only parsed once, later calls leave the data of an
+        instance that has been loaded from the WFS untouched.
+
+        Parameters
+        ----------
+        feature : etree.Element
+            XML element representing a single record of the WFS layer.
+        namespace : str
+            Namespace associated with this WFS featuretype.
+
+        """
+        if self._state & AbstractDovType._WFS_LOADED:
+            return
+
+        values = {}
+        self._parse_element(feature, values, source=('wfs',),
+                            namespace=namespace)
+        self._update_data(values)
+        self._state |= AbstractDovType._WFS_LOADED
+
+    def _is_xml_resolved(self, return_fields=None):
+        """Check whether the XML data of this DOV object has been parsed.
+
+        The fields are only checked as long as the resolution state of this
+        instance does not mark all XML fields or all subtypes as resolved.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to check. Defaults to None, which will check all
+            fields.
+
+        Returns
+        -------
+        bool
+            True if the given fields of this type and its subtypes have been
+            resolved from the XML document, False otherwise.
+
+        """
+        layout = self._get_layout(return_fields)
+        if not self._state & AbstractDovType._XML_RESOLVED:
+            for field in layout.xml_fields:
+                if field not in self._data:
+                    return False
+        if not self._state & AbstractDovType._SUBTYPES_RESOLVED:
+            for subtype, _ in layout.subtypes:
+                if subtype.get_name() not in self.subdata:
+                    return False
+        return True
+
+    def _get_df_arrays_normalized(self, fields, subfields,
+                                  return_fields=None):
+        """Return the unconverted data arrays of the instance of this type
+        and of its subtype records separately.
+
+        Parameters
+        ----------
+        fields : list<str>
+            Names of the fields of this type to include in the data array of
+            the instance.
+        subfields : list<str>
+            Names of the fields to include in the data arrays of the subtype
+            records, the first being the permanent key of this type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to resolve. Defaults to None, which will resolve
+            all fields.
+
+        Returns
+        -------
+        record : list
+            List of the values of the fields of this instance.
+        subrecords : list<list>
+            List of the values of the fields of each subtype record.
+
+        """
+        if not self._is_xml_resolved(return_fields):
+            self._resolve_xml_data(return_fields)
+
+        record = [self._get_value(field) for field in fields]
+
+        subrecords = []
+        if len(subfields) > 1:
+            pkey = self._get_value(subfields[0])
+            subrecords = [[pkey] + r for r in self._get_subrecords(
+                subfields[1:], self._get_subtypes(return_fields))]
+
+        return record, subrecords
+
+    def _get_subrecords(self, subfields, subtypes):
+        """Return the values of the given fields of the records of the given
+        subtypes.
+
+        Parameters
+        ----------
+        subfields : list<str>
+            Names of the fields of the subtypes to include.
+        subtypes : list<AbstractDovSubType>
+            The subtypes to include the records of, which should have been
+            resolved.
+
+        Returns
+        -------
+        list<list>
+            List of the values of the fields of each subtype record. Fields
+            not available in a subtype have the value np.nan.
+
+        """
+        subrecords = []
+        for subtype in subtypes:
+            index = subtype._get_field_index()
+            positions = [index.get(f) for f in subfields]
+            for subitem in self.subdata[subtype.get_name()]:
+                values = subitem._values
+                subrecords.append([np.nan if i is None else values[i]
+                                   for i in positions])
+        return subrecords
+
+    def get_df_array(self, return_fields=None, convert=True):
         """Return the data array of the instance of this type for inclusion
         in the resulting output dataframe of a search operation.
 
@@ -510,6 +1686,9 @@ class AbstractDovType(AbstractCommon):
             List of fields to include in the data array. The order is
             ignored, the default order of the fields of the datatype is used
             instead. Defaults to None, which will include all fields.
+        convert : bool, optional
+            Whether to convert the values to the datatype of their field
+            (True) or return them as text (False). Defaults to True.
 
         Returns
         -------
@@ -519,34 +1698,29 @@ class AbstractDovType(AbstractCommon):
             search operation.
 
         """
-        fields = self.get_field_names(return_fields)
-        ownfields = self.get_field_names(include_subtypes=False,
-                                         return_fields=return_fields)
-        subfields = [f for f in fields if f not in ownfields]
+        layout = self._get_layout(return_fields)
 
-        if len(subfields) > 0:
-            self._parse_xml_data()
+        if not self._is_xml_resolved(return_fields):
+            self._resolve_xml_data(return_fields)
 
-        datadicts = []
-        datarecords = []
+        record = [self._get_value(f) for f in layout.own_fields]
 
-        if len(self.subdata) == 0 or len(subfields) == 0:
-            datadicts.append(self.data)
+        if len(layout.subtypes) == 0:
+            datarecords = [record]
         else:
-            for subtype in self.subdata:
-                for subdata in self.subdata[subtype]:
-                    datadict = {}
-                    datadict.update(self.data)
-                    datadict.update(subdata.data)
-                    datadicts.append(datadict)
-
-        for d in datadicts:
-            datarecords.append([d[field] for field in fields])
-
-        for d in datarecords:
-            if self._UNRESOLVED in d:
-                self._parse_xml_data()
-                datarecords = self.get_df_array(return_fields)
-                break
+            datarecords = []
+            for subtype, positions in layout.subtypes:
+                for subitem in self.subdata[subtype.get_name()]:
+                    values = subitem._values
+                    datarecords.append(record + [
+                        np.nan if i is None else values[i]
+                        for i in positions])
+
+        if convert:
+            converters = layout.converters
+            datarecords = [
+                [c(v) if isinstance(v, _text_types) else v
+                 for v, c in zip(d, converters)]
+                for d in datarecords]
 
         return datarecords
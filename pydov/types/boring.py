@@ -2,8 +2,6 @@
 """Module containing the DOV data type for boreholes (Boring), including
 subtypes."""
 
-from owslib.etree import etree
-
 from pydov.types.abstract import (
     AbstractDovType,
     AbstractDovSubType,
@@ -12,6 +10,8 @@ from pydov.types.abstract import (
 
 class BoorMethode(AbstractDovSubType):
 
+    __slots__ = ()
+
     _name = 'boormethode'
     _rootpath = './/boring/details/boormethode'
 
@@ -42,7 +42,7 @@ class BoorMethode(AbstractDovSubType):
 
     def __init__(self):
         """Initialisation."""
-        super(BoorMethode, self).__init__('boormethode')
+        super(BoorMethode, self).__init__()
 
     @classmethod
     def from_xml_element(cls, element):
@@ -56,13 +56,7 @@ class BoorMethode(AbstractDovSubType):
         """
         boormethode = BoorMethode()
 
-        for field in cls.get_fields().values():
-            boormethode.data[field['name']] = boormethode._parse(
-                func=element.findtext,
-                xpath=field['sourcefield'],
-                namespace=None,
-                returntype=field.get('type', None)
-            )
+        cls._parse_element(element, boormethode.data)
 
         return boormethode
 
@@ -70,6 +64,9 @@ class BoorMethode(AbstractDovSubType):
 class Boring(AbstractDovType):
     """Class representing the DOV data type for boreholes."""
 
+    __slots__ = ()
+
+    _pkey_sourcefield = 'fiche'
     _subtypes = [BoorMethode]
 
     _fields = [{
@@ -171,32 +168,9 @@ class Boring(AbstractDovType):
             element.
 
         """
-        b = Boring(feature.findtext('./{%s}fiche' % namespace))
+        b = Boring(feature.findtext(
+            './{%s}%s' % (namespace, cls._pkey_sourcefield)))
 
-        for field in cls.get_fields(source=('wfs',)).values():
-            b.data[field['name']] = cls._parse(
-                func=feature.findtext,
-                xpath=field['sourcefield'],
-                namespace=namespace,
-                returntype=field.get('type', None)
-            )
+        b._parse_wfs_data(feature, namespace)
 
         return b
-
-    def _parse_xml_data(self):
-        """Get remote XML data for this DOV object, parse the raw XML and
-        save the results in the data object.
-        """
-        xml = self._get_xml_data()
-        tree = etree.fromstring(xml)
-
-        for field in self.get_fields(source=('xml',),
-                                     include_subtypes=False).values():
-            self.data[field['name']] = self._parse(
-                func=tree.findtext,
-                xpath=field['sourcefield'],
-                namespace=None,
-                returntype=field.get('type', None)
-            )
-
-        self._parse_subtypes(xml)
@@ -2,8 +2,6 @@
 """Module containing the DOV data type for screens (Filter), including
 subtypes."""
 
-from owslib.etree import etree
-
 from pydov.types.abstract import (
     AbstractDovType,
     AbstractDovSubType,
@@ -12,6 +10,8 @@ from pydov.types.abstract import (
 
 class Peilmeting(AbstractDovSubType):
 
+    __slots__ = ()
+
     _name = 'peilmeting'
     _rootpath = './/filtermeting/peilmeting'
 
@@ -55,7 +55,7 @@ class Peilmeting(AbstractDovSubType):
 
     def __init__(self):
         """Initialisation."""
-        super(Peilmeting, self).__init__('peilmeting')
+        super(Peilmeting, self).__init__()
 
     @classmethod
     def from_xml_element(cls, element):
@@ -69,13 +69,7 @@ class Peilmeting(AbstractDovSubType):
         """
         peilmeting = Peilmeting()
 
-        for field in cls.get_fields().values():
-            peilmeting.data[field['name']] = peilmeting._parse(
-                func=element.findtext,
-                xpath=field['sourcefield'],
-                namespace=None,
-                returntype=field.get('type', None)
-            )
+        cls._parse_element(element, peilmeting.data)
 
         return peilmeting
 
@@ -83,6 +77,9 @@ class Peilmeting(AbstractDovSubType):
 class GrondwaterFilter(AbstractDovType):
     """Class representing the DOV data type for Groundwater screens."""
 
+    __slots__ = ()
+
+    _pkey_sourcefield = 'filterfiche'
     _subtypes = [Peilmeting]
 
     _fields = [{
@@ -204,33 +201,9 @@ class GrondwaterFilter(AbstractDovType):
             element.
 
         """
-        gwfilter = GrondwaterFilter(
-            feature.findtext('./{%s}filterfiche' % namespace))
+        gwfilter = GrondwaterFilter(feature.findtext(
+            './{%s}%s' % (namespace, cls._pkey_sourcefield)))
 
-        for field in cls.get_fields(source=('wfs',)).values():
-            gwfilter.data[field['name']] = cls._parse(
-                func=feature.findtext,
-                xpath=field['sourcefield'],
-                namespace=namespace,
-                returntype=field.get('type', None)
-            )
+        gwfilter._parse_wfs_data(feature, namespace)
 
         return gwfilter
-
-    def _parse_xml_data(self):
-        """Get remote XML data for this DOV object, parse the raw XML and
-        save the results in the data object.
-        """
-        xml = self._get_xml_data()
-        tree = etree.fromstring(xml)
-
-        for field in self.get_fields(source=('xml',),
-                                     include_subtypes=False).values():
-            self.data[field['name']] = self._parse(
-                func=tree.findtext,
-                xpath=field['sourcefield'],
-                namespace=None,
-                returntype=field.get('type', None)
-            )
-
-        self._parse_subtypes(xml)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Module grouping utilities to perform requests to the DOV services
+asynchronously, using asyncio and aiohttp.
+
+This module requires Python 3.5 or later and the optional `aiohttp`
+dependency.
+"""
+import asyncio
+import time
+
+import aiohttp
+
+import pydov
+from pydov.util.instrumentation import Timer
+from pydov.util.net import (
+    get_mirror_urls,
+    record_failure,
+    record_latency,
+    record_mirror_latency,
+)
+
+
+def get_running_loop():
+    """Return the event loop running the current coroutine.
+
+    Returns
+    -------
+    asyncio.AbstractEventLoop
+        The running event loop.
+
+    """
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:
+        # Python 3.5 and 3.6
+        return asyncio.get_event_loop()
+
+
+class AsyncClient(object):
+    """Asynchronous HTTP client to perform requests to the DOV services.
+
+    The client keeps the connections to each host alive and reuses them for
+    subsequent requests, and negotiates gzip compression of the responses.
+    It can be shared by many concurrent searches and should be closed
+    after use, preferably by using it as an asynchronous context manager::
+
+        async with AsyncClient() as client:
+            df = await BoringSearch().async_search(query=query,
+                                                   client=client)
+
+    """
+
+    def __init__(self, limit=10, timeout=30):
+        """Initialisation.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of simultaneous connections per host, and hence
+            the maximum number of concurrent requests. Defaults to 10.
+        timeout : int or float, optional
+            Timeout in seconds to wait for the server while connecting and
+            while reading the response. Defaults to 30.
+
+        """
+        self.limit = limit
+        self.timeout = timeout
+        self._session = None
+        self._inflight = {}
+
+    def _get_session(self):
+        """Return the aiohttp session of this client, creating it on first
+        use.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            The session of this client.
+
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.limit),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.timeout,
+                                              sock_read=self.timeout),
+                headers={
+                    'User-Agent': 'pydov/%s' % pydov.__version__,
+                    'Accept-Encoding': 'gzip, deflate'
+                })
+        return self._session
+
+    async def _failover(self, url, request):
+        """Perform a request to a DOV service at the preferred mirror of the
+        service, failing over to the next mirror on timeouts, connection
+        errors and HTTP server errors (status 5xx), like
+        `pydov.util.net.failover`.
+
+        Parameters
+        ----------
+        url : str
+            URL of the DOV service to request.
+        request : coroutine function
+            Function performing the request, given the URL at a mirror.
+
+        Returns
+        -------
+        object
+            The result of `request` at the first mirror that did not fail.
+
+        Raises
+        ------
+        aiohttp.ClientConnectionError or asyncio.TimeoutError or
+        aiohttp.ClientResponseError
+            The error of the last mirror, if the request failed at all
+            mirrors.
+
+        """
+        error = None
+        for mirror, mirror_url in get_mirror_urls(url):
+            start = time.time()
+            try:
+                result = await request(mirror_url)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+                record_failure(mirror)
+                continue
+            except aiohttp.ClientResponseError as e:
+                if e.status < 500:
+                    raise
+                error = e
+                record_failure(mirror)
+                continue
+
+            record_mirror_latency(mirror, time.time() - start)
+            return result
+        raise error
+
+    async def _coalesce(self, key, request):
+        """Perform a request and return its result, sharing a single request
+        with all concurrent tasks of this client requesting the same key,
+        like `pydov.util.concurrency.coalesce`.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the result of the request.
+        request : coroutine function
+            Function performing the request, without arguments.
+
+        Returns
+        -------
+        object
+            The result of `request`.
+
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(request())
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get(self, url):
+        """Request the given URL and return the content of the response.
+
+        URLs of the DOV services are requested at their mirrors.
+
+        Parameters
+        ----------
+        url : str
+            URL to request.
+
+        Returns
+        -------
+        bytes
+            The content of the response.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            When the server returned an HTTP error status.
+
+        """
+        async def get(url):
+            async with self._get_session().get(url) as response:
+                response.raise_for_status()
+                return await response.read()
+
+        return await self._failover(url, get)
+
+    async def post(self, url, data):
+        """Post the given data to the URL and return the content of the
+        response.
+
+        URLs of the DOV services are requested at their mirrors.
+
+        Parameters
+        ----------
+        url : str
+            URL to post the data to.
+        data : bytes
+            The body of the request.
+
+        Returns
+        -------
+        bytes
+            The content of the response.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            When the server returned an HTTP error status.
+
+        """
+        async def post(url):
+            async with self._get_session().post(url, data=data) as response:
+                response.raise_for_status()
+                return await response.read()
+
+        return await self._failover(url, post)
+
+    async def close(self):
+        """Close the connections of this client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+async def get_dov_xml(client, url):
+    """Request the XML of a DOV object asynchronously, using the cache
+    configured in `pydov.cache` if any. Concurrent requests of the same XML
+    with the same client share a single request.
+
+    The cache is read and written in the default executor of the event
+    loop, to not block the other tasks.
+
+    Parameters
+    ----------
+    client : pydov.util.aio.AsyncClient
+        Client to perform the request with.
+    url : str
+        URL of the DOV object to download.
+
+    Returns
+    -------
+    xml : bytes
+        The raw XML data of this DOV object as bytes.
+
+    """
+    loop = get_running_loop()
+
+    async def get_xml():
+        with Timer('xml_fetch') as timer:
+            if pydov.cache is not None:
+                data = await loop.run_in_executor(None, pydov.cache.load, url)
+                if data is not None:
+                    timer.bytes = len(data)
+                    return data
+
+            start = time.time()
+            data = await client.get(url)
+            record_latency('xml', time.time() - start)
+            timer.bytes = len(data)
+
+            if pydov.cache is not None:
+                await loop.run_in_executor(None, pydov.cache.save, url, data)
+            return data
+
+    return await client._coalesce(url, get_xml)
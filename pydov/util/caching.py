@@ -0,0 +1,719 @@
+# -*- coding: utf-8 -*-
+"""Module grouping caching implementations for the XML documents of DOV
+objects and the metadata of the DOV services, and an in-memory LRU cache."""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import pydov
+from pydov.util import dovutil
+
+
+class AbstractCache(object):
+    """Abstract class for a cache of XML documents of DOV objects, keyed by
+    their URL. Not to be instantiated or used directly."""
+
+    def get(self, url):
+        """Get the XML document of the DOV object with the given URL, either
+        from the cache or from the remote DOV service.
+
+        When the document is not available in the cache (or it is expired),
+        it is downloaded from the remote service and saved in the cache.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of the DOV object as bytes.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+    def load(self, url):
+        """Get the XML document of the DOV object with the given URL from
+        the cache, without downloading it.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of the DOV object as bytes, or None if the
+            document is not available in the cache or it is expired.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+    def save(self, url, data):
+        """Save the XML document of the DOV object with the given URL in the
+        cache.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+        data : bytes
+            The raw XML data of the DOV object as bytes.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+    def clean(self):
+        """Remove all expired documents from the cache.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+    def remove(self):
+        """Remove all documents from the cache.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+    @staticmethod
+    def _get_remote(url):
+        """Download the XML document of the DOV object with the given URL
+        from the remote DOV service.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of the DOV object as bytes.
+
+        """
+        return dovutil.get_dov_xml(url)
+
+
+class FileCache(AbstractCache):
+    """Cache saving the XML documents of DOV objects as files on disk.
+
+    Documents expire `max_age` after they have been downloaded. When the
+    total size of the cache exceeds `max_size` bytes, the least recently
+    used documents are evicted until it fits again.
+
+    """
+
+    def __init__(self, cachedir=None, max_age=datetime.timedelta(weeks=2),
+                 max_size=None, compress=False):
+        """Initialisation.
+
+        Parameters
+        ----------
+        cachedir : str, optional
+            Path of the directory to save the cached documents in. Defaults
+            to a directory `pydov` in the temporary directory of the system.
+        max_age : datetime.timedelta, optional
+            Time after which cached documents expire and are downloaded
+            again. Defaults to two weeks, use None to never expire documents.
+        max_size : int, optional
+            Maximum size of the cache in bytes. Defaults to None, which
+            does not limit the size of the cache.
+        compress : bool, optional
+            Whether to gzip-compress the documents on disk (True) or not
+            (False). Defaults to False.
+
+        """
+        if cachedir is None:
+            cachedir = os.path.join(tempfile.gettempdir(), 'pydov')
+
+        self.cachedir = cachedir
+        self.max_age = max_age
+        self.max_size = max_size
+        self.compress = compress
+
+        self._size = None
+        self._lock = threading.Lock()
+
+        if not os.path.exists(self.cachedir):
+            try:
+                os.makedirs(self.cachedir)
+            except OSError:
+                # Created in the meantime by another process.
+                pass
+
+    def _get_filepath(self, url):
+        """Get the path of the file containing the cached document with the
+        given URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        str
+            Path of the cache file.
+
+        """
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        extension = '.xml.gz' if self.compress else '.xml'
+        return os.path.join(self.cachedir, key + extension)
+
+    def _get_filepaths(self):
+        """Get the paths of all files in the cache.
+
+        Returns
+        -------
+        list<str>
+            List of paths of the cache files.
+
+        """
+        return [os.path.join(self.cachedir, f) for f in os.listdir(
+            self.cachedir) if f.endswith('.xml') or f.endswith('.xml.gz')]
+
+    def _is_valid(self, filepath):
+        """Check whether the given cache file exists and is not expired.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the cache file.
+
+        Returns
+        -------
+        bool
+            True if the cache file can be used, False otherwise.
+
+        """
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            return False
+
+        if self.max_age is None:
+            return True
+
+        age = datetime.datetime.now() - \
+            datetime.datetime.fromtimestamp(mtime)
+        return age < self.max_age
+
+    def _load(self, filepath):
+        """Read the cached document from the given file and mark it as
+        recently used.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the cache file.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of the DOV object as bytes, or None if the
+            cache file could not be read.
+
+        """
+        try:
+            if filepath.endswith('.gz'):
+                with gzip.open(filepath, 'rb') as f:
+                    data = f.read()
+            else:
+                with open(filepath, 'rb') as f:
+                    data = f.read()
+            # Register the access time for LRU eviction, but keep the
+            # modification time for expiry.
+            os.utime(filepath, (time.time(), os.path.getmtime(filepath)))
+        except (IOError, OSError, EOFError):
+            return None
+        return data
+
+    def _save(self, filepath, data):
+        """Save the given document in the cache, evicting the least recently
+        used documents if the maximum size of the cache is exceeded.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the cache file.
+        data : bytes
+            The raw XML data of the DOV object as bytes.
+
+        """
+        fd, tmppath = tempfile.mkstemp(dir=self.cachedir, suffix='.tmp')
+        try:
+            if self.compress:
+                os.close(fd)
+                with gzip.open(tmppath, 'wb') as f:
+                    f.write(data)
+            else:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+
+            try:
+                previous_size = os.path.getsize(filepath)
+            except OSError:
+                previous_size = 0
+
+            if hasattr(os, 'replace'):
+                os.replace(tmppath, filepath)
+            else:
+                # Python2 cannot rename over an existing file on Windows.
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                os.rename(tmppath, filepath)
+        except (IOError, OSError):
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            return
+
+        if self.max_size is not None:
+            with self._lock:
+                if self._size is None:
+                    self._size = sum(os.path.getsize(f) for f in
+                                     self._get_filepaths())
+                else:
+                    self._size += os.path.getsize(filepath) - previous_size
+
+                if self._size > self.max_size:
+                    self._evict()
+
+    def _evict(self):
+        """Remove the least recently used documents from the cache until its
+        size no longer exceeds the maximum size."""
+        files = []
+        for f in self._get_filepaths():
+            try:
+                stat = os.stat(f)
+            except OSError:
+                continue
+            files.append((stat.st_atime, stat.st_size, f))
+
+        self._size = sum(f[1] for f in files)
+        for atime, size, f in sorted(files):
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(f)
+            except OSError:
+                continue
+            self._size -= size
+
+    def get(self, url):
+        """Get the XML document of the DOV object with the given URL, either
+        from the cache or from the remote DOV service.
+
+        When the document is not available in the cache (or it is expired),
+        it is downloaded from the remote service and saved in the cache.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of the DOV object as bytes.
+
+        """
+        data = self.load(url)
+        if data is None:
+            data = self._get_remote(url)
+            self.save(url, data)
+        return data
+
+    def load(self, url):
+        """Get the XML document of the DOV object with the given URL from
+        the cache, without downloading it.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of the DOV object as bytes, or None if the
+            document is not available in the cache or it is expired.
+
+        """
+        filepath = self._get_filepath(url)
+        if self._is_valid(filepath):
+            return self._load(filepath)
+        return None
+
+    def save(self, url, data):
+        """Save the XML document of the DOV object with the given URL in the
+        cache.
+
+        Parameters
+        ----------
+        url : str
+            URL of the XML document of the DOV object.
+        data : bytes
+            The raw XML data of the DOV object as bytes.
+
+        """
+        self._save(self._get_filepath(url), data)
+
+    def clean(self):
+        """Remove all expired documents from the cache."""
+        for f in self._get_filepaths():
+            if not self._is_valid(f):
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+        with self._lock:
+            self._size = None
+
+    def remove(self):
+        """Remove all documents from the cache."""
+        for f in self._get_filepaths():
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+        with self._lock:
+            self._size = None
+
+
+class MetadataCache(object):
+    """Cache saving versioned snapshots of the metadata of the DOV services
+    (like capabilities, schemas and feature catalogues) as JSON files on
+    disk.
+
+    Snapshots expire `max_age` after they have been saved, after which they
+    are revalidated by requesting the metadata again. When this request
+    fails, the expired snapshot is used instead. Snapshots saved by another
+    version of pydov are ignored.
+
+    """
+
+    _format_version = 1
+
+    def __init__(self, cachedir=None, max_age=datetime.timedelta(days=1)):
+        """Initialisation.
+
+        Parameters
+        ----------
+        cachedir : str, optional
+            Path of the directory to save the snapshots in. Defaults to a
+            directory `pydov_metadata` in the temporary directory of the
+            system.
+        max_age : datetime.timedelta, optional
+            Time after which snapshots are revalidated. Defaults to one
+            day, use None to never revalidate snapshots.
+
+        """
+        if cachedir is None:
+            cachedir = os.path.join(tempfile.gettempdir(), 'pydov_metadata')
+
+        self.cachedir = cachedir
+        self.max_age = max_age
+
+        if not os.path.exists(self.cachedir):
+            try:
+                os.makedirs(self.cachedir)
+            except OSError:
+                # Created in the meantime by another process.
+                pass
+
+    def _get_filepath(self, key):
+        """Get the path of the file containing the snapshot with the given
+        key.
+
+        Parameters
+        ----------
+        key : tuple<str>
+            Key identifying the snapshot.
+
+        Returns
+        -------
+        str
+            Path of the snapshot file.
+
+        """
+        digest = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cachedir, digest + '.json')
+
+    def _load(self, filepath):
+        """Load the snapshot from the given file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the snapshot file.
+
+        Returns
+        -------
+        dict or None
+            The snapshot, or None if the file does not exist, cannot be
+            read or was saved by a different version.
+
+        """
+        try:
+            with open(filepath, 'r') as f:
+                snapshot = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if snapshot.get('format_version') != self._format_version or \
+                snapshot.get('pydov_version') != pydov.__version__:
+            return None
+        return snapshot
+
+    def _save(self, filepath, key, value):
+        """Save a snapshot of the given value.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the snapshot file.
+        key : tuple<str>
+            Key identifying the snapshot.
+        value : object
+            JSON serialisable value to save.
+
+        """
+        snapshot = {
+            'format_version': self._format_version,
+            'pydov_version': pydov.__version__,
+            'timestamp': time.time(),
+            'key': list(key),
+            'value': value
+        }
+
+        fd, tmppath = tempfile.mkstemp(dir=self.cachedir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f)
+
+            if hasattr(os, 'replace'):
+                os.replace(tmppath, filepath)
+            else:
+                # Python2 cannot rename over an existing file on Windows.
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                os.rename(tmppath, filepath)
+        except (IOError, OSError):
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+
+    def _is_valid(self, snapshot):
+        """Check whether the given snapshot has not expired.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot to check.
+
+        Returns
+        -------
+        bool
+            True if the snapshot can be used without revalidation, False
+            otherwise.
+
+        """
+        if self.max_age is None:
+            return True
+        age = time.time() - snapshot.get('timestamp', 0)
+        return age < self.max_age.total_seconds()
+
+    def is_valid(self, key):
+        """Check whether there is a snapshot of the metadata identified by
+        the given key that has not expired.
+
+        Parameters
+        ----------
+        key : tuple<str>
+            Key identifying the metadata.
+
+        Returns
+        -------
+        bool
+            True if the snapshot can be used without revalidation, False
+            otherwise.
+
+        """
+        snapshot = self._load(self._get_filepath(key))
+        return snapshot is not None and self._is_valid(snapshot)
+
+    def load(self, key):
+        """Load the metadata identified by the given key from its snapshot,
+        if it has not expired.
+
+        Parameters
+        ----------
+        key : tuple<str>
+            Key identifying the metadata.
+
+        Returns
+        -------
+        object or None
+            The metadata, or None if there is no snapshot or it has expired.
+
+        """
+        snapshot = self._load(self._get_filepath(key))
+        if snapshot is None or not self._is_valid(snapshot):
+            return None
+        return snapshot['value']
+
+    def get(self, key, fetch):
+        """Get the metadata identified by the given key, either from its
+        snapshot or by calling `fetch`.
+
+        Parameters
+        ----------
+        key : tuple<str>
+            Key identifying the metadata.
+        fetch : callable
+            Function without arguments requesting the metadata from the
+            remote service and returning it as a JSON serialisable value.
+
+        Returns
+        -------
+        object
+            The metadata, as returned by `fetch`.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by `fetch` when there is no snapshot to
+            fall back on.
+
+        """
+        filepath = self._get_filepath(key)
+        snapshot = self._load(filepath)
+
+        if snapshot is not None and self._is_valid(snapshot):
+            return snapshot['value']
+
+        try:
+            value = fetch()
+        except Exception:
+            if snapshot is not None:
+                return snapshot['value']
+            raise
+
+        self._save(filepath, key, value)
+        return value
+
+    def remove(self):
+        """Remove all snapshots from the cache."""
+        for f in os.listdir(self.cachedir):
+            if f.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.cachedir, f))
+                except OSError:
+                    pass
+
+
+class LRUCache(object):
+    """Thread-safe in-memory cache keeping at most `maxsize` values,
+    discarding the least recently used value when full."""
+
+    def __init__(self, maxsize=128):
+        """Initialisation.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of values to keep. Defaults to 128.
+
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value with the given key, marking it as most recently
+        used.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the value.
+        default : object, optional
+            Value to return when the key is not in the cache. Defaults to
+            None.
+
+        Returns
+        -------
+        object
+            The cached value, or `default` if there is none.
+
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        """Save the value with the given key, discarding the least recently
+        used value if the cache is full.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the value.
+        value : object
+            Value to save.
+
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > max(0, self.maxsize):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all values from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
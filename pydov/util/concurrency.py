@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Module grouping utility functions for concurrent execution."""
+import threading
+from collections import deque
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pydov.util.instrumentation import (
+    activated,
+    get_active,
+)
+
+
+def imap_ordered(func, iterable, max_workers=1, discard=None):
+    """Apply `func` to every item of `iterable` using a bounded pool of
+    worker threads, yielding the results in the order of the input.
+
+    At most twice the number of workers are submitted ahead of the result
+    being yielded, so the input iterable is consumed lazily and memory
+    usage stays bounded regardless of its length. The worker threads
+    inherit the instruments activated in the calling thread.
+
+    Parameters
+    ----------
+    func : callable
+        Function to call for each item, taking the item as its single
+        argument.
+    iterable : iterable
+        Items to process.
+    max_workers : int, optional
+        Maximum number of worker threads. When None or smaller than 2,
+        the items are processed serially in the calling thread. Defaults
+        to 1.
+    discard : callable, optional
+        Function to call with each result that was computed ahead but not
+        yielded, because the generator was closed early or an exception
+        was raised, for example to close a response. Defaults to None.
+
+    Yields
+    ------
+        The result of calling `func` on each item, in the order of
+        `iterable`.
+
+    Raises
+    ------
+    Exception
+        Any exception raised by `func` is re-raised in the calling thread
+        when the corresponding result is yielded.
+
+    """
+    if max_workers is None or max_workers < 2:
+        for item in iterable:
+            yield func(item)
+        return
+
+    instruments = get_active()
+    if len(instruments) > 0:
+        def call(item, func=func):
+            with activated(instruments):
+                return func(item)
+        func = call
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in iterable:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+
+            while len(pending) > 0:
+                yield pending.popleft().result()
+        finally:
+            running = [f for f in pending if not f.cancel()]
+            if discard is not None:
+                for future in running:
+                    if future.exception() is None:
+                        discard(future.result())
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class _InflightCall(object):
+    """Call of a function shared by concurrent callers in `coalesce`."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def coalesce(key, func):
+    """Call `func` and return its result, sharing a single call with all
+    threads calling `coalesce` concurrently with the same key.
+
+    The first thread calls `func`, the other threads wait for its result
+    instead of calling `func` themselves. Results are not kept once the
+    call is complete, later calls with the same key will call `func` again.
+
+    Parameters
+    ----------
+    key : hashable
+        Key identifying the result of `func`.
+    func : callable
+        Function to call, without arguments. It should not call `coalesce`
+        with the same key.
+
+    Returns
+    -------
+        The result of `func`.
+
+    Raises
+    ------
+    Exception
+        Any exception raised by `func` is raised in all waiting threads.
+
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        if call is None:
+            call = _inflight[key] = _InflightCall()
+            leader = True
+        else:
+            leader = False
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = func()
+        return call.result
+    except BaseException as error:
+        call.error = error
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Module grouping utility functions for DOV XML services."""
+import time
+
+from pydov.util.net import (
+    get_url,
+    record_latency,
+)
+
+
+def get_dov_xml(url):
+    """Request the XML from the remote DOV webservices and return it.
+
+    The latency of the request is recorded as 'xml' in
+    `pydov.util.net.record_latency`.
+
+    Parameters
+    ----------
+    url : str
+        URL of the DOV object to download.
+
+    Returns
+    -------
+    xml : bytes
+        The raw XML data of this DOV object as bytes.
+
+    """
+    start = time.time()
+    xml = get_url(url)
+    record_latency('xml', time.time() - start)
+    return xml
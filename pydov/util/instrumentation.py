@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""Module grouping the instrumentation of the searches and DOV types,
+emitting timed events for each phase of a search.
+
+The phases are, in order:
+
+* ``capabilities``: the WFS GetCapabilities request
+* ``describefeaturetype``: the WFS DescribeFeatureType requests
+* ``metadata``: the CSW requests of the metadata and feature catalogue
+* ``getfeature``: the WFS GetFeature request, until the response starts
+* ``gml_parse``: reading and parsing the GetFeature response
+* ``xml_fetch``: requesting the XML document of a DOV object, from the
+  cache if configured
+* ``xml_parse``: parsing the XML document of a DOV object
+* ``dataframe``: building the output dataframe
+* ``search``: the complete search
+
+Instruments receive the events of all searches when added to
+`pydov.instruments`, or those of a single search when added to it with
+`AbstractSearch.add_instrument`, like::
+
+    stats = StatsCollector()
+    search = BoringSearch()
+    search.add_instrument(stats)
+    df = search.search(location=(150000, 210000, 155000, 215000))
+    print(stats.summary())
+
+"""
+import threading
+import time
+from collections import (
+    OrderedDict,
+    namedtuple,
+)
+
+import pandas as pd
+
+import pydov
+
+#: The phases of a search, in order.
+PHASES = ('capabilities', 'describefeaturetype', 'metadata', 'getfeature',
+          'gml_parse', 'xml_fetch', 'xml_parse', 'dataframe', 'search')
+
+_local = threading.local()
+
+
+class Event(namedtuple('Event', ['phase', 'seconds', 'bytes', 'features'])):
+    """Timed event of a phase of a search.
+
+    Attributes
+    ----------
+    phase : str
+        Name of the phase, one of `PHASES`.
+    seconds : float
+        Time spent in the phase, in seconds.
+    bytes : int or None
+        Number of bytes requested or parsed, if applicable.
+    features : int or None
+        Number of features parsed, or rows built for the ``dataframe`` and
+        ``search`` phases, if applicable.
+
+    """
+    __slots__ = ()
+
+
+class AbstractInstrument(object):
+    """Base class of the instruments receiving the events of the
+    searches."""
+
+    def on_event(self, event):
+        """Receive an event.
+
+        Events can be emitted concurrently by multiple threads.
+
+        Parameters
+        ----------
+        event : Event
+            The event.
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that should be implemented in a
+            subclass.
+
+        """
+        raise NotImplementedError('This should be implemented in a subclass.')
+
+
+class StatsCollector(AbstractInstrument):
+    """Instrument collecting the number of events, the time spent and the
+    number of bytes and features of each phase."""
+
+    def __init__(self):
+        """Initialisation."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def on_event(self, event):
+        """Add an event to the statistics of its phase.
+
+        Parameters
+        ----------
+        event : Event
+            The event.
+
+        """
+        with self._lock:
+            stats = self._stats.get(event.phase)
+            if stats is None:
+                stats = self._stats[event.phase] = [0, 0.0, 0.0, 0, 0]
+            stats[0] += 1
+            stats[1] += event.seconds
+            stats[2] = max(stats[2], event.seconds)
+            stats[3] += event.bytes or 0
+            stats[4] += event.features or 0
+
+    def reset(self):
+        """Forget all collected statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self):
+        """Summarise the collected statistics.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame with a row for each phase with events, in the order
+            of `PHASES`, and columns with the number of events (`count`),
+            the total, mean and maximum time in seconds (`seconds`,
+            `mean_seconds` and `max_seconds`) and the total number of
+            `bytes` and `features`.
+
+        """
+        with self._lock:
+            stats = dict((k, list(v)) for k, v in self._stats.items())
+
+        phases = [p for p in PHASES if p in stats] + \
+            sorted(p for p in stats if p not in PHASES)
+
+        columns = OrderedDict([
+            ('count', [stats[p][0] for p in phases]),
+            ('seconds', [stats[p][1] for p in phases]),
+            ('mean_seconds', [stats[p][1] / stats[p][0] for p in phases]),
+            ('max_seconds', [stats[p][2] for p in phases]),
+            ('bytes', [stats[p][3] for p in phases]),
+            ('features', [stats[p][4] for p in phases]),
+        ])
+        return pd.DataFrame(columns, index=pd.Index(phases, name='phase'))
+
+
+def get_active():
+    """Return the instruments activated in the current thread, with
+    `activated`.
+
+    Returns
+    -------
+    list<AbstractInstrument>
+        The activated instruments.
+
+    """
+    return getattr(_local, 'instruments', [])
+
+
+def activated(instruments):
+    """Return a context manager activating instruments in the current
+    thread, to receive the events emitted within the context in addition to
+    the instruments in `pydov.instruments`.
+
+    Worker threads started with `pydov.util.concurrency.imap_ordered`
+    inherit the activated instruments.
+
+    Parameters
+    ----------
+    instruments : list<AbstractInstrument>
+        Instruments to activate.
+
+    Returns
+    -------
+    context manager
+        Context manager activating the instruments.
+
+    """
+    return _Activation(instruments)
+
+
+class _Activation(object):
+    """Context manager activating instruments in the current thread."""
+
+    def __init__(self, instruments):
+        self.instruments = instruments
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = get_active()
+        _local.instruments = self._previous + [
+            i for i in self.instruments if i not in self._previous]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.instruments = self._previous
+
+
+def emit(event):
+    """Emit an event to the instruments in `pydov.instruments` and the
+    instruments activated in the current thread.
+
+    Parameters
+    ----------
+    event : Event
+        The event to emit.
+
+    """
+    for instrument in list(pydov.instruments or ()) + get_active():
+        instrument.on_event(event)
+
+
+class Timer(object):
+    """Timer of a phase, emitting its event when stopped.
+
+    Use it as a context manager, or start, pause and stop it explicitly to
+    time a phase that is interrupted, like::
+
+        with Timer('xml_parse') as timer:
+            tree = etree.fromstring(xml)
+            timer.bytes = len(xml)
+
+    """
+
+    def __init__(self, phase, bytes=None, features=None, instruments=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase, one of `PHASES`.
+        bytes : int, optional
+            Number of bytes requested or parsed. Can be set until the timer
+            is stopped. Defaults to None.
+        features : int, optional
+            Number of features parsed or rows built. Can be set until the
+            timer is stopped. Defaults to None.
+        instruments : list<AbstractInstrument>, optional
+            Instruments to activate while the timer is used as context
+            manager, as with `activated`. Defaults to None.
+
+        """
+        self.phase = phase
+        self.bytes = bytes
+        self.features = features
+        self.seconds = 0.0
+        self._start = None
+        self._activation = _Activation(instruments or [])
+
+    def start(self):
+        """Start or resume the timer.
+
+        Returns
+        -------
+        Timer
+            The timer itself.
+
+        """
+        self._start = time.time()
+        return self
+
+    def pause(self):
+        """Pause the timer, adding the time since it was started."""
+        if self._start is not None:
+            self.seconds += time.time() - self._start
+            self._start = None
+
+    def stop(self):
+        """Stop the timer and emit its event."""
+        self.pause()
+        emit(Event(self.phase, self.seconds, self.bytes, self.features))
+
+    def __enter__(self):
+        self._activation.__enter__()
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.stop()
+        finally:
+            self._activation.__exit__(exc_type, exc_value, traceback)
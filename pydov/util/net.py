@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""Module grouping network-related utilities and functions."""
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import pydov
+
+#: Base URLs of the DOV services, as used by pydov and in the responses of
+#: the services. Requests to these URLs go to the mirrors configured in
+#: `pydov.wfs_urls`, `pydov.csw_urls` and `pydov.xml_urls` instead.
+DOV_URLS = {
+    'wfs': 'https://www.dov.vlaanderen.be/geoserver/wfs',
+    'csw': 'https://www.dov.vlaanderen.be/geonetwork',
+    'xml': 'https://www.dov.vlaanderen.be/data',
+}
+
+#: Errors of a request after which it is retried at the next mirror.
+FAILOVER_ERRORS = (requests.exceptions.Timeout,
+                   requests.exceptions.ConnectionError)
+
+_session = None
+_session_lock = threading.Lock()
+
+_latencies = {}
+_mirror_latencies = {}
+_latency_lock = threading.Lock()
+_latency_window = 100
+
+_failures = {}
+_failover_period = 60
+
+
+def build_session(pool_maxsize=None, pool_connections=4, max_retries=0):
+    """Build a new HTTP session to perform requests to the DOV services.
+
+    The session keeps the connections to each host alive and reuses them
+    for subsequent requests, and negotiates gzip compression of the
+    responses.
+
+    Parameters
+    ----------
+    pool_maxsize : int, optional
+        Maximum number of connections to keep alive per host. Defaults to
+        None, which will use the larger of 10 and `pydov.max_workers`.
+    pool_connections : int, optional
+        Number of hosts to keep a connection pool for. Defaults to 4.
+    max_retries : int, optional
+        Maximum number of retries of each connection. Defaults to 0.
+
+    Returns
+    -------
+    requests.Session
+        The new session.
+
+    """
+    if pool_maxsize is None:
+        pool_maxsize = max(10, pydov.max_workers or 1)
+
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'pydov/%s' % pydov.__version__,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=max_retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """Return the HTTP session shared by all requests to the DOV services.
+
+    The session is built with the default settings of `build_session` on
+    first use, unless another one has been set with `set_session`.
+
+    Returns
+    -------
+    requests.Session
+        The shared session.
+
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def set_session(session):
+    """Set the HTTP session shared by all requests to the DOV services.
+
+    Use this to configure the connection pool or other settings of the
+    session, like::
+
+        pydov.util.net.set_session(
+            pydov.util.net.build_session(pool_maxsize=32))
+
+    Parameters
+    ----------
+    session : requests.Session or None
+        The session to use for all subsequent requests. None to build a
+        new session with the default settings on next use.
+
+    """
+    global _session
+    with _session_lock:
+        old_session = _session
+        _session = session
+
+    if old_session is not None and old_session is not session:
+        old_session.close()
+
+
+def get_url(url, timeout=30):
+    """Request the given URL using the shared session and return the
+    content of the response.
+
+    URLs of the DOV services are requested at their mirrors, as in
+    `failover`.
+
+    Parameters
+    ----------
+    url : str
+        URL to request.
+    timeout : int or float, optional
+        Timeout in seconds to wait for the server. Defaults to 30.
+
+    Returns
+    -------
+    bytes
+        The content of the response.
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        When the server returned an HTTP error status.
+    requests.exceptions.Timeout or requests.exceptions.ConnectionError
+        When the request failed at all mirrors.
+
+    """
+    response = failover(
+        url, lambda url: get_session().get(url, timeout=timeout))
+    response.raise_for_status()
+    return response.content
+
+
+def get_mirror_urls(url):
+    """Return the URLs of the given URL of a DOV service at each of the
+    mirrors of the service, in order of preference.
+
+    The mirrors are ordered by their median recent latency, followed by
+    their priority. Mirrors that have not been used yet are preferred, to
+    measure their latency, and mirrors that failed during the last minute
+    come last.
+
+    Parameters
+    ----------
+    url : str
+        URL of a DOV service, starting with one of the `DOV_URLS`.
+
+    Returns
+    -------
+    list<tuple<str>>
+        Tuples of the base URL of the mirror and the URL to request at that
+        mirror. For URLs of other services, a single tuple of None and the
+        URL itself.
+
+    """
+    for service, base_url in DOV_URLS.items():
+        if url == base_url or url.startswith(base_url) and \
+                url[len(base_url)] in '/?':
+            break
+    else:
+        return [(None, url)]
+
+    mirrors = getattr(pydov, service + '_urls', None) or [base_url]
+    now = time.time()
+
+    with _latency_lock:
+        failed = set(m for m in mirrors if
+                     now - _failures.get(m, 0) < _failover_period)
+
+    def preference(index):
+        mirror = mirrors[index]
+        return mirror in failed, get_mirror_latency(mirror) or 0, index
+
+    return [(mirrors[i], mirrors[i].rstrip('/') + url[len(base_url):])
+            for i in sorted(range(len(mirrors)), key=preference)]
+
+
+def failover(url, request):
+    """Perform a request to a DOV service at the preferred mirror of the
+    service, failing over to the next mirror on timeouts, connection errors
+    and HTTP server errors (status 5xx).
+
+    The latency of successful requests is recorded for the mirror, as in
+    `record_mirror_latency`, and mirrors that failed are avoided during the
+    next minute.
+
+    Parameters
+    ----------
+    url : str
+        URL of the DOV service to request.
+    request : callable
+        Function performing the request, given the URL at a mirror.
+
+    Returns
+    -------
+    object
+        The result of `request` at the first mirror that did not fail, or
+        the last response with a server error if all mirrors returned one.
+
+    Raises
+    ------
+    requests.exceptions.Timeout or requests.exceptions.ConnectionError
+        The error of the last mirror, if the request failed at all mirrors
+        without any response.
+
+    """
+    error = None
+    failed = None
+    for mirror, mirror_url in get_mirror_urls(url):
+        start = time.time()
+        try:
+            result = request(mirror_url)
+        except FAILOVER_ERRORS as e:
+            error = e
+            record_failure(mirror)
+            continue
+
+        status = getattr(result, 'status_code', None)
+        if status is not None and status >= 500:
+            if failed is not None:
+                failed.close()
+            failed = result
+            record_failure(mirror)
+            continue
+
+        if failed is not None:
+            failed.close()
+        if status is None or status < 400:
+            record_mirror_latency(mirror, time.time() - start)
+        return result
+
+    if failed is not None:
+        return failed
+    raise error
+
+
+def record_failure(mirror):
+    """Record the failure of a request to a mirror of a DOV service, to
+    avoid the mirror during the next minute.
+
+    Parameters
+    ----------
+    mirror : str or None
+        Base URL of the mirror, as in `get_mirror_urls`. None is ignored.
+
+    """
+    if mirror is not None:
+        with _latency_lock:
+            _failures[mirror] = time.time()
+
+
+def _record(latencies, key, seconds):
+    """Record a latency in the given dictionary of recent latencies.
+
+    Parameters
+    ----------
+    latencies : dict<str, deque<float>>
+        Recent latencies, by key.
+    key : str
+        Key to record the latency for.
+    seconds : float
+        The latency in seconds.
+
+    """
+    with _latency_lock:
+        if key not in latencies:
+            latencies[key] = deque(maxlen=_latency_window)
+        latencies[key].append(seconds)
+
+
+def _median(latencies, key):
+    """Get the median of the recent latencies recorded for the given key.
+
+    Parameters
+    ----------
+    latencies : dict<str, deque<float>>
+        Recent latencies, by key.
+    key : str
+        Key to get the median latency of.
+
+    Returns
+    -------
+    float or None
+        The median latency in seconds, or None if no latencies have been
+        recorded for this key.
+
+    """
+    with _latency_lock:
+        recent = sorted(latencies.get(key, ()))
+
+    if len(recent) == 0:
+        return None
+
+    middle = len(recent) // 2
+    if len(recent) % 2 == 1:
+        return recent[middle]
+    return (recent[middle - 1] + recent[middle]) / 2.0
+
+
+def record_latency(kind, seconds):
+    """Record the latency of a request of the given kind to the DOV
+    services, used to estimate the cost of searches.
+
+    Only the latencies of the last 100 requests of each kind are kept.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of request, like 'wfs' for WFS GetFeature requests or 'xml'
+        for requests of the XML document of a DOV object.
+    seconds : float
+        Time in seconds between sending the request and receiving the
+        response.
+
+    """
+    _record(_latencies, kind, seconds)
+
+
+def get_latency(kind):
+    """Get the typical latency of recent requests of the given kind.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of request, as used in `record_latency`.
+
+    Returns
+    -------
+    float or None
+        The median latency in seconds of the recent requests of this kind,
+        or None if no requests of this kind have been recorded.
+
+    """
+    return _median(_latencies, kind)
+
+
+def record_mirror_latency(mirror, seconds):
+    """Record the latency of a request to a mirror of a DOV service, used
+    to order the mirrors in `get_mirror_urls`.
+
+    Only the latencies of the last 100 requests to each mirror are kept.
+
+    Parameters
+    ----------
+    mirror : str or None
+        Base URL of the mirror, as in `get_mirror_urls`. None is ignored.
+    seconds : float
+        Time in seconds between sending the request and receiving the
+        response.
+
+    """
+    if mirror is not None:
+        _record(_mirror_latencies, mirror, seconds)
+
+
+def get_mirror_latency(mirror):
+    """Get the typical latency of recent requests to the given mirror of a
+    DOV service.
+
+    Parameters
+    ----------
+    mirror : str
+        Base URL of the mirror, as in `get_mirror_urls`.
+
+    Returns
+    -------
+    float or None
+        The median latency in seconds of the recent requests to this
+        mirror, or None if no requests to this mirror have been recorded.
+
+    """
+    return _median(_mirror_latencies, mirror)
+
+
+def reset_latency():
+    """Forget the latencies and failures of all recorded requests."""
+    with _latency_lock:
+        _latencies.clear()
+        _mirror_latencies.clear()
+        _failures.clear()
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """Module grouping utility functions for OWS services."""
-import requests
+import time
+from io import BytesIO
 
+from owslib.feature.common import WFSCapabilitiesReader
 from owslib.feature.schema import (
     _get_describefeaturetype_url,
     _get_elements,
@@ -20,7 +22,6 @@ from owslib.etree import etree
 from owslib.iso import MD_Metadata
 from owslib.namespaces import Namespaces
 from owslib.util import (
-    openURL,
     nspath_eval,
     findall,
 )
@@ -29,6 +30,13 @@ from pydov.util.errors import (
     MetadataNotFoundError,
     FeatureCatalogueNotFoundError,
 )
+from pydov.util.instrumentation import Timer
+from pydov.util.net import (
+    failover,
+    get_session,
+    record_latency,
+    get_url,
+)
 
 
 def __get_namespaces():
@@ -59,7 +67,7 @@ def __get_remote_md(md_url):
         Response containing the remote metadata.
 
     """
-    return openURL(md_url).read()
+    return get_url(md_url)
 
 
 def __get_remote_fc(fc_url):
@@ -77,7 +85,7 @@ def __get_remote_fc(fc_url):
         Response containing the remote feature catalogue.
 
     """
-    return openURL(fc_url).read()
+    return get_url(fc_url)
 
 
 def __get_remote_describefeaturetype(describefeaturetype_url):
@@ -95,11 +103,11 @@ def __get_remote_describefeaturetype(describefeaturetype_url):
         Response containing the remote DescribeFeatureType.
 
     """
-    return openURL(describefeaturetype_url).read()
+    return get_url(describefeaturetype_url)
 
 
-def get_remote_metadata(contentmetadata):
-    """Request and parse the remote metadata associated with the layer
+def get_metadata_url(contentmetadata):
+    """Get the URL of the remote metadata associated with the layer
     described in `contentmetadata`.
 
     Parameters
@@ -110,9 +118,8 @@ def get_remote_metadata(contentmetadata):
 
     Returns
     -------
-    owslib.iso.MD_Metadata
-        Parsed remote metadata describing the WFS layer in more detail,
-        in the ISO 19115/19139 format.
+    url : str
+        URL of the CSW GetRecordById request of the remote metadata.
 
     Raises
     ------
@@ -129,7 +136,32 @@ def get_remote_metadata(contentmetadata):
     if md_url is None:
         raise MetadataNotFoundError
 
-    content = __get_remote_md(md_url)
+    return md_url
+
+
+def get_remote_metadata(contentmetadata):
+    """Request and parse the remote metadata associated with the layer
+    described in `contentmetadata`.
+
+    Parameters
+    ----------
+    contentmetadata : owslib.feature.wfs110.ContentMetadata
+        Content metadata associated with a WFS layer, containing the
+        associated `metadataUrls`.
+
+    Returns
+    -------
+    owslib.iso.MD_Metadata
+        Parsed remote metadata describing the WFS layer in more detail,
+        in the ISO 19115/19139 format.
+
+    Raises
+    ------
+    pydov.util.errors.MetadataNotFoundError
+        If the `contentmetadata` has no valid metadata URL associated with it.
+
+    """
+    content = __get_remote_md(get_metadata_url(contentmetadata))
     doc = etree.fromstring(content)
     return MD_Metadata(doc)
 
@@ -155,16 +187,7 @@ def get_csw_base_url(contentmetadata):
         If the `contentmetadata` has no valid metadata URL associated with it.
 
     """
-    md_url = None
-    for md in contentmetadata.metadataUrls:
-        if md.get('url', None) is not None \
-                and 'getrecordbyid' in md.get('url', "").lower():
-            md_url = md.get('url')
-
-    if md_url is None:
-        raise MetadataNotFoundError
-
-    parsed_url = urlparse(md_url)
+    parsed_url = urlparse(get_metadata_url(contentmetadata))
     return parsed_url.scheme + '://' + parsed_url.netloc + parsed_url.path
 
 
@@ -205,6 +228,28 @@ def get_featurecatalogue_uuid(md_metadata):
     return uuid
 
 
+def get_featurecatalogue_url(csw_url, fc_uuid):
+    """Get the URL of the remote feature catalogue described by the CSW base
+    url and feature catalogue UUID.
+
+    Parameters
+    ----------
+    csw_url : str
+        Base URL of the CSW service to query, should end with 'csw'.
+    fc_uuid : str
+        Universally unique identifier of the feature catalogue.
+
+    Returns
+    -------
+    url : str
+        URL of the CSW GetRecordById request of the feature catalogue.
+
+    """
+    return csw_url + '?Service=CSW&Request=GetRecordById&Version=2.0.2' \
+                     '&outputSchema=http://www.isotc211.org/2005/gmd' \
+                     '&elementSetName=full&id=' + fc_uuid
+
+
 def get_remote_featurecatalogue(csw_url, fc_uuid):
     """Request and parse the remote feature catalogue described by the CSW
     base url and feature catalogue UUID.
@@ -241,11 +286,31 @@ def get_remote_featurecatalogue(csw_url, fc_uuid):
         given CSW service.
 
     """
-    fc_url = csw_url + '?Service=CSW&Request=GetRecordById&Version=2.0.2' \
-                       '&outputSchema=http://www.isotc211.org/2005/gmd' \
-                       '&elementSetName=full&id=' + fc_uuid
+    content = __get_remote_fc(get_featurecatalogue_url(csw_url, fc_uuid))
+    return parse_featurecatalogue(content)
+
+
+def parse_featurecatalogue(content):
+    """Parse the response of a CSW GetRecordById request of a feature
+    catalogue.
 
-    content = __get_remote_fc(fc_url)
+    Parameters
+    ----------
+    content : bytes
+        Response of the CSW service containing the feature catalogue.
+
+    Returns
+    -------
+    dict
+        Dictionary with fields described in the feature catalogue, as
+        returned by `get_remote_featurecatalogue`.
+
+    Raises
+    ------
+    pydov.util.errors.FeatureCatalogueNotFoundError
+        If the response does not contain a feature catalogue.
+
+    """
     tree = etree.fromstring(content)
 
     fc = tree.find(nspath_eval('gfc:FC_FeatureCatalogue', __namespaces))
@@ -302,6 +367,60 @@ def get_remote_featurecatalogue(csw_url, fc_uuid):
     return r
 
 
+def get_remote_capabilities(url, version='1.1.0'):
+    """Request the GetCapabilities response of a WFS service.
+
+    The request is performed like the other requests to the DOV services,
+    at the mirrors of the service as in `pydov.util.net.get_url`.
+
+    Parameters
+    ----------
+    url : str
+        Base URL of the WFS service.
+    version : str, optional
+        Version of the WFS service. Defaults to '1.1.0'.
+
+    Returns
+    -------
+    bytes
+        Response containing the GetCapabilities document.
+
+    """
+    return get_url(WFSCapabilitiesReader(version).capabilities_url(url))
+
+
+def get_max_features(wfs):
+    """Get the maximum number of features returned by a GetFeature request
+    to the WFS service, as advertised in its capabilities.
+
+    Parameters
+    ----------
+    wfs : owslib.wfs.WebFeatureService
+        WFS service to use.
+
+    Returns
+    -------
+    int or None
+        The value of the DefaultMaxFeatures (WFS 1.1.0) or CountDefault
+        (WFS 2.0.0) constraint of the service or of its GetFeature
+        operation, or None if the capabilities do not advertise it.
+
+    """
+    constraints = list(getattr(wfs, 'constraints', {}).values())
+    for operation in getattr(wfs, 'operations', []):
+        if getattr(operation, 'name', None) == 'GetFeature':
+            constraints.extend(operation.constraints)
+
+    for constraint in constraints:
+        if constraint.name in ('DefaultMaxFeatures', 'CountDefault'):
+            for value in constraint.values:
+                try:
+                    return int(value)
+                except (TypeError, ValueError):
+                    pass
+    return None
+
+
 def get_namespace(wfs, layer):
     """Request the namespace associated with a layer by performing a
     DescribeFeatureType request.
@@ -320,13 +439,29 @@ def get_namespace(wfs, layer):
         URI of the namespace associated with the given layer.
 
     """
-    from owslib.feature.schema import _get_describefeaturetype_url
     url = _get_describefeaturetype_url(url=wfs.url, version='1.1.0',
                                        typename=layer)
     schema = __get_remote_describefeaturetype(url)
-    tree = etree.fromstring(schema)
-    namespace = tree.attrib.get('targetNamespace', None)
-    return namespace
+    return parse_namespace(schema)
+
+
+def parse_namespace(describefeaturetype):
+    """Parse the namespace from the response of a DescribeFeatureType
+    request.
+
+    Parameters
+    ----------
+    describefeaturetype : bytes
+        Response of the DescribeFeatureType request.
+
+    Returns
+    -------
+    namespace : str
+        URI of the target namespace of the described layer.
+
+    """
+    tree = etree.fromstring(describefeaturetype)
+    return tree.attrib.get('targetNamespace', None)
 
 
 def _construct_schema(elements, nsmap):
@@ -397,7 +532,7 @@ def _construct_schema(elements, nsmap):
 
 def get_remote_schema(url, typename, version='1.0.0'):
     """Copy the owslib.feature.schema.get_schema method to be able to
-    monkeypatch the openURL request in tests.
+    monkeypatch the remote request in tests.
 
     Parameters
     ----------
@@ -416,7 +551,27 @@ def get_remote_schema(url, typename, version='1.0.0'):
     """
     url = _get_describefeaturetype_url(url, version, typename)
     res = __get_remote_describefeaturetype(url)
-    root = etree.fromstring(res)
+    return parse_schema(res, typename)
+
+
+def parse_schema(describefeaturetype, typename):
+    """Parse the schema of a layer from the response of a
+    DescribeFeatureType request.
+
+    Parameters
+    ----------
+    describefeaturetype : bytes
+        Response of the DescribeFeatureType request.
+    typename : str
+        Typename of the feature type to get the schema of.
+
+    Returns
+    -------
+    dict
+        Schema of the given WFS layer.
+
+    """
+    root = etree.fromstring(describefeaturetype)
 
     if ':' in typename:
         typename = typename.split(':')[1]
@@ -432,7 +587,9 @@ def get_remote_schema(url, typename, version='1.0.0'):
 
 def wfs_build_getfeature_request(typename, geometry_column=None, bbox=None,
                                  filter=None, propertyname=None,
-                                 version='1.1.0'):
+                                 version='1.1.0', sort_by=None,
+                                 start_index=None, max_features=None,
+                                 result_type=None):
     """Build a WFS GetFeature request in XML to be used as payload in a WFS
     GetFeature request using POST.
 
@@ -452,6 +609,20 @@ def wfs_build_getfeature_request(typename, geometry_column=None, bbox=None,
         List of properties to return. Defaults to all properties.
     version : str, optional
         WFS version to use. Defaults to 1.1.0
+    sort_by : str, optional
+        Name of the property to sort the features on, in ascending order.
+        Defaults to no sorting.
+    start_index : int, optional
+        Index of the first feature to return, for paging through the
+        features. Requires a stable order, see ``sort_by``. Defaults to 0.
+    max_features : int, optional
+        Maximum number of features to return. Defaults to the maximum of the
+        WFS server.
+    result_type : str, optional
+        Either 'results' to return the features or 'hits' to return only
+        the number of matching features, in the `numberOfFeatures`
+        attribute of the response. Defaults to None, returning the
+        features.
 
     Raises
     ------
@@ -471,6 +642,15 @@ def wfs_build_getfeature_request(typename, geometry_column=None, bbox=None,
     xml.set('service', 'WFS')
     xml.set('version', version)
 
+    if start_index is not None:
+        xml.set('startIndex', str(start_index))
+
+    if max_features is not None:
+        xml.set('maxFeatures', str(max_features))
+
+    if result_type is not None:
+        xml.set('resultType', result_type)
+
     xml.set('{http://www.w3.org/2001/XMLSchema-instance}schemaLocation',
             'http://www.opengis.net/wfs '
             'http://schemas.opengis.net/wfs/%s/wfs.xsd' % version)
@@ -521,27 +701,162 @@ def wfs_build_getfeature_request(typename, geometry_column=None, bbox=None,
         filter_parent.append(within)
 
     query.append(filter_xml)
+
+    if sort_by is not None:
+        sort_by_xml = etree.Element('{http://www.opengis.net/ogc}SortBy')
+        sort_property = etree.Element(
+            '{http://www.opengis.net/ogc}SortProperty')
+        sort_propertyname = etree.Element(
+            '{http://www.opengis.net/ogc}PropertyName')
+        sort_propertyname.text = sort_by
+        sort_property.append(sort_propertyname)
+        sort_order = etree.Element('{http://www.opengis.net/ogc}SortOrder')
+        sort_order.text = 'ASC'
+        sort_property.append(sort_order)
+        sort_by_xml.append(sort_property)
+        query.append(sort_by_xml)
+
     xml.append(query)
     return xml
 
 
-def wfs_get_feature(baseurl, get_feature_request):
+def wfs_get_feature(baseurl, get_feature_request, stream=False, timeout=120):
     """Perform a WFS request using POST.
 
+    The request is sent to the mirrors of the WFS service, as in
+    `pydov.util.net.failover`. The latency of a successful request is
+    recorded as 'wfs' in `pydov.util.net.record_latency`.
+
     Parameters
     ----------
     baseurl : str
         Base URL of the WFS service.
-    get_feature_request : etree.Element
-        XML element representing the WFS GetFeature request.
+    get_feature_request : etree.Element or bytes
+        XML element representing the WFS GetFeature request, or its
+        serialisation.
+    stream : bool, optional
+        Whether to return the response as a file-like object that is read
+        incrementally (True) or as bytes (False). Defaults to False.
+    timeout : int or float, optional
+        Timeout in seconds to wait for the server. Defaults to 120.
 
     Returns
     -------
-    bytes
+    bytes or file-like object
         Response of the WFS service.
 
     """
-    data = etree.tostring(get_feature_request)
-    request = requests.post(baseurl, data)
-    request.encoding = 'utf-8'
-    return request.text.encode('utf8')
+    if isinstance(get_feature_request, bytes):
+        data = get_feature_request
+    else:
+        data = etree.tostring(get_feature_request)
+    with Timer('getfeature') as timer:
+        start = time.time()
+        request = failover(baseurl, lambda url: get_session().post(
+            url, data, stream=stream, timeout=timeout))
+        request.raise_for_status()
+        record_latency('wfs', time.time() - start)
+
+        if stream:
+            request.raw.decode_content = True
+            return request.raw
+
+        request.encoding = 'utf-8'
+        content = request.text.encode('utf8')
+        timer.bytes = len(content)
+        return content
+
+
+def __iter_getfeature(events, response):
+    """Iterate over the parse events of a WFS GetFeature response, first
+    yielding the root element and then each feature element.
+
+    Each feature element is cleared and removed from the tree once the
+    next one is requested, and the response is closed when done. The time
+    spent reading and parsing the response is emitted as 'gml_parse'
+    event.
+
+    Parameters
+    ----------
+    events : iterator<tuple<str,etree.Element>>
+        Iterator of 'start' and 'end' parse events of the response.
+    response : file-like object
+        The response being parsed.
+
+    Yields
+    ------
+    etree.Element
+        The root element of the response (without its children), followed
+        by the XML element of each feature.
+
+    """
+    timer = Timer('gml_parse', features=0).start()
+    try:
+        event, root = next(events)
+        timer.pause()
+        yield root
+        timer.start()
+
+        depth = 1
+        feature_members = None
+        for event, element in events:
+            if event == 'start':
+                depth += 1
+                if depth == 2 and element.tag == \
+                        '{http://www.opengis.net/gml}featureMembers':
+                    feature_members = element
+            else:
+                if depth == 2:
+                    feature_members = None
+                elif depth == 3 and feature_members is not None:
+                    timer.features += 1
+                    timer.pause()
+                    yield element
+                    timer.start()
+                    element.clear()
+                    feature_members.remove(element)
+                depth -= 1
+    finally:
+        try:
+            timer.bytes = response.tell()
+        except (AttributeError, IOError, ValueError):
+            pass
+        if hasattr(response, 'close'):
+            response.close()
+        timer.stop()
+
+
+def wfs_parse_getfeature(response):
+    """Incrementally parse a WFS GetFeature response.
+
+    Only the root element is parsed when calling this function, the
+    features are parsed one by one when iterating over the result and
+    discarded afterwards. Peak memory usage is therefore independent of the
+    number of features in the response.
+
+    Parameters
+    ----------
+    response : bytes or str or file-like object
+        Response of the WFS service.
+
+    Returns
+    -------
+    root : etree.Element
+        The root element of the response, including its attributes (like
+        `numberOfFeatures`) but without its children.
+    features : generator<etree.Element>
+        Generator yielding the XML element of each feature in the
+        `gml:featureMembers` of the response. Each element is only valid
+        until the next one is requested. Close the generator to stop
+        reading the response early.
+
+    """
+    if not hasattr(response, 'read'):
+        if not isinstance(response, bytes):
+            response = response.encode('utf-8')
+        response = BytesIO(response)
+
+    events = etree.iterparse(response, events=('start', 'end'))
+    features = __iter_getfeature(events, response)
+    root = next(features)
+    return root, features
@@ -38,6 +38,9 @@ setup(
     # },
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        'async': ['aiohttp; python_version >= "3.5"']
+    },
     license="MIT license",
     zip_safe=False,
     keywords='pydov',
@@ -0,0 +1,8 @@
+"""Configuration of the test collection."""
+import sys
+
+collect_ignore = []
+
+if sys.version_info < (3, 5):
+    # The asynchronous search requires the async/await syntax.
+    collect_ignore.append('test_search_aio.py')
@@ -0,0 +1,377 @@
+"""Module grouping tests for the benchmarks.server module."""
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+from owslib.etree import etree
+from owslib.fes import (
+    FilterRequest,
+    Or,
+    PropertyIsEqualTo,
+)
+from owslib.wfs import WebFeatureService
+
+import pydov
+from benchmarks.server import StandInServer
+from pydov.search.abstract import AbstractSearch
+from pydov.search.boring import BoringSearch
+from pydov.types.boring import Boring
+from pydov.util import owsutil
+from pydov.util import net
+from pydov.util.net import get_url
+
+namespace = 'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Start a stand-in server for the duration of the test.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(pydov, 'cache', None)
+    with StandInServer() as server:
+        yield server
+
+
+def get_features(server, bbox=None, filter=None, **kwargs):
+    """Request features of the dov-pub:Boringen layer from the stand-in
+    server.
+
+    Parameters
+    ----------
+    server : StandInServer
+        The stand-in server.
+    bbox : tuple<float>, optional
+        Bounding box of the features.
+    filter : str, optional
+        OGC filter of the features.
+    kwargs : dict
+        Additional arguments of `owsutil.wfs_build_getfeature_request`.
+
+    Returns
+    -------
+    etree.Element
+        The GetFeature response.
+
+    """
+    request = owsutil.wfs_build_getfeature_request(
+        'dov-pub:Boringen', geometry_column='geom', bbox=bbox, filter=filter,
+        **kwargs)
+    return etree.fromstring(owsutil.wfs_get_feature(
+        baseurl=server.wfs_url, get_feature_request=request))
+
+
+class TestStandInServer(object):
+    """Class grouping tests for the benchmarks.server.StandInServer
+    class."""
+
+    def test_metadata(self, server):
+        """Test the capabilities and CSW metadata of the stand-in server.
+
+        Test whether the metadata and feature catalogue of a layer are
+        requested from the stand-in server.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        wfs = WebFeatureService(server.wfs_url, version='1.1.0')
+        layer = wfs.contents['dov-pub:Boringen']
+        assert len(server.requests) > 0
+        assert all(r[0] == 'wfs' for r in server.requests)
+        capabilities = len(server.requests)
+
+        csw_url = owsutil.get_csw_base_url(layer)
+        assert csw_url.startswith(server.url)
+
+        md = owsutil.get_remote_metadata(layer)
+        fc = owsutil.get_remote_featurecatalogue(
+            csw_url, owsutil.get_featurecatalogue_uuid(md))
+        assert 'fiche' in fc['attributes']
+
+        assert owsutil.get_namespace(wfs, 'dov-pub:Boringen') == namespace
+        assert [r[0] for r in server.requests[capabilities:]].count(
+            'csw') == 2
+        assert all(r[0] in ('wfs', 'csw') for r in server.requests)
+
+    def test_get_feature_bbox(self, server):
+        """Test the GetFeature requests with a bounding box.
+
+        Test whether the features on the grid inside the bounding box are
+        synthesized, and whether the number of hits and paging are
+        supported.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        bbox = (150000, 210000, 155000, 212000)
+        boringen = list(Boring.from_wfs(get_features(server, bbox), namespace))
+
+        assert len(boringen) == 18
+        assert len(set(b.pkey for b in boringen)) == 18
+        for boring in boringen:
+            assert boring.pkey.startswith(server.url + '/data/boring/')
+            assert 150000 <= float(boring.data['x']) <= 155000
+            assert 210000 <= float(boring.data['y']) <= 212000
+
+        hits = get_features(server, bbox, result_type='hits')
+        assert hits.get('numberOfFeatures') == '18'
+
+        page = list(Boring.from_wfs(get_features(
+            server, bbox, start_index=5, max_features=10), namespace))
+        assert [b.pkey for b in page] == [b.pkey for b in boringen[5:15]]
+
+    def test_get_feature_limit(self, server):
+        """Test the GetFeature requests with a large bounding box.
+
+        Test whether the number of features is limited like by the DOV
+        services, and whether the limit is advertised in the capabilities.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        server.max_features = 100
+        response = get_features(server, (0, 0, 300000, 300000))
+        assert response.get('numberOfFeatures') == '100'
+
+        wfs = WebFeatureService(url=server.wfs_url, version='1.1.0')
+        assert owsutil.get_max_features(wfs) == 100
+
+    def test_get_feature_pkeys(self, server):
+        """Test the GetFeature requests with a filter on permanent keys.
+
+        Test whether only the features with the given permanent keys are
+        returned.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        pkeys = [server.url + '/data/boring/100-200',
+                 server.url + '/data/boring/101-201']
+        filter_request = FilterRequest().setConstraint(Or([
+            PropertyIsEqualTo(propertyname='fiche', literal=pkey)
+            for pkey in pkeys]))
+
+        boringen = Boring.from_wfs(get_features(
+            server, filter=etree.tostring(filter_request)), namespace)
+        assert [b.pkey for b in boringen] == pkeys
+
+    def test_xml(self, server):
+        """Test the requests of the XML documents of the DOV objects.
+
+        Test whether the details of the synthesized features are resolved
+        using the stand-in server.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        boringen = list(Boring.from_wfs(get_features(
+            server, (150000, 210000, 151000, 211000)), namespace))
+
+        df = Boring.to_df(boringen)
+        assert len(df) > len(boringen)
+        assert set(df.pkey_boring) == set(b.pkey for b in boringen)
+        assert len([r for r in server.requests if r[0] == 'xml']) == 4
+
+    def test_search(self, server, monkeypatch):
+        """Test a search using the stand-in server as mirror of the WFS
+        service.
+
+        Test whether the search fails over from an unavailable mirror to
+        the stand-in server, and all requests are sent to the stand-in
+        server afterwards.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        unavailable = 'http://127.0.0.1:9/geoserver/wfs'
+        monkeypatch.setattr(pydov, 'wfs_urls', [unavailable, server.wfs_url])
+        monkeypatch.setattr(AbstractSearch, '_AbstractSearch__wfs', None)
+        net.reset_latency()
+
+        df = BoringSearch().search(location=(150000, 210000, 151000, 211000))
+
+        assert df.pkey_boring.nunique() == 4
+        assert set(r[0] for r in server.requests) == set(['wfs', 'csw', 'xml'])
+        assert net.get_mirror_urls(net.DOV_URLS['wfs'])[-1][0] == unavailable
+        net.reset_latency()
+
+    def test_search_paged_max_features(self, server, monkeypatch):
+        """Test a paged search using the stand-in server with a maxFeatures
+        limit below the page size of pydov.
+
+        Test whether the pages are limited to the maxFeatures limit and all
+        features are returned, like in a search splitting the location.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        server.max_features = 50
+        monkeypatch.setattr(pydov, 'wfs_urls', [server.wfs_url])
+        monkeypatch.setattr(AbstractSearch, '_AbstractSearch__wfs', None)
+        location = (150000, 210000, 160000, 220000)
+
+        paged = BoringSearch().search(
+            location=location, return_fields=('pkey_boring',), paged=True)
+        split = BoringSearch().search(
+            location=location, return_fields=('pkey_boring',),
+            split_location=True)
+
+        assert len(split) > 50
+        assert sorted(paged.pkey_boring) == sorted(split.pkey_boring)
+
+        estimate = BoringSearch().search(
+            location=location, return_fields=('pkey_boring',), paged=True,
+            dry_run=True)
+        assert estimate['wfs_requests'] == len(split) // 50 + 2
+
+    def test_search_paged_overlap(self, server, monkeypatch):
+        """Test a paged search using the stand-in server with latency and
+        the default number of workers.
+
+        Test whether the next pages are requested while the current one is
+        being parsed.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        server.max_features = 50
+        server.latency = {'wfs': 0.05}
+        monkeypatch.setattr(pydov, 'max_workers', 1)
+        monkeypatch.setattr(pydov, 'wfs_urls', [server.wfs_url])
+        monkeypatch.setattr(AbstractSearch, '_AbstractSearch__wfs', None)
+
+        lock = threading.Lock()
+        active = [0]
+        concurrent = []
+        wfs_get_feature = owsutil.wfs_get_feature
+
+        def counting_wfs_get_feature(*args, **kwargs):
+            with lock:
+                active[0] += 1
+                concurrent.append(active[0])
+            try:
+                return wfs_get_feature(*args, **kwargs)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        monkeypatch.setattr(owsutil, 'wfs_get_feature',
+                            counting_wfs_get_feature)
+
+        df = BoringSearch().search(
+            location=(150000, 210000, 160000, 220000),
+            return_fields=('pkey_boring',), paged=True)
+
+        assert len(df) > 100
+        assert max(concurrent) >= 2
+
+    def test_async_search_paged_max_features(self, server, monkeypatch):
+        """Test an asynchronous paged search using the stand-in server with
+        a maxFeatures limit below the page size of pydov.
+
+        Test whether all features are returned.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        pytest.importorskip('pydov.util.aio')
+        server.max_features = 50
+        monkeypatch.setattr(pydov, 'wfs_urls', [server.wfs_url])
+        monkeypatch.setattr(AbstractSearch, '_AbstractSearch__wfs', None)
+
+        loop = asyncio.new_event_loop()
+        try:
+            df = loop.run_until_complete(BoringSearch().async_search(
+                location=(150000, 210000, 160000, 220000),
+                return_fields=('pkey_boring',), paged=True))
+        finally:
+            loop.close()
+
+        assert df.pkey_boring.nunique() > 50
+
+    def test_failure_rate(self, server):
+        """Test the simulated failures of the stand-in server.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        server.failure_rate = {'xml': 1}
+
+        with pytest.raises(requests.HTTPError) as error:
+            get_url(server.url + '/data/boring/1-1.xml')
+        assert error.value.response.status_code == 503
+
+        get_url(server.wfs_url + '?request=GetCapabilities')
+
+    def test_max_concurrent(self, server):
+        """Test the simulated throttling of the stand-in server.
+
+        Test whether requests exceeding the maximum number of concurrent
+        requests are refused with HTTP status 429.
+
+        Parameters
+        ----------
+        server : pytest.fixture
+            The stand-in server.
+
+        """
+        server.max_concurrent = 1
+        server.latency = 0.5
+
+        slow = threading.Thread(
+            target=get_url, args=(server.url + '/data/boring/1-1.xml',))
+        slow.start()
+        while server._active == 0:
+            time.sleep(0.01)
+
+        with pytest.raises(requests.HTTPError) as error:
+            get_url(server.url + '/data/boring/1-2.xml')
+        assert error.value.response.status_code == 429
+
+        slow.join()
+        assert [r[3] for r in server.requests] == [429, 200]
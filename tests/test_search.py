@@ -4,11 +4,10 @@ import sys
 
 import pytest
 
-import owslib
-from owslib.etree import etree
 from owslib.wfs import WebFeatureService
 from pydov.search.boring import BoringSearch
 from pydov.search.grondwaterfilter import GrondwaterFilterSearch
+from pydov.util import owsutil
 
 from numpy.compat import unicode
 
@@ -31,16 +30,15 @@ def mp_wfs(monkeypatch):
         PyTest monkeypatch fixture.
 
     """
-    def read(*args, **kwargs):
+    def get_remote_capabilities(*args, **kwargs):
         with open('tests/data/util/owsutil/wfscapabilities.xml', 'r') as f:
             data = f.read()
             if type(data) is not bytes:
                 data = data.encode('utf-8')
-            data = etree.fromstring(data)
         return data
 
-    monkeypatch.setattr(
-        owslib.feature.common.WFSCapabilitiesReader, 'read', read)
+    monkeypatch.setattr('pydov.util.owsutil.get_remote_capabilities',
+                        get_remote_capabilities)
 
 
 @pytest.fixture
@@ -59,9 +57,10 @@ def wfs(mp_wfs):
         WebFeatureService based on the local GetCapabilities.
 
     """
+    url = "https://www.dov.vlaanderen.be/geoserver/wfs"
     return WebFeatureService(
-        url="https://www.dov.vlaanderen.be/geoserver/wfs",
-        version="1.1.0")
+        url=url, version="1.1.0",
+        xml=owsutil.get_remote_capabilities(url, "1.1.0"))
 
 
 @pytest.fixture
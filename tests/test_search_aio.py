@@ -0,0 +1,476 @@
+"""Module grouping tests for the asynchronous search methods."""
+import asyncio
+import datetime
+import threading
+
+import pytest
+
+import pydov
+from owslib.etree import etree
+from owslib.fes import PropertyIsEqualTo
+from owslib.iso import MD_Metadata
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from pydov.search.boring import BoringSearch
+from pydov.types.boring import Boring
+from pydov.util import owsutil
+
+from tests.test_search import (
+    mp_wfs,
+    wfs,
+)
+from tests.test_search_boring import (
+    mp_remote_describefeaturetype,
+    mp_remote_md,
+    mp_remote_fc,
+    mp_remote_wfs_feature,
+    mp_remote_wfs_feature_grid,
+    mp_dov_xml,
+)
+from tests.test_util_caching import reset_search_metadata
+
+aio = pytest.importorskip('pydov.util.aio')
+aiohttp = pytest.importorskip('aiohttp')
+
+
+def read_file(path):
+    """Read the file with the given path.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to read.
+
+    Returns
+    -------
+    bytes
+        The contents of the file.
+
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def mp_async_client(monkeypatch):
+    """Monkeypatch the requests of the asynchronous client to return the
+    local copies of the remote responses of the dov-pub:Boringen layer.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list<str>
+        List of the URLs that were requested.
+
+    """
+    requested = []
+
+    md = MD_Metadata(etree.fromstring(
+        read_file('tests/data/types/boring/md_metadata.xml')))
+    fc_uuid = owsutil.get_featurecatalogue_uuid(md)
+
+    def respond(url, post=False):
+        requested.append(url)
+
+        if post:
+            data = read_file('tests/data/types/boring/wfsgetfeature.xml')
+        elif 'getcapabilities' in url.lower():
+            data = read_file('tests/data/util/owsutil/wfscapabilities.xml')
+        elif 'describefeaturetype' in url.lower():
+            data = read_file(
+                'tests/data/types/boring/wfsdescribefeaturetype.xml')
+        elif url.endswith('.xml'):
+            data = read_file('tests/data/types/boring/boring.xml')
+        elif fc_uuid in url:
+            data = read_file('tests/data/types/boring/fc_featurecatalogue.xml')
+        else:
+            data = read_file('tests/data/types/boring/md_metadata.xml')
+        return data
+
+    async def get(self, url):
+        return respond(url)
+
+    async def post(self, url, data):
+        return respond(url, post=True)
+
+    monkeypatch.setattr(aio.AsyncClient, 'get', get)
+    monkeypatch.setattr(aio.AsyncClient, 'post', post)
+    return requested
+
+
+@pytest.fixture
+def mp_no_sync_requests(monkeypatch):
+    """Monkeypatch all synchronous requests to the DOV services to fail.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    def unavailable(*args, **kwargs):
+        raise IOError('synchronous request')
+
+    for function in ('get_remote_capabilities', 'get_namespace',
+                     'get_remote_metadata',
+                     'get_remote_featurecatalogue', 'wfs_get_feature'):
+        monkeypatch.setattr('pydov.util.owsutil.' + function, unavailable)
+    monkeypatch.setattr('pydov.search.abstract.get_remote_schema',
+                        unavailable)
+    monkeypatch.setattr('pydov.types.abstract.AbstractDovType._get_xml_data',
+                        unavailable)
+
+
+def run(coroutine):
+    """Run the given coroutine in a new event loop.
+
+    Parameters
+    ----------
+    coroutine : coroutine
+        The coroutine to run.
+
+    Returns
+    -------
+    object
+        The result of the coroutine.
+
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncSearch(object):
+    """Class grouping tests for the async_search methods."""
+
+    query = PropertyIsEqualTo(propertyname='boornummer',
+                              literal='GEO-04/169-BNo-B1')
+
+    def test_async_search(self, mp_wfs, mp_remote_describefeaturetype,
+                          mp_remote_md, mp_remote_fc, mp_remote_wfs_feature,
+                          mp_dov_xml, mp_async_client):
+        """Test the async_search method.
+
+        Test whether the result is the same as the result of the search
+        method.
+
+        """
+        expected = BoringSearch().search(query=self.query)
+        df = run(BoringSearch().async_search(query=self.query))
+
+        assert type(df) is DataFrame
+        assert_frame_equal(df, expected)
+
+    def test_async_search_no_sync_requests(self, monkeypatch,
+                                           mp_async_client,
+                                           mp_no_sync_requests):
+        """Test the async_search method in a fresh process.
+
+        Test whether all remote requests, including the metadata of the
+        search class, are performed asynchronously.
+
+        """
+        reset_search_metadata(monkeypatch)
+
+        df = run(BoringSearch().async_search(query=self.query))
+
+        assert len(df) > 0
+        assert not df.diepte_methode_van.isnull().all()
+        assert len([u for u in mp_async_client if u.endswith('.xml')]) == \
+            len(df.pkey_boring.unique())
+        assert any('getcapabilities' in u.lower() for u in mp_async_client)
+
+    def test_async_search_interleaved(self, mp_async_client,
+                                      mp_no_sync_requests):
+        """Test running several searches in the same event loop.
+
+        Test whether all searches give the same result.
+
+        """
+        async def search_all():
+            async with aio.AsyncClient() as client:
+                return await asyncio.gather(
+                    BoringSearch().async_search(
+                        query=self.query, client=client),
+                    BoringSearch().async_search(
+                        query=self.query, return_fields=('pkey_boring',),
+                        client=client),
+                    BoringSearch().async_search(
+                        query=self.query, client=client))
+
+        dfs = run(search_all())
+
+        assert_frame_equal(dfs[0], dfs[2])
+        assert list(dfs[1]) == ['pkey_boring']
+        assert len(dfs[1]) == len(dfs[0].pkey_boring.unique())
+
+    def test_async_search_metadata_cache(self, monkeypatch, tmpdir,
+                                         mp_async_client,
+                                         mp_no_sync_requests):
+        """Test the async_search method with a metadata cache.
+
+        Test whether the metadata is requested only once and reused
+        afterwards.
+
+        """
+        monkeypatch.setattr(pydov, 'metadata_cache',
+                            pydov.util.caching.MetadataCache(str(tmpdir)))
+
+        reset_search_metadata(monkeypatch)
+        run(BoringSearch().async_search(
+            query=self.query, return_fields=('pkey_boring',)))
+        requests_cold = len(mp_async_client)
+
+        reset_search_metadata(monkeypatch)
+        run(BoringSearch().async_search(
+            query=self.query, return_fields=('pkey_boring',)))
+
+        assert len(mp_async_client) - requests_cold == 1
+
+    def test_async_search_metadata_cache_executor(self, monkeypatch, tmpdir,
+                                                  mp_async_client,
+                                                  mp_no_sync_requests):
+        """Test the async_search method with a metadata cache.
+
+        Test whether the metadata cache is read and written outside the
+        thread of the event loop.
+
+        """
+        threads = []
+        cache = pydov.util.caching.MetadataCache(str(tmpdir))
+
+        def record(method):
+            def call(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return method(*args, **kwargs)
+            return call
+
+        for name in ('load', 'get', 'is_valid'):
+            monkeypatch.setattr(cache, name, record(getattr(cache, name)))
+        monkeypatch.setattr(pydov, 'metadata_cache', cache)
+
+        for i in range(2):
+            reset_search_metadata(monkeypatch)
+            run(BoringSearch().async_search(
+                query=self.query, return_fields=('pkey_boring',)))
+
+        assert len(threads) > 0
+        assert threading.current_thread() not in threads
+
+    def test_async_search_metadata_error(self, monkeypatch,
+                                         mp_async_client,
+                                         mp_no_sync_requests):
+        """Test the async_search method when a metadata request fails.
+
+        Test whether the error is raised, and not raised again by a
+        subsequent search once the metadata is available.
+
+        """
+        get = aio.AsyncClient.get
+
+        async def unavailable(self, url):
+            if 'describefeaturetype' in url.lower():
+                raise IOError('unavailable')
+            return await get(self, url)
+
+        reset_search_metadata(monkeypatch)
+        search = BoringSearch()
+
+        monkeypatch.setattr(aio.AsyncClient, 'get', unavailable)
+        with pytest.raises(IOError):
+            run(search.async_search(query=self.query))
+
+        monkeypatch.setattr(aio.AsyncClient, 'get', get)
+        df = run(search.async_search(
+            query=self.query, return_fields=('pkey_boring',)))
+        assert list(df) == ['pkey_boring']
+
+    def test_async_search_metadata_cache_expired(self, monkeypatch, tmpdir,
+                                                 mp_async_client,
+                                                 mp_no_sync_requests):
+        """Test the async_search method with expired snapshots in the
+        metadata cache.
+
+        Test whether the expired snapshots are used when the metadata
+        requests fail.
+
+        """
+        monkeypatch.setattr(pydov, 'metadata_cache',
+                            pydov.util.caching.MetadataCache(
+                                str(tmpdir), max_age=datetime.timedelta(0)))
+
+        reset_search_metadata(monkeypatch)
+        run(BoringSearch().async_search(
+            query=self.query, return_fields=('pkey_boring',)))
+
+        async def unavailable(self, url):
+            raise IOError('unavailable')
+
+        monkeypatch.setattr(aio.AsyncClient, 'get', unavailable)
+
+        reset_search_metadata(monkeypatch)
+        df = run(BoringSearch().async_search(
+            query=self.query, return_fields=('pkey_boring',)))
+        assert list(df) == ['pkey_boring']
+
+    @pytest.mark.parametrize('page_size,requests', [(100, 5), (19, 21)])
+    def test_async_search_paged(self, monkeypatch, mp_wfs,
+                                mp_remote_describefeaturetype, mp_remote_md,
+                                mp_remote_fc, mp_remote_wfs_feature_grid,
+                                mp_async_client, page_size, requests):
+        """Test the async_search method with a location returning too many
+        features, retrieving the features in pages.
+
+        Test whether all features are returned exactly once, and whether no
+        pages are requested beyond the number of matching features.
+
+        """
+        async def post(self, url, data):
+            return owsutil.wfs_get_feature(
+                baseurl=url, get_feature_request=data)
+
+        monkeypatch.setattr(aio.AsyncClient, 'post', post)
+        monkeypatch.setattr(BoringSearch, '_page_size', page_size)
+
+        df = run(BoringSearch().async_search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            paged=True, client=aio.AsyncClient(limit=3)))
+
+        assert len(df) == 19 * 19
+        assert not df.pkey_boring.duplicated().any()
+        assert df.x.min() == 1 and df.x.max() == 19
+        assert len(mp_remote_wfs_feature_grid) == requests
+
+    def test_get_dov_xml_coalesced(self, monkeypatch, mp_async_client):
+        """Test requesting the same XML data concurrently with the same
+        client.
+
+        Test whether concurrent requests share a single request.
+
+        """
+        monkeypatch.setattr(pydov, 'cache', None)
+
+        async def get_all():
+            async with aio.AsyncClient() as client:
+                await aio.get_dov_xml(client, 'https://example.com/1.xml')
+                return await asyncio.gather(*[
+                    aio.get_dov_xml(client, 'https://example.com/2.xml')
+                    for i in range(3)])
+
+        results = run(get_all())
+
+        assert results[0] == results[1] == results[2]
+        assert [u for u in mp_async_client if u.endswith('.xml')] == [
+            'https://example.com/1.xml', 'https://example.com/2.xml']
+
+    def test_resolve_xml_once(self, monkeypatch, mp_async_client):
+        """Test resolving the XML data of an instance asynchronously, first
+        for some of its fields and afterwards for all of them.
+
+        Test whether the XML document is requested only once.
+
+        """
+        monkeypatch.setattr(pydov, 'cache', None)
+        boring = Boring('https://www.dov.vlaanderen.be/data/boring/1')
+
+        async def resolve():
+            async with aio.AsyncClient() as client:
+                await pydov.search.aio._resolve_xml(
+                    client, boring, ('pkey_boring', 'boormethode'))
+                await pydov.search.aio._resolve_xml(client, boring, None)
+
+        run(resolve())
+
+        assert boring._is_xml_resolved()
+        assert [u for u in mp_async_client if u.endswith('.xml')] == [
+            'https://www.dov.vlaanderen.be/data/boring/1.xml']
+
+    def test_failover_server_error(self, monkeypatch):
+        """Test the failover of the asynchronous client when a mirror
+        returns a server error.
+
+        Test whether the request fails over to the next mirror, whether the
+        latency is only recorded for the successful response, and whether
+        client errors are raised without failing over.
+
+        """
+        mirrors = ['https://proxy.example.com/dov/data',
+                   'https://www.dov.vlaanderen.be/data']
+        monkeypatch.setattr(pydov, 'xml_urls', mirrors)
+        pydov.util.net.reset_latency()
+
+        def request(status):
+            async def get(url):
+                if url.startswith(mirrors[0]):
+                    raise aiohttp.ClientResponseError(None, (), status=status)
+                return b'<xml/>'
+            return get
+
+        async def failover(status):
+            async with aio.AsyncClient() as client:
+                return await client._failover(
+                    'https://www.dov.vlaanderen.be/data/boring/1.xml',
+                    request(status))
+
+        try:
+            assert run(failover(503)) == b'<xml/>'
+            assert pydov.util.net.get_mirror_latency(mirrors[0]) is None
+            assert pydov.util.net.get_mirror_latency(mirrors[1]) is not None
+
+            pydov.util.net.reset_latency()
+            with pytest.raises(aiohttp.ClientResponseError):
+                run(failover(404))
+        finally:
+            pydov.util.net.reset_latency()
+
+    def test_get_dov_xml_cache_executor(self, monkeypatch, tmpdir,
+                                        mp_async_client):
+        """Test requesting XML data with a cache.
+
+        Test whether the cache is read and written outside the thread of
+        the event loop.
+
+        """
+        threads = []
+        cache = pydov.util.caching.FileCache(cachedir=str(tmpdir))
+
+        def load(url):
+            threads.append(threading.current_thread())
+            return None
+
+        def save(url, data):
+            threads.append(threading.current_thread())
+
+        monkeypatch.setattr(cache, 'load', load)
+        monkeypatch.setattr(cache, 'save', save)
+        monkeypatch.setattr(pydov, 'cache', cache)
+
+        async def get():
+            async with aio.AsyncClient() as client:
+                return await aio.get_dov_xml(
+                    client, 'https://example.com/1.xml')
+
+        assert run(get()) is not None
+        assert len(threads) == 2
+        assert threading.current_thread() not in threads
+
+    def test_client_timeout(self):
+        """Test the timeout of the asynchronous client.
+
+        Test whether the timeout applies both to connecting and reading.
+
+        """
+        async def get_timeout():
+            async with aio.AsyncClient(timeout=5) as client:
+                return client._get_session().timeout
+
+        timeout = run(get_timeout())
+        assert timeout.sock_connect == 5
+        assert timeout.sock_read == 5
@@ -4,17 +4,25 @@ import sys
 
 import pytest
 from pandas import DataFrame
+from pandas.testing import assert_frame_equal
 
 import pydov
 from owslib.etree import etree
-from owslib.fes import PropertyIsEqualTo
+from owslib.fes import (
+    Or,
+    PropertyIsEqualTo,
+)
+from pydov.search.abstract import AbstractSearch
 from pydov.search.boring import BoringSearch
 from pydov.types.boring import Boring
 from pydov.util import owsutil
+from pydov.util.caching import LRUCache
 from pydov.util.errors import (
+    FeatureOverflowError,
     InvalidSearchParameterError,
     InvalidFieldError,
 )
+from pydov.util.instrumentation import StatsCollector
 from tests.abstract import AbstractTestSearch
 
 from tests.test_search import (
@@ -174,6 +182,156 @@ def mp_remote_wfs_feature(monkeypatch):
             __get_remote_wfs_feature)
 
 
+@pytest.fixture
+def mp_remote_wfs_feature_grid(monkeypatch):
+    """Monkeypatch the call to get WFS features, simulating a layer with a
+    borehole at each integer coordinate between 0 and 20.
+
+    Requests for a bounding box containing more than 150 boreholes are
+    answered as if they reached the maxFeatures limit of the WFS server,
+    unless they request a page of the features using startIndex or only the
+    number of features using resultType=hits.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list<tuple<minx,miny,maxx,maxy>>
+        List of the requested bounding boxes.
+
+    """
+    requested = []
+
+    def __get_remote_wfs_feature(*args, **kwargs):
+        request = etree.fromstring(kwargs['get_feature_request'])
+        lower = request.findtext('.//{http://www.opengis.net/gml}lowerCorner')
+        upper = request.findtext('.//{http://www.opengis.net/gml}upperCorner')
+        bbox = [float(i) for i in (lower + ' ' + upper).split()]
+        requested.append(tuple(bbox))
+
+        features = []
+        for x in range(21):
+            for y in range(21):
+                if bbox[0] < x < bbox[2] and bbox[1] < y < bbox[3]:
+                    features.append(
+                        '<dov-pub:Boringen><dov-pub:fiche>'
+                        'https://www.dov.vlaanderen.be/data/boring/%i-%i'
+                        '</dov-pub:fiche><dov-pub:X_mL72>%i</dov-pub:X_mL72>'
+                        '<dov-pub:Y_mL72>%i</dov-pub:Y_mL72>'
+                        '</dov-pub:Boringen>' % (x, y, x, y))
+
+        if request.get('resultType') == 'hits':
+            count = len(features)
+            features = []
+        elif request.get('startIndex') is not None:
+            assert request.findtext(
+                './/{http://www.opengis.net/ogc}SortBy//'
+                '{http://www.opengis.net/ogc}PropertyName') == 'fiche'
+            start_index = int(request.get('startIndex'))
+            features = sorted(features)[
+                start_index:start_index + int(request.get('maxFeatures'))]
+            count = len(features)
+        elif len(features) > 150:
+            features = features[:150]
+            count = 10000
+        else:
+            count = len(features)
+
+        return ('<wfs:FeatureCollection '
+                'xmlns:wfs="http://www.opengis.net/wfs" '
+                'xmlns:gml="http://www.opengis.net/gml" '
+                'xmlns:dov-pub="http://dov.vlaanderen.be/ocdov/dov-pub" '
+                'numberOfFeatures="%i"><gml:featureMembers>%s'
+                '</gml:featureMembers></wfs:FeatureCollection>' % (
+                    count, ''.join(features))).encode('utf-8')
+
+    monkeypatch.setattr(
+        'pydov.util.owsutil.wfs_get_feature',
+        __get_remote_wfs_feature)
+    return requested
+
+
+@pytest.fixture
+def mp_remote_wfs_feature_pkeys(monkeypatch):
+    """Monkeypatch the call to get WFS features, returning a borehole for
+    each permanent key in the filter (in reverse order), except for
+    permanent keys ending in 'missing'.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list<list<str>>
+        List of the permanent keys in the filter of each request.
+
+    """
+    requested = []
+
+    def __get_remote_wfs_feature(*args, **kwargs):
+        request = etree.fromstring(kwargs['get_feature_request'])
+        assert set(p.text for p in request.findall(
+            './/{http://www.opengis.net/ogc}PropertyName')) == {'fiche'}
+
+        pkeys = [literal.text for literal in request.findall(
+            './/{http://www.opengis.net/ogc}Literal')]
+        requested.append(pkeys)
+
+        features = ''.join(
+            '<dov-pub:Boringen><dov-pub:fiche>%s</dov-pub:fiche>'
+            '</dov-pub:Boringen>' % pkey for pkey in reversed(pkeys)
+            if not pkey.endswith('missing'))
+
+        return ('<wfs:FeatureCollection '
+                'xmlns:wfs="http://www.opengis.net/wfs" '
+                'xmlns:gml="http://www.opengis.net/gml" '
+                'xmlns:dov-pub="http://dov.vlaanderen.be/ocdov/dov-pub" '
+                'numberOfFeatures="%i"><gml:featureMembers>%s'
+                '</gml:featureMembers></wfs:FeatureCollection>' % (
+                    len(pkeys), features)).encode('utf-8')
+
+    monkeypatch.setattr(
+        'pydov.util.owsutil.wfs_get_feature',
+        __get_remote_wfs_feature)
+    return requested
+
+
+@pytest.fixture
+def mp_remote_wfs_feature_hits(monkeypatch):
+    """Monkeypatch the call to get WFS features, answering each request as
+    if 12345 features were matching.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list<etree.Element>
+        List of the requests.
+
+    """
+    requested = []
+
+    def __get_remote_wfs_feature(*args, **kwargs):
+        requested.append(etree.fromstring(kwargs['get_feature_request']))
+        return ('<wfs:FeatureCollection '
+                'xmlns:wfs="http://www.opengis.net/wfs" '
+                'numberOfFeatures="12345" '
+                'timeStamp="2018-01-01T00:00:00.000Z"/>').encode('utf-8')
+
+    monkeypatch.setattr(
+        'pydov.util.owsutil.wfs_get_feature',
+        __get_remote_wfs_feature)
+    return requested
+
+
 @pytest.fixture
 def mp_dov_xml(monkeypatch):
     """Monkeypatch the call to get the remote Boring XML data.
@@ -530,3 +688,824 @@ class TestBoringSearch(AbstractTestSearch):
 
         assert list(df) == ['pkey_boring', 'boornummer', 'boorgatmeting']
         assert not df.boorgatmeting[0]
+
+    @pytest.mark.parametrize('return_fields,parsed', [
+        (('pkey_boring', 'boorgatmeting'), True),
+        (('pkey_boring', 'boornummer'), False)])
+    def test_search_iter_wfs_parsed(self, monkeypatch, mp_wfs,
+                                    mp_remote_describefeaturetype,
+                                    mp_remote_md, mp_remote_fc,
+                                    mp_remote_wfs_feature, mp_dov_xml,
+                                    boringsearch, return_fields, parsed):
+        """Test the search_iter method with and without return fields from
+        XML.
+
+        Test whether the WFS response is parsed completely before the XML
+        documents are resolved, and parsed as the output is built
+        otherwise.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+        return_fields : tuple<str>
+            The fields to return.
+        parsed : bool
+            Whether the WFS response should be parsed before the output is
+            built.
+
+        """
+        wfs_parse_getfeature = owsutil.wfs_parse_getfeature
+        done = []
+
+        def parse_getfeature(response):
+            tree, features = wfs_parse_getfeature(response)
+
+            def iter_features():
+                for feature in features:
+                    yield feature
+                done.append(True)
+            return tree, iter_features()
+
+        monkeypatch.setattr(owsutil, 'wfs_parse_getfeature',
+                            parse_getfeature)
+
+        query = PropertyIsEqualTo(propertyname='boornummer',
+                                  literal='GEO-04/169-BNo-B1')
+        chunks = boringsearch.search_iter(query=query,
+                                          return_fields=return_fields)
+
+        assert (len(done) == 1) == parsed
+        assert len(next(chunks)) == 1
+        assert len(done) == 1
+
+    @pytest.mark.parametrize('kwargs', [
+        {'split_location': True}, {'paged': True}])
+    def test_search_iter_error(self, monkeypatch, mp_wfs,
+                               mp_remote_describefeaturetype, mp_remote_md,
+                               mp_remote_fc, boringsearch, kwargs):
+        """Test the search_iter method when the GetFeature request fails,
+        splitting the location or retrieving the features in pages.
+
+        Test whether the error is raised when calling search_iter, before
+        iterating over the result.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+        kwargs : dict
+            Keyword arguments of the search.
+
+        """
+        def __get_remote_wfs_feature(*args, **kwargs):
+            raise IOError('computer says no')
+
+        monkeypatch.setattr('pydov.util.owsutil.wfs_get_feature',
+                            __get_remote_wfs_feature)
+
+        with pytest.raises(IOError):
+            boringsearch.search_iter(location=(0, 0, 20, 20),
+                                     return_fields=('pkey_boring', 'x'),
+                                     **kwargs)
+
+    def test_search_instrument(self, mp_wfs, mp_remote_describefeaturetype,
+                               mp_remote_md, mp_remote_fc,
+                               mp_remote_wfs_feature, mp_dov_xml,
+                               boringsearch):
+        """Test the search method with an instrument added to the search.
+
+        Test whether the instrument receives the events of the phases of
+        the search, and the instruments of other searches do not.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        stats = StatsCollector()
+        other = StatsCollector()
+        boringsearch.add_instrument(stats)
+        BoringSearch().add_instrument(other)
+
+        query = PropertyIsEqualTo(propertyname='boornummer',
+                                  literal='GEO-04/169-BNo-B1')
+        df = boringsearch.search(query=query,
+                                 return_fields=('pkey_boring', 'boornummer',
+                                                'boorgatmeting'))
+
+        summary = stats.summary()
+        for phase in ('gml_parse', 'xml_fetch', 'xml_parse', 'dataframe',
+                      'search'):
+            assert summary.loc[phase, 'count'] == 1
+        assert summary.loc['gml_parse', 'features'] == 1
+        assert summary.loc['xml_parse', 'bytes'] > 0
+        assert summary.loc['search', 'features'] == len(df)
+        assert len(other.summary()) == 0
+
+        boringsearch.remove_instrument(stats)
+        stats.reset()
+        boringsearch.search(query=query)
+        assert len(stats.summary()) == 0
+
+    def test_search_location_overflow(self, mp_wfs,
+                                      mp_remote_describefeaturetype,
+                                      mp_remote_md, mp_remote_fc,
+                                      mp_remote_wfs_feature_grid,
+                                      boringsearch):
+        """Test the search method with a location returning too many
+        features.
+
+        Test whether a FeatureOverflowError is raised.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_grid : pytest.fixture
+            Monkeypatch the call to get WFS features from a grid of
+            boreholes.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        with pytest.raises(FeatureOverflowError):
+            boringsearch.search(location=(0, 0, 20, 20),
+                                return_fields=('pkey_boring', 'x', 'y'))
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    def test_search_location_split(self, monkeypatch, mp_wfs,
+                                   mp_remote_describefeaturetype,
+                                   mp_remote_md, mp_remote_fc,
+                                   mp_remote_wfs_feature_grid, boringsearch,
+                                   max_workers):
+        """Test the search method with a location returning too many
+        features, splitting up the location.
+
+        Test whether all features are returned exactly once, including those
+        on the edges between the parts of the location.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_grid : pytest.fixture
+            Monkeypatch the call to get WFS features from a grid of
+            boreholes.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+        max_workers : int
+            Number of threads to use for the requests.
+
+        """
+        monkeypatch.setattr(pydov, 'max_workers', max_workers)
+
+        df = boringsearch.search(location=(0, 0, 20, 20),
+                                 return_fields=('pkey_boring', 'x', 'y'),
+                                 split_location=True)
+
+        assert len(df) == 19 * 19
+        assert not df.pkey_boring.duplicated().any()
+        assert df.x.min() == 1 and df.x.max() == 19
+        assert df.y.min() == 1 and df.y.max() == 19
+        assert len(mp_remote_wfs_feature_grid) == 5
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    @pytest.mark.parametrize('page_size,requests', [(100, 5), (19, 21)])
+    def test_search_location_paged(self, monkeypatch, mp_wfs,
+                                   mp_remote_describefeaturetype,
+                                   mp_remote_md, mp_remote_fc,
+                                   mp_remote_wfs_feature_grid, boringsearch,
+                                   max_workers, page_size, requests):
+        """Test the search method with a location returning too many
+        features, retrieving the features in pages.
+
+        Test whether all features are returned exactly once, both when the
+        last page is partially filled and when it is full, and whether no
+        pages are requested beyond the number of matching features.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_grid : pytest.fixture
+            Monkeypatch the call to get WFS features from a grid of
+            boreholes.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+        max_workers : int
+            Number of threads to use for the requests.
+        page_size : int
+            Number of features in each page.
+        requests : int
+            Expected number of GetFeature requests, including the request
+            for the number of features and an empty page after a full last
+            page.
+
+        """
+        monkeypatch.setattr(pydov, 'max_workers', max_workers)
+        monkeypatch.setattr(BoringSearch, '_page_size', page_size)
+
+        df = boringsearch.search(location=(0, 0, 20, 20),
+                                 return_fields=('pkey_boring', 'x', 'y'),
+                                 paged=True)
+
+        assert len(df) == 19 * 19
+        assert not df.pkey_boring.duplicated().any()
+        assert df.x.min() == 1 and df.x.max() == 19
+        assert df.y.min() == 1 and df.y.max() == 19
+        assert len(mp_remote_wfs_feature_grid) == requests
+
+    def test_search_location_paged_single_page(
+            self, mp_wfs, mp_remote_describefeaturetype, mp_remote_md,
+            mp_remote_fc, mp_remote_wfs_feature_grid, boringsearch):
+        """Test the search method with a location returning less features
+        than the page size, retrieving the features in pages.
+
+        Test whether a single request is performed.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_grid : pytest.fixture
+            Monkeypatch the call to get WFS features from a grid of
+            boreholes.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        df = boringsearch.search(location=(0, 0, 20, 20),
+                                 return_fields=('pkey_boring', 'x', 'y'),
+                                 paged=True)
+
+        assert len(df) == 19 * 19
+        assert len(mp_remote_wfs_feature_grid) == 1
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    def test_search_by_pkeys(self, monkeypatch, mp_wfs,
+                             mp_remote_describefeaturetype, mp_remote_md,
+                             mp_remote_fc, mp_remote_wfs_feature_pkeys,
+                             boringsearch, max_workers):
+        """Test the search_by_pkeys method.
+
+        Test whether the permanent keys are searched in chunks, and whether
+        the result is in the order of the given permanent keys.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_pkeys : pytest.fixture
+            Monkeypatch the call to get WFS features for a list of
+            permanent keys.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+        max_workers : int
+            Number of threads to use for the requests.
+
+        """
+        monkeypatch.setattr(pydov, 'max_workers', max_workers)
+        monkeypatch.setattr(BoringSearch, '_pkeys_chunksize', 3)
+
+        base = 'https://www.dov.vlaanderen.be/data/boring/'
+        pkeys = [base + i for i in (
+            '5', '3', 'missing', '9', '1', '3', '7', '2', '8')]
+
+        df = boringsearch.search_by_pkeys(pkeys,
+                                          return_fields=('pkey_boring',))
+
+        assert list(df.pkey_boring) == [base + i for i in (
+            '5', '3', '9', '1', '7', '2', '8')]
+        assert len(mp_remote_wfs_feature_pkeys) == 3
+        assert sorted(len(r) for r in mp_remote_wfs_feature_pkeys) == \
+            [2, 3, 3]
+
+    def test_search_by_pkeys_not_compiled(self, monkeypatch, mp_wfs,
+                                          mp_remote_describefeaturetype,
+                                          mp_remote_md, mp_remote_fc,
+                                          mp_remote_wfs_feature_pkeys,
+                                          boringsearch):
+        """Test the search_by_pkeys method.
+
+        Test whether the one-off searches of the chunks of permanent keys
+        are not kept in the caches of validated searches and requests.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_pkeys : pytest.fixture
+            Monkeypatch the call to get WFS features for a list of
+            permanent keys.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        monkeypatch.setattr(AbstractSearch, '_compiled_searches', LRUCache())
+        monkeypatch.setattr(AbstractSearch, '_compiled_requests', LRUCache())
+        monkeypatch.setattr(BoringSearch, '_pkeys_chunksize', 3)
+
+        base = 'https://www.dov.vlaanderen.be/data/boring/'
+        boringsearch.search_by_pkeys([base + str(i) for i in range(10)],
+                                     return_fields=('pkey_boring',))
+
+        assert len(mp_remote_wfs_feature_pkeys) == 4
+        assert len(AbstractSearch._compiled_searches) == 0
+        assert len(AbstractSearch._compiled_requests) == 0
+
+    def test_search_by_pkeys_single(self, mp_wfs,
+                                    mp_remote_describefeaturetype,
+                                    mp_remote_md, mp_remote_fc,
+                                    mp_remote_wfs_feature_pkeys,
+                                    boringsearch):
+        """Test the search_by_pkeys method with a single permanent key.
+
+        Test whether the permanent key is searched without Or-filter.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_pkeys : pytest.fixture
+            Monkeypatch the call to get WFS features for a list of
+            permanent keys.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        pkey = 'https://www.dov.vlaanderen.be/data/boring/1'
+        df = boringsearch.search_by_pkeys((pkey,),
+                                          return_fields=('pkey_boring',))
+
+        assert list(df.pkey_boring) == [pkey]
+        assert mp_remote_wfs_feature_pkeys == [[pkey]]
+
+    def test_search_by_pkeys_wrongtype(self, boringsearch):
+        """Test the search_by_pkeys method with a single string instead of a
+        list of permanent keys.
+
+        Test whether an InvalidSearchParameterError is raised.
+
+        Parameters
+        ----------
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        with pytest.raises(InvalidSearchParameterError):
+            boringsearch.search_by_pkeys(
+                'https://www.dov.vlaanderen.be/data/boring/1')
+
+    def test_search_compiled_request(self, monkeypatch, mp_wfs,
+                                     mp_remote_describefeaturetype,
+                                     mp_remote_md, mp_remote_fc,
+                                     mp_remote_wfs_feature, boringsearch):
+        """Test whether the GetFeature request of a repeated search is
+        reused, for equal queries and return fields in any order.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        monkeypatch.setattr(AbstractSearch, '_compiled_searches', LRUCache())
+        monkeypatch.setattr(AbstractSearch, '_compiled_requests', LRUCache())
+
+        built = []
+        build_request = owsutil.wfs_build_getfeature_request
+
+        def counting_build_request(*args, **kwargs):
+            built.append(kwargs)
+            return build_request(*args, **kwargs)
+
+        monkeypatch.setattr(owsutil, 'wfs_build_getfeature_request',
+                            counting_build_request)
+
+        requests = []
+        get_feature = owsutil.wfs_get_feature
+
+        def recording_get_feature(*args, **kwargs):
+            requests.append(kwargs['get_feature_request'])
+            return get_feature(*args, **kwargs)
+
+        monkeypatch.setattr(owsutil, 'wfs_get_feature',
+                            recording_get_feature)
+
+        def search(return_fields):
+            return boringsearch.search(
+                location=(0, 0, 10, 10),
+                query=PropertyIsEqualTo(propertyname='boornummer',
+                                        literal='GEO-04/169-BNo-B1'),
+                return_fields=return_fields)
+
+        df = search(('pkey_boring', 'boornummer'))
+        assert_frame_equal(search(['boornummer', 'pkey_boring']), df)
+
+        assert len(built) == 1
+        assert len(AbstractSearch._compiled_searches) == 1
+        assert len(AbstractSearch._compiled_requests) == 1
+        assert requests[0] is requests[1]
+
+        search(('pkey_boring',))
+        assert len(built) == 2
+
+    def test_search_remote_wfs_feature(self, monkeypatch, mp_wfs,
+                                       mp_remote_describefeaturetype,
+                                       mp_remote_md, mp_remote_fc,
+                                       mp_remote_wfs_feature, boringsearch):
+        """Test whether the features of a search are requested with the
+        _get_remote_wfs_feature method.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        requested = []
+        get_remote_wfs_feature = AbstractSearch._get_remote_wfs_feature
+
+        def recording_get_remote_wfs_feature(**kwargs):
+            requested.append(kwargs['typename'])
+            return get_remote_wfs_feature(**kwargs)
+
+        monkeypatch.setattr(AbstractSearch, '_get_remote_wfs_feature',
+                            staticmethod(recording_get_remote_wfs_feature))
+
+        df = boringsearch.search(location=(0, 0, 10, 10),
+                                 return_fields=('pkey_boring',))
+
+        assert len(df) > 0
+        assert requested == ['dov-pub:Boringen']
+
+    def test_search_key(self, boringsearch):
+        """Test the keys of searches in the cache of validated searches.
+
+        Test whether equal queries have the same key, and queries with
+        other values or types of values a different one.
+
+        Parameters
+        ----------
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        def key(*queries):
+            query = queries[0] if len(queries) == 1 else Or(list(queries))
+            return boringsearch._get_search_key(query=query)
+
+        assert key(PropertyIsEqualTo('diepte_boring_tot', '1'),
+                   PropertyIsEqualTo('boornummer', 'a')) == \
+            key(PropertyIsEqualTo('diepte_boring_tot', '1'),
+                PropertyIsEqualTo('boornummer', 'a'))
+        assert key(PropertyIsEqualTo('diepte_boring_tot', '1')) != \
+            key(PropertyIsEqualTo('diepte_boring_tot', 1))
+        assert key(PropertyIsEqualTo('diepte_boring_tot', 1)) != \
+            key(PropertyIsEqualTo('diepte_boring_tot', 1.0))
+        assert key(PropertyIsEqualTo('boornummer', 'a')) != \
+            key(PropertyIsEqualTo('boornummer', 'b'))
+
+    def test_search_dry_run(self, monkeypatch, mp_wfs,
+                            mp_remote_describefeaturetype, mp_remote_md,
+                            mp_remote_fc, mp_remote_wfs_feature_hits,
+                            boringsearch):
+        """Test the search method in dry run mode.
+
+        Test whether only the number of features is requested, and whether
+        the cost of the search is estimated correctly.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_hits : pytest.fixture
+            Monkeypatch the call to get WFS features, returning the number
+            of features only.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        latency = {'wfs': 2.0, 'xml': 0.5}
+        monkeypatch.setattr('pydov.search.abstract.get_latency',
+                            lambda kind: latency.get(kind))
+        monkeypatch.setattr(pydov, 'max_workers', 4)
+
+        estimate = boringsearch.search(location=(0, 0, 20, 20),
+                                       dry_run=True)
+
+        assert len(mp_remote_wfs_feature_hits) == 1
+        assert mp_remote_wfs_feature_hits[0].get('resultType') == 'hits'
+        assert estimate == {
+            'features': 12345,
+            'overflow': True,
+            'wfs_requests': 1,
+            'xml_documents': 12345,
+            'estimated_time': 2.0 + 3087 * 0.5
+        }
+
+        estimate = boringsearch.search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            paged=True, dry_run=True)
+
+        assert estimate == {
+            'features': 12345,
+            'overflow': False,
+            'wfs_requests': 4,
+            'xml_documents': 0,
+            'estimated_time': 4 * 2.0
+        }
+
+        del latency['xml']
+        estimate = boringsearch.search(location=(0, 0, 20, 20),
+                                       dry_run=True)
+        assert estimate['estimated_time'] is None
+
+        estimate = boringsearch.search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            dry_run=True)
+        assert estimate['estimated_time'] == 2.0
+
+        monkeypatch.setattr('pydov.util.owsutil.get_max_features',
+                            lambda wfs: 20000)
+        estimate = boringsearch.search(location=(0, 0, 20, 20),
+                                       dry_run=True)
+        assert estimate['overflow'] is False
+
+    def test_search_dry_run_split_location(self, monkeypatch, mp_wfs,
+                                           mp_remote_describefeaturetype,
+                                           mp_remote_md, mp_remote_fc,
+                                           mp_remote_wfs_feature_hits,
+                                           boringsearch):
+        """Test the search method in dry run mode, splitting up the
+        location.
+
+        Test whether the number of GetFeature requests of the split
+        locations is estimated from the number of features and the
+        maxFeatures limit of the WFS server.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_hits : pytest.fixture
+            Monkeypatch the call to get WFS features, returning the number
+            of features only.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        monkeypatch.setattr('pydov.search.abstract.get_latency',
+                            lambda kind: 2.0)
+
+        estimate = boringsearch.search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            split_location=True, dry_run=True)
+        assert estimate['overflow'] is True
+        assert estimate['wfs_requests'] == 1 + 4
+        assert estimate['estimated_time'] == 5 * 2.0
+
+        monkeypatch.setattr('pydov.util.owsutil.get_max_features',
+                            lambda wfs: 3000)
+        estimate = boringsearch.search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            split_location=True, dry_run=True)
+        assert estimate['wfs_requests'] == 1 + 4 + 16
+
+        monkeypatch.setattr(boringsearch, '_split_max_depth', 1)
+        estimate = boringsearch.search(
+            location=(0, 0, 20, 20), return_fields=('pkey_boring', 'x', 'y'),
+            split_location=True, dry_run=True)
+        assert estimate['wfs_requests'] == 1 + 4
+
+        estimate = boringsearch.search(
+            query=PropertyIsEqualTo('boornummer', 'a'),
+            return_fields=('pkey_boring', 'x', 'y'),
+            split_location=True, dry_run=True)
+        assert estimate['wfs_requests'] == 1
+
+    def test_search_location_split_maxdepth(self, monkeypatch, mp_wfs,
+                                            mp_remote_describefeaturetype,
+                                            mp_remote_md, mp_remote_fc,
+                                            mp_remote_wfs_feature_grid,
+                                            boringsearch):
+        """Test the search method with a location returning too many
+        features, splitting up the location less than needed.
+
+        Test whether a FeatureOverflowError is raised.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            dov-pub:Boringen layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            dov-pub:Boringen layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            dov-pub:Boringen layer.
+        mp_remote_wfs_feature_grid : pytest.fixture
+            Monkeypatch the call to get WFS features from a grid of
+            boreholes.
+        boringsearch : pytest.fixture returning pydov.search.BoringSearch
+            An instance of BoringSearch to perform search operations on the DOV
+            type 'Boring'.
+
+        """
+        monkeypatch.setattr(BoringSearch, '_split_max_depth', 0)
+
+        with pytest.raises(FeatureOverflowError):
+            boringsearch.search(location=(0, 0, 20, 20),
+                                return_fields=('pkey_boring', 'x', 'y'),
+                                split_location=True)
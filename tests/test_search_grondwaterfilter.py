@@ -3,6 +3,7 @@ import sys
 import datetime
 
 import pytest
+import pandas as pd
 from pandas import DataFrame
 
 import pydov
@@ -10,7 +11,10 @@ from owslib.etree import etree
 from owslib.fes import PropertyIsEqualTo
 from pydov.search.grondwaterfilter import GrondwaterFilterSearch
 from pydov.types.grondwaterfilter import GrondwaterFilter
-from pydov.util.errors import InvalidFieldError
+from pydov.util.errors import (
+    InvalidFieldError,
+    InvalidSearchParameterError,
+)
 from tests.abstract import AbstractTestSearch
 
 from tests.test_search import (
@@ -350,6 +354,103 @@ class TestGrondwaterFilterSearch(AbstractTestSearch):
         # specific test for the Zulu time wfs 1.1.0 issue
         assert df.datum.sort_values()[0] == datetime.date(2004, 4, 7)
 
+    def test_search_normalized(self, mp_wfs, mp_remote_describefeaturetype,
+                               mp_remote_md, mp_remote_fc,
+                               mp_remote_wfs_feature, mp_dov_xml,
+                               grondwaterfiltersearch):
+        """Test the search method with normalized output.
+
+        Test whether the fields of the GrondwaterFilter are only included
+        once, and whether joining both dataframes gives the output of the
+        regular search.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        grondwaterfiltersearch : pytest.fixture returning
+            pydov.search.GrondwaterFilterSearch
+            An instance of GrondwaterFilterSearch to perform search operations
+            on the DOV type 'GrondwaterFilter'.
+
+        """
+        query = PropertyIsEqualTo(propertyname='filterfiche',
+                                  literal='https://www.dov.vlaanderen.be/'
+                                          'data/filter/2003-004471')
+        df, df_sub = grondwaterfiltersearch.search(query=query,
+                                                   normalized=True)
+
+        assert len(df) == 1
+        assert list(df) == GrondwaterFilter.get_field_names(
+            include_subtypes=False)
+        assert list(df_sub) == ['pkey_filter', 'datum', 'tijdstip',
+                                'peil_mtaw', 'betrouwbaarheid', 'methode']
+        assert len(df_sub) > 1
+        assert (df_sub.pkey_filter == df.pkey_filter[0]).all()
+
+        pd.testing.assert_frame_equal(
+            GrondwaterFilter.denormalize(df, df_sub),
+            grondwaterfiltersearch.search(query=query))
+
+    def test_search_normalized_returnfields(self, mp_remote_wfs_feature,
+                                            mp_dov_xml,
+                                            grondwaterfiltersearch):
+        """Test the search method with normalized output and a selection of
+        return fields without the permanent key.
+
+        Test whether the permanent key is included in both dataframes, and
+        whether joining both dataframes gives the output of the regular
+        search.
+
+        Parameters
+        ----------
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        grondwaterfiltersearch : pytest.fixture returning
+            pydov.search.GrondwaterFilterSearch
+            An instance of GrondwaterFilterSearch to perform search operations
+            on the DOV type 'GrondwaterFilter'.
+
+        """
+        query = PropertyIsEqualTo(propertyname='filterfiche',
+                                  literal='https://www.dov.vlaanderen.be/'
+                                          'data/filter/2003-004471')
+        df, df_sub = grondwaterfiltersearch.search(
+            query=query, return_fields=('gw_id', 'peil_mtaw'),
+            normalized=True)
+
+        assert list(df) == ['pkey_filter', 'gw_id']
+        assert list(df_sub) == ['pkey_filter', 'peil_mtaw']
+
+        pd.testing.assert_frame_equal(
+            GrondwaterFilter.denormalize(df, df_sub, ('gw_id', 'peil_mtaw')),
+            grondwaterfiltersearch.search(
+                query=query, return_fields=('gw_id', 'peil_mtaw')))
+
+        df, df_sub = grondwaterfiltersearch.search(
+            query=query, return_fields=('gw_id',), normalized=True)
+
+        assert list(df_sub) == ['pkey_filter']
+        assert len(df_sub) == 0
+        assert GrondwaterFilter.denormalize(df, df_sub) is df
+        assert list(GrondwaterFilter.denormalize(df, df_sub, ('gw_id',))) == \
+            ['gw_id']
+
     def test_search_returnfields(self, mp_remote_wfs_feature,
                                  grondwaterfiltersearch):
         """Test the search method with the query parameter and a selection of
@@ -556,3 +657,72 @@ class TestGrondwaterFilterSearch(AbstractTestSearch):
         assert list(df) == ['pkey_filter', 'gw_id', 'filternummer',
                             'meetnet_code']
         assert df.meetnet_code[0] == 8
+
+    def test_search_iter(self, mp_wfs, mp_remote_describefeaturetype,
+                         mp_remote_md, mp_remote_fc, mp_remote_wfs_feature,
+                         mp_dov_xml, grondwaterfiltersearch):
+        """Test the search_iter method with only the query parameter.
+
+        Test whether the result is returned in chunks of at most the given
+        size, together being equal to the result of the search method.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue of the
+            gw_meetnetten:meetnetten layer.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        grondwaterfiltersearch : pytest.fixture returning
+            pydov.search.GrondwaterFilterSearch
+            An instance of GrondwaterFilterSearch to perform search operations
+            on the DOV type 'GrondwaterFilter'.
+
+        """
+        query = PropertyIsEqualTo(propertyname='filterfiche',
+                                  literal='https://www.dov.vlaanderen.be/'
+                                          'data/filter/2003-004471')
+
+        df = grondwaterfiltersearch.search(query=query)
+        chunks = list(grondwaterfiltersearch.search_iter(query=query,
+                                                         chunksize=10))
+
+        assert len(chunks) == -(-len(df) // 10)
+        for chunk in chunks:
+            assert type(chunk) is DataFrame
+            assert list(chunk) == list(df)
+            assert 0 < len(chunk) <= 10
+
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), df)
+
+    def test_search_iter_wrongchunksize(self, grondwaterfiltersearch):
+        """Test the search_iter method with an invalid chunksize.
+
+        Test whether an InvalidSearchParameterError is raised before
+        iterating over the result.
+
+        Parameters
+        ----------
+        grondwaterfiltersearch : pytest.fixture returning
+            pydov.search.GrondwaterFilterSearch
+            An instance of GrondwaterFilterSearch to perform search operations
+            on the DOV type 'GrondwaterFilter'.
+
+        """
+        query = PropertyIsEqualTo(propertyname='filterfiche',
+                                  literal='https://www.dov.vlaanderen.be/'
+                                          'data/filter/2003-004471')
+
+        with pytest.raises(InvalidSearchParameterError):
+            grondwaterfiltersearch.search_iter(query=query, chunksize=0)
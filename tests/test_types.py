@@ -1,6 +1,14 @@
 """Module grouping tests for the boring search module."""
 
+import datetime
+
+import numpy as np
 import pytest
+from pandas.api.types import (
+    is_bool_dtype,
+    is_float_dtype,
+    is_object_dtype,
+)
 
 from pydov.types.boring import Boring
 from pydov.types.grondwaterfilter import GrondwaterFilter
@@ -31,3 +39,98 @@ def test_get_fields_sourcexml(objecttype):
     fields = objecttype.get_fields(source=('xml',))
     for field in fields.values():
         assert field['source'] == 'xml'
+
+
+def test_build_df_conversion():
+    """Test the conversion of the columns when building a dataframe.
+
+    Test whether the values of each column are converted to the datatype of
+    their field, including the Zulu-time patch for dates, the boolean
+    mapping and missing values.
+
+    """
+    pkey = 'https://www.dov.vlaanderen.be/data/boring/2004-103984'
+    fields = ('pkey_boring', 'mv_mtaw', 'diepte_boring_tot',
+              'datum_aanvang', 'boorgatmeting')
+    rows = [[pkey, '7.16', '30.00', '2004-12-19Z', 'false'],
+            [pkey, np.nan, '12', '2004-12-19', 'Yes']]
+
+    df = Boring._build_df(rows, return_fields=fields)
+
+    assert list(df) == list(fields)
+    assert is_float_dtype(df.mv_mtaw)
+    assert np.isnan(df.mv_mtaw[1])
+    assert list(df.diepte_boring_tot) == [30.0, 12.0]
+    assert is_object_dtype(df.datum_aanvang)
+    assert list(df.datum_aanvang) == [datetime.date(2004, 12, 20),
+                                      datetime.date(2004, 12, 19)]
+    assert is_bool_dtype(df.boorgatmeting)
+    assert list(df.boorgatmeting) == [False, True]
+
+
+def test_build_df_typed_values():
+    """Test building a dataframe with values that are not text.
+
+    Test whether the values of the datatype of their field are kept as is
+    and the text values in the same column are converted.
+
+    """
+    pkey = 'https://www.dov.vlaanderen.be/data/boring/2004-103984'
+    fields = ('pkey_boring', 'mv_mtaw', 'datum_aanvang', 'boorgatmeting')
+    rows = [[pkey, 7.16, datetime.date(2004, 12, 19), True],
+            [pkey, '12', '2004-12-20', 'no']]
+
+    df = Boring._build_df(rows, return_fields=fields)
+
+    assert is_float_dtype(df.mv_mtaw)
+    assert list(df.mv_mtaw) == [7.16, 12.0]
+    assert list(df.datum_aanvang) == [datetime.date(2004, 12, 19),
+                                      datetime.date(2004, 12, 20)]
+    assert is_bool_dtype(df.boorgatmeting)
+    assert list(df.boorgatmeting) == [True, False]
+
+
+def test_build_df_fallback_values():
+    """Test building a dataframe with values that cannot be converted at
+    once.
+
+    Test whether unresolved values are kept and whether dates outside the
+    range of pandas timestamps are converted one by one.
+
+    """
+    pkey = 'https://www.dov.vlaanderen.be/data/boring/2004-103984'
+    fields = ('pkey_boring', 'mv_mtaw', 'datum_aanvang')
+    rows = [[pkey, Boring._UNRESOLVED, '1500-01-01'],
+            [pkey, '12', '2004-12-20Z']]
+
+    df = Boring._build_df(rows, return_fields=fields)
+
+    assert list(df.mv_mtaw) == [Boring._UNRESOLVED, 12.0]
+    assert list(df.datum_aanvang) == [datetime.date(1500, 1, 1),
+                                      datetime.date(2004, 12, 21)]
+
+
+def test_build_df_invalid_boolean():
+    """Test building a dataframe with an invalid boolean value.
+
+    Test whether a ValueError is raised.
+
+    """
+    pkey = 'https://www.dov.vlaanderen.be/data/boring/2004-103984'
+
+    with pytest.raises(ValueError):
+        Boring._build_df([[pkey, 'misschien']],
+                         return_fields=('pkey_boring', 'boorgatmeting'))
+
+
+@pytest.mark.parametrize("objecttype", type_objects)
+def test_build_df_empty(objecttype):
+    """Test building a dataframe without any rows.
+
+    Test whether the dataframe is empty and has all columns.
+
+    """
+    df = objecttype._build_df([])
+
+    assert len(df) == 0
+    assert list(df) == objecttype.get_field_names()
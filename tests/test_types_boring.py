@@ -3,10 +3,13 @@ import numpy as np
 from collections import OrderedDict
 
 import datetime
+import time
+
 import pytest
 from numpy.compat import unicode
 from owslib.etree import etree
 
+from pydov.types.abstract import _FieldSchema
 from pydov.types.boring import Boring
 from pydov.util.errors import InvalidFieldError
 from tests.abstract import AbstractTestTypes
@@ -183,6 +186,149 @@ class TestBoring(AbstractTestTypes):
         df_array = boring.get_df_array()
         self.abstract_test_get_df_array(df_array, fields)
 
+    def test_data(self, wfs_feature, mp_dov_xml):
+        """Test the data of a Boring instance.
+
+        Test whether the values are converted to the datatype of their
+        field, also after resolving the XML data.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+
+        """
+        boring = Boring.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/ocdov/dov-pub')
+
+        assert type(boring.data['x']) is float
+        assert type(boring.data['datum_aanvang']) is datetime.date
+        assert boring.data['mv_mtaw'] == Boring._UNRESOLVED
+
+        boring.get_df_array()
+
+        assert type(boring.data['mv_mtaw']) is float
+        assert type(boring.data['boorgatmeting']) is bool
+        for boormethode in boring.subdata['boormethode']:
+            assert type(boormethode.data['diepte_methode_van']) is float
+            assert dict(boormethode.data) == boormethode.data
+
+    def test_data_write(self, wfs_feature, mp_dov_xml):
+        """Test setting values in the data of a Boring instance.
+
+        Test whether the values that are set are used in the output of the
+        instance.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+
+        """
+        boring = Boring.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/ocdov/dov-pub')
+        boring.get_df_array()
+
+        boring.data['mv_mtaw'] = 8.5
+        boring.data['uitvoerder'] = 'DOV'
+        boring.data['datum_aanvang'] = datetime.date(2005, 1, 1)
+
+        fields = ('pkey_boring', 'mv_mtaw', 'datum_aanvang', 'uitvoerder')
+        assert boring.get_df_array(return_fields=fields) == [
+            [boring.pkey, 8.5, datetime.date(2005, 1, 1), 'DOV']]
+
+        df = Boring.to_df([boring], return_fields=fields)
+        assert list(df.mv_mtaw) == [8.5]
+        assert list(df.uitvoerder) == ['DOV']
+        assert list(df.datum_aanvang) == [datetime.date(2005, 1, 1)]
+
+    def test_data_assign(self, wfs_feature, mp_dov_xml):
+        """Test assigning the data of a Boring instance and its subtypes.
+
+        Test whether the assigned values replace the values of the
+        instances and are used in their output.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+
+        """
+        boring = Boring.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/ocdov/dov-pub')
+        boring.get_df_array()
+
+        data = dict(boring.data)
+        data['mv_mtaw'] = 8.5
+        boring.data = data
+        assert boring.data['mv_mtaw'] == 8.5
+
+        boormethode = boring.subdata['boormethode'][0]
+        boormethode.data = {'diepte_methode_van': 1.0,
+                            'diepte_methode_tot': 2.0,
+                            'boormethode': 'spade'}
+        assert dict(boormethode.data) == {'diepte_methode_van': 1.0,
+                                          'diepte_methode_tot': 2.0,
+                                          'boormethode': 'spade'}
+
+        with pytest.raises(KeyError):
+            boormethode.data = {'unknown': 1}
+
+        df = Boring.to_df([boring], return_fields=(
+            'mv_mtaw', 'diepte_methode_van', 'boormethode'))
+        assert list(df.mv_mtaw.unique()) == [8.5]
+        assert df.diepte_methode_van[0] == 1.0
+        assert df.boormethode[0] == 'spade'
+
+    def test_to_df_coalesced(self, monkeypatch, wfs_feature, mp_dov_xml):
+        """Test the Boring.to_df method with several instances of the same
+        Boring resolved concurrently.
+
+        Test whether the XML data is requested and parsed once, and the
+        output is the same for all instances.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote Boring XML data.
+
+        """
+        requests = []
+        get_xml_data = Boring._get_xml_data
+
+        def _get_xml_data(self):
+            requests.append(self.pkey)
+            time.sleep(0.1)
+            return get_xml_data(self)
+
+        monkeypatch.setattr(Boring, '_get_xml_data', _get_xml_data)
+
+        boringen = [Boring.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/ocdov/dov-pub')
+            for i in range(4)]
+
+        df = Boring.to_df(boringen, max_workers=4)
+
+        assert len(requests) == 1
+        assert len(df) == 4 * len(boringen[0].subdata['boormethode'])
+        for boring in boringen[1:]:
+            assert boring.data == boringen[0].data
+            assert boring._state == boringen[0]._state
+
     def test_get_df_array_wrongreturnfields(self, wfs_feature):
         """Test the boring.get_df_array specifying a nonexistent return field.
 
@@ -201,6 +347,91 @@ class TestBoring(AbstractTestTypes):
         with pytest.raises(InvalidFieldError):
             boring.get_df_array(return_fields=('onbestaand',))
 
+    def test_parse_element(self, wfs_feature):
+        """Test the Boring._parse_element method.
+
+        Test whether the compiled field extractors return the same text as
+        looking up each field separately.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+
+        """
+        namespace = 'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+        data = {}
+        Boring._parse_element(wfs_feature, data, source=('wfs',),
+                              namespace=namespace)
+
+        for field in Boring.get_fields(source=('wfs',)).values():
+            expected = wfs_feature.findtext(
+                Boring._get_xpath(field['sourcefield'], namespace))
+            if expected is None:
+                assert data[field['name']] is np.nan
+            else:
+                assert data[field['name']] == expected
+
+    def test_get_extractors_cached(self):
+        """Test whether the field extractors are compiled once per class and
+        recompiled after clearing them."""
+        namespace = 'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+        extractors = Boring._get_extractors(('wfs',), namespace)
+        assert Boring._get_extractors(('wfs',), namespace) is extractors
+        assert [e[0] for e in extractors] == list(
+            Boring.get_fields(source=('wfs',)).keys())
+
+        Boring._clear_schema()
+        assert Boring._get_extractors(('wfs',), namespace) is not extractors
+
+    def test_get_layout_cached(self):
+        """Test whether the layout of the data arrays is computed once per
+        set of return fields and recomputed after clearing the schema."""
+        layout = Boring._get_layout(('pkey_boring', 'diepte_methode_van'))
+
+        assert Boring._get_layout(
+            ['diepte_methode_van', 'pkey_boring']) is layout
+        assert layout.fields == ('pkey_boring', 'diepte_methode_van')
+        assert layout.own_fields == ('pkey_boring',)
+        assert [st for st, _ in layout.subtypes] == Boring._subtypes
+        assert layout.requires_xml
+
+        Boring._clear_schema()
+        assert Boring._get_layout(
+            ('pkey_boring', 'diepte_methode_van')) is not layout
+
+        with pytest.raises(InvalidFieldError):
+            Boring._get_layout(('pkey_boring', 'onbestaand'))
+
+    def test_get_layout_lru(self, monkeypatch):
+        """Test whether the layouts of new sets of return fields are still
+        cached once the maximum number of layouts is reached, discarding
+        the least recently used one.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        monkeypatch.setattr(_FieldSchema, 'max_layouts', 2)
+        Boring._clear_schema()
+
+        try:
+            first = Boring._get_layout(('pkey_boring', 'x'))
+            second = Boring._get_layout(('pkey_boring', 'y'))
+            assert Boring._get_layout(('pkey_boring', 'x')) is first
+
+            third = Boring._get_layout(('pkey_boring', 'mv_mtaw'))
+            assert Boring._get_layout(('pkey_boring', 'mv_mtaw')) is third
+            assert Boring._get_layout(('pkey_boring', 'x')) is first
+            assert Boring._get_layout(('pkey_boring', 'y')) is not second
+        finally:
+            Boring._clear_schema()
+
     def test_from_wfs_str(self, wfs_getfeature):
         """Test the boring.from_wfs method to construct Boring objects from
         a WFS response, as str.
@@ -9,8 +9,13 @@ from pandas.core.dtypes.common import is_object_dtype
 
 from owslib.etree import etree
 
+import pydov
+
 from pydov.types.boring import Boring
-from pydov.types.grondwaterfilter import GrondwaterFilter
+from pydov.types.grondwaterfilter import (
+    GrondwaterFilter,
+    Peilmeting,
+)
 from pydov.util.errors import InvalidFieldError
 from tests.abstract import AbstractTestTypes
 
@@ -208,6 +213,336 @@ class TestGrondwaterFilter(AbstractTestTypes):
         with pytest.raises(InvalidFieldError):
             grondwaterfilter.get_df_array(return_fields=('onbestaand',))
 
+    def test_to_df_array_concurrent(self, wfs_getfeature, mp_dov_xml):
+        """Test the GrondwaterFilter.to_df_array method using multiple
+        workers.
+
+        Test whether the output is the same as when resolving the instances
+        serially.
+
+        Parameters
+        ----------
+        wfs_getfeature : pytest.fixture returning str
+            Fixture providing a WFS GetFeature response of the
+            gw_meetnetten:meetnetten layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+
+        """
+        namespace = 'http://dov.vlaanderen.be/grondwater/gw_meetnetten'
+
+        serial = list(GrondwaterFilter.to_df_array(
+            GrondwaterFilter.from_wfs(wfs_getfeature, namespace),
+            max_workers=1))
+
+        concurrent = list(GrondwaterFilter.to_df_array(
+            GrondwaterFilter.from_wfs(wfs_getfeature, namespace),
+            max_workers=4))
+
+        assert len(serial) > 1
+        assert concurrent == serial
+
+    def test_get_df_array_single_parse(self, wfs_feature, mp_dov_xml,
+                                       monkeypatch):
+        """Test whether the XML document is only parsed once when resolving
+        the details of a GrondwaterFilter and its subtypes.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the GrondwaterFilter WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        grondwaterfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/grondwater/gw_meetnetten')
+
+        parsed = []
+        fromstring = etree.fromstring
+
+        def counting_fromstring(*args, **kwargs):
+            parsed.append(args[0])
+            return fromstring(*args, **kwargs)
+
+        monkeypatch.setattr(etree, 'fromstring', counting_fromstring)
+
+        df_array = grondwaterfilter.get_df_array()
+
+        assert len(df_array) > 1
+        assert len(parsed) == 1
+
+    def test_get_df_array_lazy_fields(self, wfs_feature, mp_dov_xml,
+                                      monkeypatch):
+        """Test whether only the XML fields and subtypes included in the
+        return fields are parsed.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the GrondwaterFilter WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        grondwaterfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/grondwater/gw_meetnetten')
+
+        def from_xml_element(element):
+            raise AssertionError('Peilmeting should not be parsed.')
+
+        with monkeypatch.context() as m:
+            m.setattr(Peilmeting, 'from_xml_element', from_xml_element)
+            df_array = grondwaterfilter.get_df_array(
+                return_fields=('pkey_filter', 'aquifer_code'))
+
+        assert len(df_array) == 1
+        assert df_array[0][1] == '0100'
+        assert grondwaterfilter.data['regime'] == \
+            GrondwaterFilter._UNRESOLVED
+        assert 'peilmetingen' not in grondwaterfilter.subdata
+
+        df_array = grondwaterfilter.get_df_array(
+            return_fields=('pkey_filter', 'regime', 'datum'))
+        assert len(df_array) > 1
+        assert grondwaterfilter.data['regime'] != \
+            GrondwaterFilter._UNRESOLVED
+
+        assert grondwaterfilter.get_df_array(
+            return_fields=('pkey_filter', 'datum')) == [
+            [r[0], r[2]] for r in df_array]
+
+    def test_parse_xml_data_resolved(self, wfs_feature, mp_dov_xml,
+                                     monkeypatch):
+        """Test whether the XML document is neither requested nor parsed
+        again when all requested fields and subtypes have been parsed.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the GrondwaterFilter WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        grondwaterfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/grondwater/gw_meetnetten')
+        grondwaterfilter._parse_xml_data(
+            return_fields=('pkey_filter', 'regime', 'datum'))
+
+        def fromstring(*args, **kwargs):
+            raise AssertionError('The XML document should not be parsed.')
+
+        def get_xml_data(*args, **kwargs):
+            raise AssertionError('The XML document should not be requested.')
+
+        monkeypatch.setattr(etree, 'fromstring', fromstring)
+        monkeypatch.setattr(GrondwaterFilter, '_get_xml_data', get_xml_data)
+
+        grondwaterfilter._parse_xml_data(return_fields=('regime', 'peil_mtaw'))
+        assert grondwaterfilter.data['regime'] != \
+            GrondwaterFilter._UNRESOLVED
+
+    def test_get_df_array_resolution_state(self, wfs_feature, mp_dov_xml,
+                                           monkeypatch):
+        """Test whether the XML document is only requested once, even when
+        fields that have not been resolved before are requested later, and
+        only kept until all fields are resolved.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the GrondwaterFilter WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        grondwaterfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/grondwater/gw_meetnetten')
+        assert grondwaterfilter._state == GrondwaterFilter._WFS_LOADED
+
+        requested = []
+        get_xml_data = GrondwaterFilter._get_xml_data
+
+        def counting_get_xml_data(self):
+            requested.append(self.pkey)
+            return get_xml_data(self)
+
+        monkeypatch.setattr(GrondwaterFilter, '_get_xml_data',
+                            counting_get_xml_data)
+
+        grondwaterfilter.get_df_array(return_fields=('pkey_filter', 'datum'))
+        grondwaterfilter.get_df_array(return_fields=('pkey_filter', 'datum'))
+        assert len(requested) == 1
+        assert grondwaterfilter._state & GrondwaterFilter._SUBTYPES_RESOLVED
+        assert not grondwaterfilter._state & GrondwaterFilter._XML_RESOLVED
+        assert grondwaterfilter._xml is not None
+
+        grondwaterfilter.get_df_array()
+        grondwaterfilter.get_df_array()
+        grondwaterfilter.get_df_array(return_fields=('regime', 'datum'))
+        assert len(requested) == 1
+        assert grondwaterfilter._state & GrondwaterFilter._XML_RESOLVED
+        assert grondwaterfilter._xml is None
+
+    def test_parse_wfs_data_once(self, wfs_feature):
+        """Test whether the WFS data of a GrondwaterFilter that has been
+        loaded from the WFS is not parsed again.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the GrondwaterFilter WFS layer.
+
+        """
+        namespace = 'http://dov.vlaanderen.be/grondwater/gw_meetnetten'
+        grondwaterfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, namespace)
+        grondwaterfilter.data['aquifer_code'] = '0200'
+
+        grondwaterfilter._parse_wfs_data(wfs_feature, namespace)
+        assert grondwaterfilter._state == GrondwaterFilter._WFS_LOADED
+        assert grondwaterfilter.data['aquifer_code'] == '0200'
+
+    def test_to_df_xml_requested_once(self, wfs_getfeature, monkeypatch):
+        """Test the GrondwaterFilter.to_df method without a cache, first for
+        some of the fields and afterwards for more of them.
+
+        Test whether the XML document of every instance is requested only
+        once.
+
+        Parameters
+        ----------
+        wfs_getfeature : pytest.fixture returning str
+            Fixture providing a WFS GetFeature response of the
+            gw_meetnetten:meetnetten layer.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        requested = []
+
+        def get_dov_xml(url):
+            requested.append(url)
+            with open('tests/data/types/grondwaterfilter/'
+                      'grondwaterfilter.xml', 'rb') as f:
+                return f.read()
+
+        monkeypatch.setattr(pydov, 'cache', None)
+        monkeypatch.setattr('pydov.types.abstract.get_dov_xml', get_dov_xml)
+
+        instances = list(GrondwaterFilter.from_wfs(
+            wfs_getfeature,
+            'http://dov.vlaanderen.be/grondwater/gw_meetnetten'))
+
+        GrondwaterFilter.to_df(instances,
+                               return_fields=('pkey_filter', 'aquifer_code'))
+        assert len(requested) == len(instances)
+
+        df = GrondwaterFilter.to_df(
+            instances, return_fields=('pkey_filter', 'regime', 'datum'))
+        assert len(requested) == len(instances)
+        assert sorted(requested) == sorted(
+            i.pkey + '.xml' for i in instances)
+        assert len(df) > len(instances)
+
+    def test_subtype_from_xml_tree(self, mp_dov_xml):
+        """Test whether the Peilmeting subtype gives the same result when
+        built from the parsed XML tree as from the raw XML data.
+
+        Parameters
+        ----------
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+
+        """
+        xml = GrondwaterFilter._get_xml_data()
+
+        from_bytes = [p.data for p in Peilmeting.from_xml(xml)]
+        from_tree = [p.data for p in Peilmeting.from_xml(
+            etree.fromstring(xml))]
+
+        assert len(from_bytes) > 0
+        assert from_tree == from_bytes
+
+    def test_subtype_compact(self, mp_dov_xml):
+        """Test whether Peilmeting instances have no instance dictionary and
+        still give dictionary-like access to their data.
+
+        Parameters
+        ----------
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote GrondwaterFilter XML data.
+
+        """
+        peilmeting = next(iter(Peilmeting.from_xml(
+            GrondwaterFilter._get_xml_data())))
+
+        assert not hasattr(peilmeting, '__dict__')
+        assert list(peilmeting.data) == Peilmeting.get_field_names()
+
+        peilmeting.data['methode'] = 'test'
+        assert dict(peilmeting.data)['methode'] == 'test'
+
+        with pytest.raises(TypeError):
+            del peilmeting.data['methode']
+
+        with pytest.raises(KeyError):
+            peilmeting.data['nonexistent'] = 'test'
+
+    def test_subtype_name_deprecated(self):
+        """Test initialising a subtype with a name.
+
+        Test whether the deprecated name argument is still accepted, with a
+        DeprecationWarning.
+
+        """
+        class LegacyPeilmeting(Peilmeting):
+            __slots__ = ()
+
+            def __init__(self):
+                super(Peilmeting, self).__init__('peilmeting')
+
+        with pytest.warns(DeprecationWarning):
+            peilmeting = LegacyPeilmeting()
+
+        assert peilmeting.get_name() == 'peilmeting'
+        assert list(peilmeting.data) == Peilmeting.get_field_names()
+
+    def test_unresolved_not_stored(self, wfs_feature):
+        """Test whether the fields that are not resolved yet are not stored,
+        while `data` still includes them.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the WFS layer.
+
+        """
+        gwfilter = GrondwaterFilter.from_wfs_element(
+            wfs_feature, 'http://dov.vlaanderen.be/grondwater/gw_meetnetten')
+
+        unresolved = [f for f in GrondwaterFilter.get_field_names(
+                          include_subtypes=False)
+                      if f not in gwfilter._data]
+        assert len(unresolved) > 0
+        assert all(gwfilter.data[f] == GrondwaterFilter._UNRESOLVED
+                   for f in unresolved)
+
     def test_from_wfs_str(self, wfs_getfeature):
         """Test the boring.from_wfs method to construct Boring objects from
         a WFS response, as str.
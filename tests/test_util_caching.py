@@ -0,0 +1,482 @@
+"""Module grouping tests for the pydov.util.caching module."""
+import datetime
+import os
+import time
+
+import pytest
+
+import pydov
+from pydov.search.abstract import AbstractSearch
+from pydov.search.boring import BoringSearch
+from pydov.types.boring import Boring
+from pydov.util import owsutil
+from pydov.util.caching import (
+    FileCache,
+    LRUCache,
+    MetadataCache,
+)
+
+from tests.test_search import (
+    mp_wfs,
+    wfs,
+)
+from tests.test_search_boring import (
+    wfs_feature,
+    mp_remote_describefeaturetype,
+    mp_remote_md,
+    mp_remote_fc,
+)
+
+
+@pytest.fixture
+def mp_remote_xml(monkeypatch):
+    """Monkeypatch the call to get the remote XML data of a DOV object,
+    keeping track of the requested URLs.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list<str>
+        List of the URLs that were requested remotely.
+
+    """
+    requested = []
+
+    def get_dov_xml(url):
+        requested.append(url)
+        with open('tests/data/types/boring/boring.xml', 'rb') as f:
+            return f.read()
+
+    monkeypatch.setattr('pydov.util.dovutil.get_dov_xml', get_dov_xml)
+    return requested
+
+
+@pytest.fixture
+def cache(tmpdir):
+    """PyTest fixture providing a FileCache in a temporary directory.
+
+    Parameters
+    ----------
+    tmpdir : pytest.fixture
+        PyTest fixture providing a temporary directory.
+
+    Returns
+    -------
+    pydov.util.caching.FileCache
+        Cache of XML documents in a temporary directory.
+
+    """
+    return FileCache(cachedir=str(tmpdir))
+
+
+def expire(cache, url):
+    """Set the modification time of the cached document with the given
+    URL to a moment in the past beyond the maximum age of the cache.
+
+    Parameters
+    ----------
+    cache : pydov.util.caching.FileCache
+        Cache containing the document.
+    url : str
+        URL of the cached document.
+
+    """
+    filepath = cache._get_filepath(url)
+    past = time.time() - cache.max_age.total_seconds() - 60
+    os.utime(filepath, (past, past))
+
+
+class TestFileCache(object):
+    """Class grouping tests for the pydov.util.caching.FileCache class."""
+
+    url = 'https://www.dov.vlaanderen.be/data/boring/2004-103984.xml'
+
+    def test_get(self, cache, mp_remote_xml):
+        """Test the get method.
+
+        Test whether the document is requested remotely only once.
+
+        """
+        first = cache.get(self.url)
+        second = cache.get(self.url)
+
+        assert first == second
+        assert first.startswith(b'<?xml')
+        assert mp_remote_xml == [self.url]
+        assert os.path.isfile(cache._get_filepath(self.url))
+
+    def test_get_compressed(self, tmpdir, mp_remote_xml):
+        """Test the get method using a compressed cache.
+
+        Test whether the document is saved compressed and read back
+        correctly.
+
+        """
+        cache = FileCache(cachedir=str(tmpdir), compress=True)
+        first = cache.get(self.url)
+        second = cache.get(self.url)
+
+        assert first == second
+        assert mp_remote_xml == [self.url]
+
+        filepath = cache._get_filepath(self.url)
+        assert filepath.endswith('.xml.gz')
+        assert os.path.getsize(filepath) < len(first)
+
+    def test_get_expired(self, cache, mp_remote_xml):
+        """Test the get method with an expired document.
+
+        Test whether the document is requested remotely again.
+
+        """
+        cache.get(self.url)
+        expire(cache, self.url)
+        cache.get(self.url)
+
+        assert mp_remote_xml == [self.url, self.url]
+
+    def test_get_noexpiry(self, tmpdir, mp_remote_xml):
+        """Test the get method with documents that never expire.
+
+        Test whether an old document is still used.
+
+        """
+        cache = FileCache(cachedir=str(tmpdir), max_age=None)
+        cache.get(self.url)
+
+        filepath = cache._get_filepath(self.url)
+        os.utime(filepath, (0, 0))
+        cache.get(self.url)
+
+        assert mp_remote_xml == [self.url]
+
+    def test_get_max_size(self, tmpdir, mp_remote_xml):
+        """Test the get method with a cache limited in size.
+
+        Test whether the least recently used document is evicted.
+
+        """
+        cache = FileCache(cachedir=str(tmpdir))
+        size = len(cache.get(self.url))
+        cache.remove()
+
+        cache = FileCache(cachedir=str(tmpdir), max_size=int(size * 2.5))
+        urls = [self.url.replace('103984', str(i)) for i in range(3)]
+
+        cache.get(urls[0])
+        cache.get(urls[1])
+        os.utime(cache._get_filepath(urls[0]), (1, time.time()))
+        os.utime(cache._get_filepath(urls[1]), (2, time.time()))
+        cache.get(urls[2])
+
+        assert not os.path.exists(cache._get_filepath(urls[0]))
+        assert os.path.exists(cache._get_filepath(urls[1]))
+        assert os.path.exists(cache._get_filepath(urls[2]))
+
+    def test_save_max_size(self, tmpdir):
+        """Test the save method overwriting a document in a cache limited
+        in size.
+
+        Test whether the size of the cache only grows with the difference
+        in size of the document.
+
+        """
+        cache = FileCache(cachedir=str(tmpdir), max_size=1000)
+        cache.save(self.url, b'<?xml version="1.0"?><a/>')
+        size = cache._size
+
+        for i in range(100):
+            cache.save(self.url, b'<?xml version="1.0"?><a/>')
+        assert cache._size == size
+
+        cache.save(self.url, b'<?xml version="1.0"?><ab/>')
+        assert cache._size == size + 1
+        assert os.path.exists(cache._get_filepath(self.url))
+
+    def test_clean(self, cache, mp_remote_xml):
+        """Test the clean method.
+
+        Test whether only the expired documents are removed.
+
+        """
+        other_url = self.url.replace('103984', '1')
+        cache.get(self.url)
+        cache.get(other_url)
+        expire(cache, self.url)
+
+        cache.clean()
+
+        assert not os.path.exists(cache._get_filepath(self.url))
+        assert os.path.exists(cache._get_filepath(other_url))
+
+    def test_remove(self, cache, mp_remote_xml):
+        """Test the remove method.
+
+        Test whether all documents are removed.
+
+        """
+        cache.get(self.url)
+        cache.remove()
+
+        assert not os.path.exists(cache._get_filepath(self.url))
+        assert len(os.listdir(cache.cachedir)) == 0
+
+    def test_boring_resolution(self, monkeypatch, cache, mp_remote_xml,
+                               wfs_feature):
+        """Test resolving the XML data of Boring instances with a cache.
+
+        Test whether the document is requested remotely only once.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the Boring WFS layer.
+
+        """
+        monkeypatch.setattr(pydov, 'cache', cache)
+
+        for i in range(2):
+            boring = Boring.from_wfs_element(
+                wfs_feature, 'http://dov.vlaanderen.be/ocdov/dov-pub')
+            df_array = boring.get_df_array(
+                return_fields=('pkey_boring', 'diepte_boring_van'))
+            assert df_array[0][1] == 0.0
+
+        assert mp_remote_xml == [boring.pkey + '.xml']
+
+
+@pytest.fixture
+def metadata_cache(tmpdir):
+    """PyTest fixture providing a MetadataCache in a temporary directory.
+
+    Parameters
+    ----------
+    tmpdir : pytest.fixture
+        PyTest fixture providing a temporary directory.
+
+    Returns
+    -------
+    pydov.util.caching.MetadataCache
+        Cache of metadata snapshots in a temporary directory.
+
+    """
+    return MetadataCache(cachedir=str(tmpdir))
+
+
+def reset_search_metadata(monkeypatch):
+    """Reset the metadata kept in memory by the search classes, as in a
+    fresh process.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(AbstractSearch, '_AbstractSearch__wfs', None)
+    for attribute in ('wfs_schema', 'wfs_namespace', 'md_metadata',
+                      'fc_featurecatalogue'):
+        monkeypatch.setattr(BoringSearch, '_BoringSearch__' + attribute,
+                            None)
+
+
+class TestMetadataCache(object):
+    """Class grouping tests for the pydov.util.caching.MetadataCache
+    class."""
+
+    key = ('schema', 'dov-pub:Boringen')
+
+    def test_get(self, metadata_cache):
+        """Test the get method.
+
+        Test whether the metadata is fetched only once.
+
+        """
+        fetched = []
+
+        def fetch():
+            fetched.append(True)
+            return {'properties': {'fiche': 'string'}}
+
+        first = metadata_cache.get(self.key, fetch)
+        second = metadata_cache.get(self.key, fetch)
+
+        assert first == second == {'properties': {'fiche': 'string'}}
+        assert len(fetched) == 1
+
+    def test_get_expired(self, metadata_cache):
+        """Test the get method with an expired snapshot.
+
+        Test whether the metadata is fetched again.
+
+        """
+        metadata_cache.get(self.key, lambda: 'old')
+        metadata_cache.max_age = datetime.timedelta(seconds=-1)
+
+        assert metadata_cache.get(self.key, lambda: 'new') == 'new'
+
+    def test_load(self, metadata_cache):
+        """Test the load method.
+
+        Test whether only a snapshot that has not expired is returned.
+
+        """
+        assert metadata_cache.load(self.key) is None
+
+        metadata_cache.get(self.key, lambda: 'old')
+        assert metadata_cache.load(self.key) == 'old'
+
+        metadata_cache.max_age = datetime.timedelta(seconds=-1)
+        assert metadata_cache.load(self.key) is None
+
+    def test_get_expired_error(self, metadata_cache):
+        """Test the get method with an expired snapshot when the remote
+        service is unavailable.
+
+        Test whether the expired snapshot is used.
+
+        """
+        def fetch():
+            raise IOError('service unavailable')
+
+        metadata_cache.get(self.key, lambda: 'old')
+        metadata_cache.max_age = datetime.timedelta(seconds=-1)
+
+        assert metadata_cache.get(self.key, fetch) == 'old'
+
+    def test_get_error(self, metadata_cache):
+        """Test the get method without snapshot when the remote service is
+        unavailable.
+
+        Test whether the error is raised.
+
+        """
+        def fetch():
+            raise IOError('service unavailable')
+
+        with pytest.raises(IOError):
+            metadata_cache.get(self.key, fetch)
+
+    def test_get_version(self, monkeypatch, metadata_cache):
+        """Test the get method with a snapshot saved by another version of
+        pydov.
+
+        Test whether the snapshot is ignored.
+
+        """
+        metadata_cache.get(self.key, lambda: 'old')
+        monkeypatch.setattr(pydov, '__version__', '0.0.0')
+
+        assert metadata_cache.get(self.key, lambda: 'new') == 'new'
+
+    def test_search_warm_start(self, monkeypatch, metadata_cache, mp_wfs,
+                               mp_remote_describefeaturetype, mp_remote_md,
+                               mp_remote_fc):
+        """Test initialising a search class from the snapshots of a previous
+        process.
+
+        Test whether the fields are available without remote requests.
+
+        """
+        monkeypatch.setattr(pydov, 'metadata_cache', metadata_cache)
+
+        reset_search_metadata(monkeypatch)
+        fields = BoringSearch().get_fields()
+        BoringSearch()._init_namespace()
+
+        def unavailable(*args, **kwargs):
+            raise IOError('service unavailable')
+
+        reset_search_metadata(monkeypatch)
+        for function in ('get_remote_capabilities', 'get_namespace',
+                         'get_remote_metadata',
+                         'get_remote_featurecatalogue'):
+            monkeypatch.setattr('pydov.util.owsutil.' + function,
+                                unavailable)
+        monkeypatch.setattr('pydov.search.abstract.get_remote_schema',
+                            unavailable)
+
+        boringsearch = BoringSearch()
+        assert boringsearch.get_fields() == fields
+        assert len(boringsearch.get_description()) > 0
+
+        boringsearch._init_namespace()
+        assert BoringSearch._BoringSearch__wfs_namespace == \
+            'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+    def test_search_featurecatalogue(self, monkeypatch, metadata_cache,
+                                     mp_wfs, mp_remote_md, mp_remote_fc):
+        """Test requesting the feature catalogue of a search class from its
+        snapshot.
+
+        Test whether the feature catalogue is the same as the one parsed
+        from the remote service.
+
+        """
+        monkeypatch.setattr(pydov, 'metadata_cache', metadata_cache)
+        reset_search_metadata(monkeypatch)
+
+        boringsearch = BoringSearch()
+        md_metadata = boringsearch._get_remote_metadata()
+        remote = owsutil.get_remote_featurecatalogue(
+            boringsearch._get_csw_base_url(),
+            owsutil.get_featurecatalogue_uuid(md_metadata))
+
+        assert boringsearch._get_remote_featurecatalogue(
+            md_metadata) == remote
+        assert BoringSearch()._get_remote_featurecatalogue(
+            md_metadata) == remote
+
+    def test_search_mirrors(self, monkeypatch, metadata_cache, mp_wfs,
+                            mp_remote_describefeaturetype, mp_remote_md,
+                            mp_remote_fc):
+        """Test initialising a search class from the snapshots of another
+        WFS service.
+
+        Test whether the snapshots of the other service are not used.
+
+        """
+        monkeypatch.setattr(pydov, 'metadata_cache', metadata_cache)
+
+        reset_search_metadata(monkeypatch)
+        BoringSearch().get_fields()
+
+        def unavailable(*args, **kwargs):
+            raise IOError('service unavailable')
+
+        reset_search_metadata(monkeypatch)
+        monkeypatch.setattr(pydov, 'wfs_urls',
+                            ['http://localhost/geoserver/wfs'])
+        monkeypatch.setattr('pydov.util.owsutil.get_remote_capabilities',
+                            unavailable)
+
+        with pytest.raises(IOError):
+            BoringSearch().get_fields()
+
+
+class TestLRUCache(object):
+    """Class grouping tests for the pydov.util.caching.LRUCache class."""
+
+    def test_get(self):
+        """Test whether the least recently used values are discarded when
+        the cache is full."""
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('b', 0) == 0
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+        cache.clear()
+        assert len(cache) == 0
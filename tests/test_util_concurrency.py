@@ -0,0 +1,182 @@
+"""Module grouping tests for the pydov.util.concurrency module."""
+import threading
+import time
+
+import pytest
+
+from pydov.util.concurrency import (
+    coalesce,
+    imap_ordered,
+)
+
+
+class TestImapOrdered(object):
+    """Class grouping tests for the pydov.util.concurrency.imap_ordered
+    function."""
+
+    def test_serial(self):
+        """Test the imap_ordered function with a single worker.
+
+        Test whether all items are processed in the calling thread and in
+        order.
+
+        """
+        threads = set()
+
+        def func(x):
+            threads.add(threading.current_thread())
+            return x * 2
+
+        result = list(imap_ordered(func, range(10), max_workers=1))
+
+        assert result == [x * 2 for x in range(10)]
+        assert threads == set([threading.current_thread()])
+
+    def test_concurrent_order(self):
+        """Test the imap_ordered function with multiple workers.
+
+        Test whether the results are yielded in the order of the input,
+        even if later items finish first.
+
+        """
+        def func(x):
+            time.sleep(0.001 * (20 - x))
+            return x
+
+        result = list(imap_ordered(func, range(20), max_workers=4))
+
+        assert result == list(range(20))
+
+    def test_concurrent_threads(self):
+        """Test the imap_ordered function with multiple workers.
+
+        Test whether the items are processed outside of the calling thread.
+
+        """
+        threads = set()
+
+        def func(x):
+            threads.add(threading.current_thread())
+            return x
+
+        list(imap_ordered(func, range(10), max_workers=4))
+
+        assert threading.current_thread() not in threads
+
+    def test_lazy(self):
+        """Test the imap_ordered function with an infinite generator.
+
+        Test whether the input is consumed lazily.
+
+        """
+        def generator():
+            i = 0
+            while True:
+                yield i
+                i += 1
+
+        results = imap_ordered(lambda x: x, generator(), max_workers=4)
+
+        assert [next(results) for i in range(5)] == list(range(5))
+        results.close()
+
+    def test_exception(self):
+        """Test the imap_ordered function with a function raising an error.
+
+        Test whether the error is raised in the calling thread.
+
+        """
+        def func(x):
+            if x == 3:
+                raise ValueError('computer says no')
+            return x
+
+        with pytest.raises(ValueError):
+            list(imap_ordered(func, range(10), max_workers=4))
+
+    def test_discard(self):
+        """Test the imap_ordered function closed before all results are
+        yielded.
+
+        Test whether the results computed ahead but not yielded are passed
+        to the discard function.
+
+        """
+        started = []
+        discarded = []
+
+        def func(x):
+            started.append(x)
+            return x
+
+        results = imap_ordered(func, range(20), max_workers=4,
+                               discard=discarded.append)
+
+        assert [next(results) for i in range(5)] == list(range(5))
+        results.close()
+
+        assert len(discarded) > 0
+        assert sorted(discarded + list(range(5))) == sorted(started)
+
+
+class TestCoalesce(object):
+    """Class grouping tests for the pydov.util.concurrency.coalesce
+    function."""
+
+    def test_concurrent(self):
+        """Test the coalesce function with concurrent calls.
+
+        Test whether concurrent calls with the same key share a single
+        call, and calls with another key do not.
+
+        """
+        calls = []
+
+        def func(key):
+            def call():
+                calls.append(key)
+                time.sleep(0.1)
+                return object()
+            return call
+
+        results = list(imap_ordered(
+            lambda key: coalesce(key, func(key)), ['a'] * 5 + ['b'],
+            max_workers=6))
+
+        assert sorted(calls) == ['a', 'b']
+        assert len(set(id(r) for r in results[:5])) == 1
+        assert results[5] is not results[0]
+
+    def test_sequential(self):
+        """Test the coalesce function with sequential calls.
+
+        Test whether the result is not kept after the call.
+
+        """
+        calls = []
+
+        def func():
+            calls.append(1)
+            return len(calls)
+
+        assert coalesce('key', func) == 1
+        assert coalesce('key', func) == 2
+
+    def test_exception(self):
+        """Test the coalesce function with a function raising an error.
+
+        Test whether the error is raised in all waiting threads.
+
+        """
+        def func():
+            time.sleep(0.1)
+            raise ValueError('computer says no')
+
+        def call(x):
+            try:
+                coalesce('key', func)
+            except ValueError as error:
+                return error
+
+        errors = list(imap_ordered(call, range(3), max_workers=3))
+        assert all(isinstance(e, ValueError) for e in errors)
@@ -0,0 +1,130 @@
+"""Module grouping tests for the pydov.util.instrumentation module."""
+import threading
+import time
+
+import pytest
+
+import pydov
+from pydov.util.concurrency import imap_ordered
+from pydov.util.instrumentation import (
+    AbstractInstrument,
+    Event,
+    StatsCollector,
+    Timer,
+    activated,
+    get_active,
+)
+
+
+class ListInstrument(AbstractInstrument):
+    """Instrument keeping all received events."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+class TestStatsCollector(object):
+    """Class grouping tests for the
+    pydov.util.instrumentation.StatsCollector class."""
+
+    def test_summary(self):
+        """Test the summary of the collected statistics.
+
+        Test whether the events are summarised per phase, in the order of
+        the phases of a search.
+
+        """
+        stats = StatsCollector()
+        stats.on_event(Event('xml_parse', 0.5, 100, None))
+        stats.on_event(Event('xml_parse', 1.5, 300, None))
+        stats.on_event(Event('getfeature', 1.0, 1000, 10))
+
+        summary = stats.summary()
+
+        assert list(summary.index) == ['getfeature', 'xml_parse']
+        assert summary.loc['xml_parse', 'count'] == 2
+        assert summary.loc['xml_parse', 'seconds'] == 2.0
+        assert summary.loc['xml_parse', 'mean_seconds'] == 1.0
+        assert summary.loc['xml_parse', 'max_seconds'] == 1.5
+        assert summary.loc['xml_parse', 'bytes'] == 400
+        assert summary.loc['getfeature', 'features'] == 10
+
+        stats.reset()
+        assert len(stats.summary()) == 0
+
+
+class TestTimer(object):
+    """Class grouping tests for the pydov.util.instrumentation.Timer
+    class."""
+
+    def test_global(self, monkeypatch):
+        """Test a timer with an instrument in pydov.instruments.
+
+        Test whether the event is emitted when the timer stops, excluding
+        the time it was paused.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        instrument = ListInstrument()
+        monkeypatch.setattr(pydov, 'instruments', [instrument])
+
+        timer = Timer('gml_parse', features=0).start()
+        timer.features += 1
+        timer.pause()
+        time.sleep(0.1)
+        timer.start()
+        timer.bytes = 10
+        timer.stop()
+
+        assert len(instrument.events) == 1
+        event = instrument.events[0]
+        assert event.phase == 'gml_parse'
+        assert event.seconds < 0.1
+        assert (event.bytes, event.features) == (10, 1)
+
+    def test_activated(self):
+        """Test a timer with activated instruments.
+
+        Test whether only the events emitted while the instruments are
+        activated are received, also by worker threads.
+
+        """
+        instrument = ListInstrument()
+
+        def func(x):
+            with Timer('xml_parse', bytes=x):
+                return threading.current_thread()
+
+        list(imap_ordered(func, range(5), max_workers=2))
+        assert instrument.events == []
+
+        with activated([instrument]):
+            assert get_active() == [instrument]
+            threads = set(imap_ordered(func, range(5), max_workers=2))
+
+        assert get_active() == []
+        assert threading.current_thread() not in threads
+        assert sorted(e.bytes for e in instrument.events) == list(range(5))
+
+    def test_exception(self):
+        """Test a timer used as context manager with an exception.
+
+        Test whether the event is emitted and the instruments are
+        deactivated.
+
+        """
+        instrument = ListInstrument()
+
+        with pytest.raises(ValueError):
+            with Timer('search', instruments=[instrument]):
+                raise ValueError()
+
+        assert [e.phase for e in instrument.events] == ['search']
+        assert get_active() == []
@@ -0,0 +1,304 @@
+"""Module grouping tests for the pydov.util.net module."""
+import io
+
+import pytest
+import requests
+
+import pydov
+from pydov.util import net
+
+
+@pytest.fixture
+def reset_session():
+    """Reset the shared session before and after the test."""
+    net.set_session(None)
+    yield
+    net.set_session(None)
+
+
+class TestSession(object):
+    """Class grouping tests for the shared HTTP session of the
+    pydov.util.net module."""
+
+    def test_build_session(self):
+        """Test the build_session function.
+
+        Test whether the session negotiates gzip compression and uses a
+        connection pool of the given size.
+
+        """
+        session = net.build_session(pool_maxsize=16)
+
+        assert 'gzip' in session.headers['Accept-Encoding']
+        assert session.headers['User-Agent'] == \
+            'pydov/%s' % pydov.__version__
+
+        adapter = session.get_adapter('https://www.dov.vlaanderen.be')
+        assert adapter._pool_maxsize == 16
+
+    def test_build_session_max_workers(self, monkeypatch):
+        """Test the build_session function with the default pool size.
+
+        Test whether the pool is large enough for the configured number of
+        worker threads.
+
+        """
+        monkeypatch.setattr(pydov, 'max_workers', 32)
+        session = net.build_session()
+
+        adapter = session.get_adapter('https://www.dov.vlaanderen.be')
+        assert adapter._pool_maxsize == 32
+
+    def test_get_session_shared(self, reset_session):
+        """Test the get_session function.
+
+        Test whether the same session is returned on subsequent calls.
+
+        """
+        session = net.get_session()
+
+        assert isinstance(session, requests.Session)
+        assert net.get_session() is session
+
+    def test_set_session(self, reset_session):
+        """Test the set_session function.
+
+        Test whether the given session is used afterwards, and whether a
+        new session is built after resetting it.
+
+        """
+        session = net.build_session(pool_maxsize=2)
+        net.set_session(session)
+        assert net.get_session() is session
+
+        net.set_session(None)
+        assert net.get_session() is not session
+
+    def test_get_url(self, reset_session, monkeypatch):
+        """Test the get_url function.
+
+        Test whether the content of the response of the shared session is
+        returned.
+
+        """
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'<xml/>'
+            return response
+
+        monkeypatch.setattr(net.get_session(), 'get', get)
+
+        assert net.get_url('https://www.dov.vlaanderen.be/x.xml') == \
+            b'<xml/>'
+        assert requested == ['https://www.dov.vlaanderen.be/x.xml']
+
+    def test_get_url_error(self, reset_session, monkeypatch):
+        """Test the get_url function when the server returns an error.
+
+        Test whether an HTTPError is raised.
+
+        """
+        def get(url, **kwargs):
+            response = requests.Response()
+            response.status_code = 404
+            response.url = url
+            return response
+
+        monkeypatch.setattr(net.get_session(), 'get', get)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            net.get_url('https://www.dov.vlaanderen.be/x.xml')
+
+
+@pytest.fixture
+def reset_latency():
+    """Reset the recorded latencies before and after the test."""
+    net.reset_latency()
+    yield
+    net.reset_latency()
+
+
+class TestLatency(object):
+    """Class grouping tests for the latency statistics of the
+    pydov.util.net module."""
+
+    def test_get_latency_none(self, reset_latency):
+        """Test the get_latency function without recorded requests.
+
+        Test whether None is returned.
+
+        """
+        assert net.get_latency('wfs') is None
+
+    def test_get_latency_median(self, reset_latency):
+        """Test the get_latency function.
+
+        Test whether the median of the latencies of the given kind is
+        returned.
+
+        """
+        for seconds in (0.1, 0.3, 5.0):
+            net.record_latency('xml', seconds)
+        net.record_latency('wfs', 2.0)
+
+        assert net.get_latency('xml') == 0.3
+        assert net.get_latency('wfs') == 2.0
+
+        net.record_latency('xml', 0.5)
+        assert net.get_latency('xml') == 0.4
+
+    def test_record_latency_window(self, reset_latency):
+        """Test the record_latency function with many requests.
+
+        Test whether only the latencies of the most recent requests are
+        used.
+
+        """
+        for i in range(200):
+            net.record_latency('xml', 10.0)
+        for i in range(100):
+            net.record_latency('xml', 1.0)
+
+        assert net.get_latency('xml') == 1.0
+
+    def test_mirror_latency(self, reset_latency):
+        """Test the record_mirror_latency function.
+
+        Test whether the latencies of the mirrors are kept apart from the
+        latencies of the kinds of requests.
+
+        """
+        net.record_mirror_latency('https://www.dov.vlaanderen.be/data', 2.0)
+        net.record_mirror_latency(None, 1.0)
+        net.record_latency('xml', 0.5)
+
+        assert net.get_mirror_latency(
+            'https://www.dov.vlaanderen.be/data') == 2.0
+        assert net.get_mirror_latency('xml') is None
+        assert net.get_latency('https://www.dov.vlaanderen.be/data') is None
+        assert net.get_latency('xml') == 0.5
+
+
+@pytest.fixture
+def mirrors(monkeypatch, reset_latency):
+    """Configure two mirrors of the XML documents of the DOV objects.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+    reset_latency : pytest.fixture
+        Reset the recorded latencies before and after the test.
+
+    """
+    urls = ['https://proxy.example.com/dov/data',
+            'https://www.dov.vlaanderen.be/data']
+    monkeypatch.setattr(pydov, 'xml_urls', urls)
+    return urls
+
+
+class TestMirrors(object):
+    """Class grouping tests for the mirrors of the DOV services in the
+    pydov.util.net module."""
+
+    url = 'https://www.dov.vlaanderen.be/data/boring/1.xml'
+
+    def test_get_mirror_urls(self, mirrors):
+        """Test the get_mirror_urls function.
+
+        Test whether the URL is requested at each mirror in order of
+        priority, and other URLs are requested as is.
+
+        """
+        assert net.get_mirror_urls(self.url) == [
+            (mirrors[0], 'https://proxy.example.com/dov/data/boring/1.xml'),
+            (mirrors[1], self.url)]
+
+        for url in ('https://www.dov.vlaanderen.be/database/1.xml',
+                    'http://localhost/data/boring/1.xml'):
+            assert net.get_mirror_urls(url) == [(None, url)]
+
+    def test_get_mirror_urls_latency(self, mirrors):
+        """Test the get_mirror_urls function with recorded latencies.
+
+        Test whether the mirror with the best recent latency is preferred,
+        and a mirror that failed recently comes last.
+
+        """
+        net.record_mirror_latency(mirrors[0], 0.5)
+        net.record_mirror_latency(mirrors[1], 0.1)
+        assert [m for m, url in net.get_mirror_urls(self.url)] == \
+            [mirrors[1], mirrors[0]]
+
+        net.record_failure(mirrors[1])
+        assert [m for m, url in net.get_mirror_urls(self.url)] == mirrors
+
+    def test_get_url_failover(self, mirrors, reset_session, monkeypatch):
+        """Test the get_url function when a mirror times out.
+
+        Test whether the request fails over to the next mirror, and whether
+        all mirrors failing raises the error.
+
+        """
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            if url.startswith(mirrors[0]):
+                raise requests.exceptions.ConnectTimeout()
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'<xml/>'
+            return response
+
+        monkeypatch.setattr(net.get_session(), 'get', get)
+
+        assert net.get_url(self.url) == b'<xml/>'
+        assert net.get_url(self.url) == b'<xml/>'
+        assert requested == [
+            'https://proxy.example.com/dov/data/boring/1.xml',
+            self.url, self.url]
+
+        monkeypatch.setattr(pydov, 'xml_urls', mirrors[:1])
+        with pytest.raises(requests.exceptions.Timeout):
+            net.get_url(self.url)
+
+    def test_get_url_failover_server_error(self, mirrors, reset_session,
+                                           monkeypatch):
+        """Test the get_url function when a mirror returns a server error.
+
+        Test whether the request fails over to the next mirror, whether the
+        latency is only recorded for the successful response, and whether
+        all mirrors returning a server error raises an HTTPError.
+
+        """
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            response = requests.Response()
+            if url.startswith(mirrors[0]):
+                response.status_code = 503
+                response.raw = io.BytesIO(b'Service Unavailable')
+            else:
+                response.status_code = 200
+                response._content = b'<xml/>'
+            return response
+
+        monkeypatch.setattr(net.get_session(), 'get', get)
+
+        assert net.get_url(self.url) == b'<xml/>'
+        assert requested == [
+            'https://proxy.example.com/dov/data/boring/1.xml', self.url]
+        assert net.get_mirror_latency(mirrors[0]) is None
+        assert net.get_mirror_latency(mirrors[1]) is not None
+        assert [m for m, url in net.get_mirror_urls(self.url)] == \
+            [mirrors[1], mirrors[0]]
+
+        monkeypatch.setattr(pydov, 'xml_urls', mirrors[:1])
+        with pytest.raises(requests.exceptions.HTTPError):
+            net.get_url(self.url)
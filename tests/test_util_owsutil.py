@@ -1,6 +1,8 @@
 """Module grouping tests for the pydov.util.owsutil module."""
 import re
+from io import BytesIO
 
+import owslib.ows
 import pytest
 from numpy.compat import unicode
 
@@ -177,6 +179,29 @@ class TestOwsutil(object):
         assert owsutil.get_namespace(wfs, 'dov-pub:Boringen') == \
                'http://dov.vlaanderen.be/ocdov/dov-pub'
 
+    def test_get_max_features(self, wfs):
+        """Test the owsutil.get_max_features method.
+
+        Test whether the limit advertised in the capabilities is returned,
+        and None if there is none.
+
+        Parameters
+        ----------
+        wfs : pytest.fixture returning owslib.wfs.WebFeatureService
+            WebFeatureService based on the local GetCapabilities.
+
+        """
+        assert owsutil.get_max_features(wfs) is None
+
+        getfeature = [op for op in wfs.operations if op.name == 'GetFeature']
+        constraint = etree.fromstring(
+            '<ows:Constraint xmlns:ows="http://www.opengis.net/ows" '
+            'name="DefaultMaxFeatures"><ows:Value>5000</ows:Value>'
+            '</ows:Constraint>')
+        getfeature[0].constraints.append(
+            owslib.ows.Constraint(constraint, 'http://www.opengis.net/ows'))
+        assert owsutil.get_max_features(wfs) == 5000
+
     def test_get_remote_featurecatalogue(self, mp_remote_fc):
         """Test the owsutil.get_remote_featurecatalogue method.
 
@@ -298,7 +323,7 @@ class TestOwsutil(object):
 
         """
         with pytest.raises(AttributeError):
-            xml = owsutil.wfs_build_getfeature_request(
+            owsutil.wfs_build_getfeature_request(
                 'dov-pub:Boringen', bbox=(151650, 214675, 151750, 214775))
 
     def test_wfs_build_getfeature_request_bbox(self):
@@ -422,6 +447,30 @@ class TestOwsutil(object):
             '</gml:Envelope> </ogc:Within> </ogc:And> </ogc:Filter> '
             '</wfs:Query> </wfs:GetFeature>')
 
+    def test_wfs_build_getfeature_request_paging(self):
+        """Test the owsutil.wfs_build_getfeature_request method with a
+        sort_by, start_index and max_features.
+
+        Test whether the XML of the WFS GetFeature call is generated correctly.
+
+        """
+        xml = owsutil.wfs_build_getfeature_request(
+            'dov-pub:Boringen', sort_by='fiche', start_index=5000,
+            max_features=2500)
+        assert clean_xml(etree.tostring(xml).decode('utf8')) == clean_xml(
+            '<wfs:GetFeature xmlns:wfs="http://www.opengis.net/wfs" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'service="WFS" version="1.1.0" startIndex="5000" '
+            'maxFeatures="2500" '
+            'xsi:schemaLocation="http://www.opengis.net/wfs '
+            'http://schemas.opengis.net/wfs/1.1.0/wfs.xsd"> <wfs:Query '
+            'typeName="dov-pub:Boringen"> <ogc:Filter '
+            'xmlns:ogc="http://www.opengis.net/ogc"/> <ogc:SortBy '
+            'xmlns:ogc="http://www.opengis.net/ogc"> <ogc:SortProperty> '
+            '<ogc:PropertyName>fiche</ogc:PropertyName> '
+            '<ogc:SortOrder>ASC</ogc:SortOrder> </ogc:SortProperty> '
+            '</ogc:SortBy> </wfs:Query> </wfs:GetFeature>')
+
     def test_wfs_build_getfeature_request_bbox_filter_propertyname(self):
         """Test the owsutil.wfs_build_getfeature_request method with an
         attribute filter, a bbox, a geometry_column and a list of
@@ -466,3 +515,46 @@ class TestOwsutil(object):
             '<gml:upperCorner>151750.000 214775.000</gml:upperCorner> '
             '</gml:Envelope> </ogc:Within> </ogc:And> </ogc:Filter> '
             '</wfs:Query> </wfs:GetFeature>')
+
+    def test_wfs_parse_getfeature(self):
+        """Test the owsutil.wfs_parse_getfeature method.
+
+        Test whether the root element and all features are parsed and the
+        features are discarded after use.
+
+        """
+        with open('tests/data/types/grondwaterfilter/wfsgetfeature.xml',
+                  'rb') as f:
+            data = f.read()
+
+        root, features = owsutil.wfs_parse_getfeature(data)
+
+        assert root.tag == '{http://www.opengis.net/wfs}FeatureCollection'
+        assert int(root.get('numberOfFeatures')) == 1
+
+        pkeys = [feature.findtext(
+            './{http://dov.vlaanderen.be/grondwater/gw_meetnetten}'
+            'filterfiche') for feature in features]
+        assert pkeys == [
+            'https://www.dov.vlaanderen.be/data/filter/2003-004471']
+
+        feature_members = root.find(
+            './{http://www.opengis.net/gml}featureMembers')
+        assert len(feature_members) == 0
+
+    def test_wfs_parse_getfeature_close(self):
+        """Test the owsutil.wfs_parse_getfeature method, closing the
+        features generator early.
+
+        Test whether the response is closed.
+
+        """
+        with open('tests/data/types/grondwaterfilter/wfsgetfeature.xml',
+                  'rb') as f:
+            response = BytesIO(f.read())
+
+        root, features = owsutil.wfs_parse_getfeature(response)
+        assert not response.closed
+
+        features.close()
+        assert response.closed